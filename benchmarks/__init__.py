@@ -0,0 +1,3 @@
+"""Benchmarks for tap-getcensus."""
+
+from __future__ import annotations
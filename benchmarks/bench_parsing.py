@@ -0,0 +1,130 @@
+"""Compare record extraction strategies on synthetic Census list pages.
+
+Run with::
+
+    python -m benchmarks.bench_parsing --pages 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+import typing as t
+
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_getcensus.client import json_loads
+from tap_getcensus.jsonstream import StreamingBody
+
+CHUNK_SIZE = 1 << 16
+
+
+def make_page(page: int, per_page: int = 250) -> bytes:
+    """Build the body of a `sync_runs` page.
+
+    Args:
+        page: Page number, used to make record IDs unique.
+        per_page: Number of records in the page.
+
+    Returns:
+        The encoded JSON body.
+    """
+    records = [
+        {
+            "id": page * per_page + i,
+            "sync_id": 42,
+            "source_record_count": 1000 + i,
+            "records_processed": 990 + i,
+            "records_updated": 900,
+            "records_failed": 5,
+            "records_invalid": 5,
+            "created_at": "2023-06-01T12:00:00.000Z",
+            "updated_at": "2023-06-01T12:05:00.000Z",
+            "completed_at": "2023-06-01T12:05:00.000Z",
+            "scheduled_execution_time": None,
+            "error_code": None,
+            "error_message": None,
+            "error_detail": None,
+            "status": "completed",
+            "canceled": False,
+            "full_sync": i % 10 == 0,
+            "sync_trigger_reason": {"ui_tag": "Schedule", "ui_detail": "Hourly"},
+        }
+        for i in range(per_page)
+    ]
+    body = {
+        "status": "success",
+        "data": records,
+        "next": f"https://app.getcensus.com/api/v1/syncs/42/sync_runs?page={page + 1}",
+    }
+    return json.dumps(body).encode()
+
+
+def jsonpath_extract(content: bytes) -> list[dict]:
+    """Extract records the way the SDK does by default."""
+    body = json.loads(content)
+    records = list(extract_jsonpath("$.data[*]", input=body))
+    body.get("next")
+    return records
+
+
+def direct_extract(content: bytes) -> list[dict]:
+    """Extract records from the decoded `data` array."""
+    body = json_loads(content)
+    records = list(body.get("data") or [])
+    body.get("next")
+    return records
+
+
+def streaming_extract(content: bytes) -> list[dict]:
+    """Extract records incrementally from body chunks."""
+    chunks = (content[i : i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE))
+    parser = StreamingBody(chunks)
+    records = list(parser)
+    parser.fields.get("next")
+    return records
+
+
+STRATEGIES: dict[str, t.Callable[[bytes], list[dict]]] = {
+    "jsonpath": jsonpath_extract,
+    "direct": direct_extract,
+    "streaming": streaming_extract,
+}
+
+
+def main() -> None:
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--per-page", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = [make_page(i, args.per_page) for i in range(args.pages)]
+    total_records = args.pages * args.per_page
+    expected = [jsonpath_extract(page) for page in pages]
+
+    print(f"{'strategy':<10} {'best (s)':>10} {'records/s':>12} {'speedup':>8}")
+    baseline = None
+    for name, extract in STRATEGIES.items():
+        if [extract(page) for page in pages] != expected:
+            msg = f"Strategy {name!r} extracted different records"
+            raise SystemExit(msg)
+
+        best = min(
+            timeit.repeat(
+                lambda extract=extract: [extract(page) for page in pages],
+                number=1,
+                repeat=args.repeat,
+            ),
+        )
+        baseline = baseline or best
+        print(
+            f"{name:<10} {best:>10.4f} {total_records / best:>12,.0f} "
+            f"{baseline / best:>7.2f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""Measure a full sync of the tap against the local mock Census API.
+
+The mock server runs in a separate process, so the reported peak memory and
+throughput only account for the tap. Run with::
+
+    python -m benchmarks.bench_sync --syncs 100 --config '{"max_concurrency": 8}'
+
+With ``--startup``, the startup time of fresh tap processes is measured
+instead, for discovery and for a run with only the ``syncs`` stream selected.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import typing as t
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import requests
+
+from benchmarks.mock_api import add_dataset_arguments, dataset_from_arguments
+from tap_getcensus.tap import TapCensus
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+if t.TYPE_CHECKING:
+    from singer_sdk import Stream
+
+    from benchmarks.mock_api import Dataset
+
+
+@dataclass
+class SyncResult:
+    """Measurements of a full sync."""
+
+    seconds: float = 0.0
+    records: Counter[str] = field(default_factory=Counter)
+    stream_seconds: dict[str, float] = field(
+        default_factory=lambda: defaultdict(float),
+    )
+    requests: int | None = None
+    peak_rss_mib: float | None = None
+
+    @property
+    def total_records(self) -> int:
+        """Get the number of records emitted by all streams.
+
+        Returns:
+            The total record count.
+        """
+        return sum(self.records.values())
+
+
+class _StreamProfiler:
+    """Count records and time the syncs of every stream of a tap.
+
+    Child streams are synced from within their parent's sync, so each stream
+    is charged for its own time only, excluding nested child syncs.
+    """
+
+    def __init__(self, result: SyncResult) -> None:
+        self.result = result
+        self._nested: list[float] = []
+
+    def instrument(self, stream: Stream) -> None:
+        sync = stream.sync
+        write_record_message = stream._write_record_message  # noqa: SLF001
+
+        def timed_sync(context: dict | None = None) -> None:
+            start = time.perf_counter()
+            self._nested.append(0.0)
+            try:
+                sync(context)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._nested.pop()
+                self.result.stream_seconds[stream.name] += elapsed - nested
+                if self._nested:
+                    self._nested[-1] += elapsed
+
+        def counted_write_record_message(record: dict) -> None:
+            self.result.records[stream.name] += 1
+            write_record_message(record)
+
+        stream.sync = timed_sync  # type: ignore[method-assign]
+        stream._write_record_message = (  # type: ignore[method-assign] # noqa: SLF001
+            counted_write_record_message
+        )
+
+
+def _peak_rss_mib() -> float | None:
+    if resource is None:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+
+def run_sync(api_url: str, config: dict[str, t.Any] | None = None) -> SyncResult:
+    """Run a full sync of every stream, discarding the Singer output.
+
+    Args:
+        api_url: Base URL of the mock API.
+        config: Extra tap settings.
+
+    Returns:
+        The measurements of the sync.
+    """
+    result = SyncResult()
+    tap = TapCensus(
+        config={"api_token": "benchmark-token", **(config or {}), "api_url": api_url},
+    )
+    profiler = _StreamProfiler(result)
+    for stream in tap.streams.values():
+        profiler.instrument(stream)
+
+    start = time.perf_counter()
+    with Path(os.devnull).open("w") as devnull, contextlib.redirect_stdout(devnull):
+        tap.run()
+    result.seconds = time.perf_counter() - start
+
+    with contextlib.suppress(requests.RequestException):
+        result.requests = requests.get(f"{api_url}/_stats", timeout=5).json()[
+            "requests"
+        ]
+    result.peak_rss_mib = _peak_rss_mib()
+    return result
+
+
+# Run in a fresh interpreter, so that imports are timed too. Prints the seconds
+# to import the tap, create it and either discover or create the streams of the
+# catalog given as second argument.
+_STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from tap_getcensus.tap import TapCensus
+imported = time.perf_counter()
+catalog = json.loads(sys.argv[2]) if len(sys.argv) > 2 else None
+tap = TapCensus(config=json.loads(sys.argv[1]), catalog=catalog)
+created = time.perf_counter()
+tap.streams if catalog else tap.catalog_json_text
+ready = time.perf_counter()
+print(json.dumps([imported - start, created - imported, ready - created]))
+"""
+
+
+@dataclass
+class StartupResult:
+    """Median startup times of fresh tap processes, in seconds."""
+
+    process: float
+    imports: float
+    init: float
+    ready: float
+
+
+def measure_startup(
+    config: dict[str, t.Any] | None = None,
+    *,
+    catalog: dict | None = None,
+    runs: int = 5,
+) -> StartupResult:
+    """Measure the startup time of tap processes.
+
+    Args:
+        config: Extra tap settings.
+        catalog: Input catalog, to time the creation of its streams instead
+            of discovery.
+        runs: Number of processes to start.
+
+    Returns:
+        The median measurements.
+    """
+    arguments = [
+        sys.executable,
+        "-c",
+        _STARTUP_PROBE,
+        json.dumps({"api_token": "benchmark-token", **(config or {})}),
+    ]
+    if catalog is not None:
+        arguments.append(json.dumps(catalog))
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            arguments,  # noqa: S603
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent.parent,
+        ).stdout
+        samples.append([time.perf_counter() - start, *json.loads(output)])
+    return StartupResult(*(statistics.median(sample) for sample in zip(*samples)))
+
+
+def print_startup_report(results: dict[str, StartupResult]) -> None:
+    """Print the startup times of tap processes.
+
+    Args:
+        results: The measurements, by scenario.
+    """
+    print(
+        f"{'startup':<22} {'process':>9} {'imports':>9} {'init':>9} {'ready':>9}",
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<22} {result.process:>9.3f} {result.imports:>9.3f} "
+            f"{result.init:>9.3f} {result.ready:>9.3f}",
+        )
+
+
+@contextlib.contextmanager
+def mock_api_process(dataset: Dataset) -> t.Iterator[str]:
+    """Serve the mock API from a child process.
+
+    Args:
+        dataset: The simulated workspace.
+
+    Yields:
+        The base URL of the server.
+    """
+    arguments = [sys.executable, "-m", "benchmarks.mock_api"]
+    for name, value in vars(dataset).items():
+        arguments += [f"--{name.replace('_', '-')}", str(value)]
+
+    with subprocess.Popen(
+        arguments,  # noqa: S603
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    ) as process:
+        try:
+            yield t.cast(t.IO[str], process.stdout).readline().strip()
+        finally:
+            process.terminate()
+
+
+def print_report(result: SyncResult) -> None:
+    """Print the measurements of a sync.
+
+    Args:
+        result: The measurements.
+    """
+    print(f"{'stream':<22} {'records':>10} {'seconds':>9} {'records/s':>11}")
+    for name, seconds in sorted(result.stream_seconds.items()):
+        records = result.records[name]
+        rate = records / seconds if seconds else 0.0
+        print(f"{name:<22} {records:>10,} {seconds:>9.3f} {rate:>11,.0f}")
+
+    print(
+        f"{'total':<22} {result.total_records:>10,} {result.seconds:>9.3f} "
+        f"{result.total_records / result.seconds:>11,.0f}",
+    )
+    print(f"requests: {result.requests}")
+    if result.peak_rss_mib is not None:
+        print(f"peak RSS: {result.peak_rss_mib:.1f} MiB")
+
+
+def main() -> None:
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_dataset_arguments(parser)
+    parser.add_argument(
+        "--config",
+        type=json.loads,
+        default={},
+        help="Extra tap settings, as a JSON object",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show the tap logs")
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="Measure the startup time of tap processes instead of a sync",
+    )
+    args = parser.parse_args()
+
+    if args.startup:
+        tap = TapCensus(
+            config={"api_token": "benchmark-token", **args.config},
+            validate_config=False,
+        )
+        catalog = tap.catalog_dict
+        for entry in catalog["streams"]:
+            for metadata in entry["metadata"]:
+                if not metadata["breadcrumb"]:
+                    metadata["metadata"]["selected"] = entry["tap_stream_id"] == "syncs"
+        print_startup_report(
+            {
+                "discovery": measure_startup(args.config),
+                "syncs selected": measure_startup(args.config, catalog=catalog),
+            },
+        )
+        return
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    with mock_api_process(dataset_from_arguments(args)) as api_url:
+        result = run_sync(api_url, args.config)
+    print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""A local stand-in for the Census API endpoints used by the tap.
+
+Records are generated on the fly from their index, so large accounts can be
+simulated without holding them in memory. Run it on its own with::
+
+    python -m benchmarks.mock_api --port 8000 --syncs 100 --latency 0.05
+
+and point the tap's `api_url` setting to the printed URL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Dataset:
+    """Size of the simulated Census workspace, and how the API behaves."""
+
+    syncs: int = 50
+    runs_per_sync: int = 100
+    sources: int = 10
+    objects_per_source: int = 50
+    destinations: int = 10
+    objects_per_destination: int = 50
+    latency: float = 0.0
+    max_per_page: int = 100
+
+
+def _timestamp(minutes: int) -> str:
+    return (EPOCH + timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z")
+
+
+def _sync(index: int) -> dict[str, t.Any]:
+    return {
+        "id": index,
+        "label": f"Sync {index}",
+        "schedule_frequency": "hourly",
+        "schedule_day": None,
+        "schedule_hour": None,
+        "schedule_minute": index % 60,
+        "created_at": _timestamp(index),
+        "updated_at": _timestamp(index * 2),
+        "operation": "upsert",
+        "paused": False,
+        "status": "Healthy",
+        "field_behavior": "specific_properties",
+        "field_normalization": "match_names",
+        "mirror_strategy": None,
+        "source_attributes": {
+            "connection_id": index % 10 + 1,
+            "object": {"type": "model", "id": index, "name": f"model_{index}"},
+        },
+        "destination_attributes": {
+            "connection_id": index % 10 + 1,
+            "object": "contact",
+        },
+        "mappings": [
+            {
+                "from": {"type": "column"},
+                "to": f"field_{column}",
+                "is_primary_identifier": column == 0,
+            }
+            for column in range(5)
+        ],
+    }
+
+
+def _sync_run(sync_id: int, index: int) -> dict[str, t.Any]:
+    minutes = sync_id * 10_000 + index * 60
+    return {
+        "id": sync_id * 1_000_000 + index,
+        "sync_id": sync_id,
+        "source_record_count": 1000 + index,
+        "records_processed": 990 + index,
+        "records_updated": 900,
+        "records_failed": 5,
+        "records_invalid": 5,
+        "created_at": _timestamp(minutes),
+        "updated_at": _timestamp(minutes + 5),
+        "completed_at": _timestamp(minutes + 5),
+        "scheduled_execution_time": None,
+        "error_code": None,
+        "error_message": None,
+        "error_detail": None,
+        "status": "completed",
+        "canceled": False,
+        "full_sync": index % 10 == 0,
+        "sync_trigger_reason": {"ui_tag": "Schedule", "ui_detail": "Hourly"},
+    }
+
+
+def _connection(kind: str, index: int) -> dict[str, t.Any]:
+    return {
+        "id": index,
+        "name": f"{kind} {index}",
+        "type": kind.lower(),
+        "connection_details": {},
+    }
+
+
+def _source_object(source_id: int, index: int) -> dict[str, t.Any]:
+    return {
+        "id": source_id * 100_000 + index,
+        "source_id": source_id,
+        "name": f"model_{index}",
+        "type": "table",
+        "table_schema": "public",
+        "table_name": f"table_{index}",
+        "created_at": _timestamp(index),
+        "updated_at": _timestamp(index * 2),
+    }
+
+
+def _destination_object(destination_id: int, index: int) -> dict[str, t.Any]:
+    return {
+        "full_name": f"object_{destination_id}_{index}",
+        "label": f"Object {index}",
+        "allow_custom_fields": True,
+        "allow_case_sensitive_field_names": False,
+        "fields": [
+            {
+                "full_name": f"field_{field}",
+                "label": f"Field {field}",
+                "type": "string",
+                "creatable": True,
+                "updatable": True,
+            }
+            for field in range(5)
+        ],
+    }
+
+
+class MockCensusAPI(ThreadingHTTPServer):
+    """An HTTP server answering the Census list and single record endpoints.
+
+    Pages follow the Census conventions: records are in a `data` array, and a
+    `next` link is returned while more pages remain. `per_page` is clamped to
+    the dataset's maximum, and every request is delayed by its latency.
+    Syncs, sources and destinations can also be requested by ID, as the tap
+    does with `sync_ids`, `source_ids` and `destination_ids`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, dataset: Dataset, port: int = 0) -> None:
+        """Start listening on localhost.
+
+        Args:
+            dataset: The simulated workspace.
+            port: Port to listen on, or 0 for any free port.
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.dataset = dataset
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Get the base URL of the server.
+
+        Returns:
+            The URL to use as the tap's `api_url`.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        """Count a request to a known endpoint."""
+        with self._count_lock:
+            self.request_count += 1
+
+    def get_collection(
+        self,
+        path: str,
+    ) -> tuple[int, t.Callable[[int], dict[str, t.Any]]] | None:
+        """Resolve a list endpoint.
+
+        Args:
+            path: The URL path.
+
+        Returns:
+            The number of records and a function building each record, or None
+            if the path is not a known endpoint.
+        """
+        dataset = self.dataset
+        routes: list[tuple[str, t.Callable[..., tuple[int, t.Callable]]]] = [
+            (r"/api/v1/syncs", lambda: (dataset.syncs, lambda i: _sync(i + 1))),
+            (
+                r"/api/v1/syncs/(\d+)/sync_runs",
+                lambda sync_id: (
+                    dataset.runs_per_sync,
+                    lambda i: _sync_run(sync_id, i),
+                ),
+            ),
+            (
+                r"/api/v1/sources",
+                lambda: (dataset.sources, lambda i: _connection("Source", i + 1)),
+            ),
+            (
+                r"/api/v1/sources/(\d+)/objects",
+                lambda source_id: (
+                    dataset.objects_per_source,
+                    lambda i: _source_object(source_id, i),
+                ),
+            ),
+            (
+                r"/api/v1/destinations",
+                lambda: (
+                    dataset.destinations,
+                    lambda i: _connection("Destination", i + 1),
+                ),
+            ),
+            (
+                r"/api/v1/destinations/(\d+)/objects",
+                lambda destination_id: (
+                    dataset.objects_per_destination,
+                    lambda i: _destination_object(destination_id, i),
+                ),
+            ),
+        ]
+        for pattern, resolve in routes:
+            match = re.fullmatch(pattern, path)
+            if match:
+                return resolve(*(int(group) for group in match.groups()))
+        return None
+
+    def get_record(self, path: str) -> dict[str, t.Any] | None:
+        """Resolve a single record endpoint.
+
+        Args:
+            path: The URL path.
+
+        Returns:
+            The record, or None if the path is not a known endpoint or the ID
+            is not in the dataset.
+        """
+        dataset = self.dataset
+        routes: list[tuple[str, int, t.Callable[[int], dict[str, t.Any]]]] = [
+            (r"/api/v1/syncs/(\d+)", dataset.syncs, _sync),
+            (
+                r"/api/v1/sources/(\d+)",
+                dataset.sources,
+                lambda i: _connection("Source", i),
+            ),
+            (
+                r"/api/v1/destinations/(\d+)",
+                dataset.destinations,
+                lambda i: _connection("Destination", i),
+            ),
+        ]
+        for pattern, total, make_record in routes:
+            match = re.fullmatch(pattern, path)
+            if match and 1 <= int(match.group(1)) <= total:
+                return make_record(int(match.group(1)))
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockCensusAPI
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which would otherwise stall
+    # keep-alive connections on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlparse(self.path)
+        if url.path == "/_stats":
+            self._send_json({"requests": self.server.request_count})
+            return
+
+        collection = self.server.get_collection(url.path)
+        record = None if collection else self.server.get_record(url.path)
+        if collection is None and record is None:
+            self._send_json({"status": "not_found"}, HTTPStatus.NOT_FOUND)
+            return
+
+        self.server.count_request()
+        time.sleep(self.server.dataset.latency)
+        if collection is None:
+            self._send_json({"status": "success", "data": record})
+            return
+
+        query = dict(parse_qsl(url.query))
+        page = int(query.get("page", 1))
+        per_page = min(int(query.get("per_page", 25)), self.server.dataset.max_per_page)
+        total, make_record = collection
+
+        indexes = range((page - 1) * per_page, min(page * per_page, total))
+        if query.get("order") == "desc":
+            indexes = range(total - 1 - indexes.start, total - 1 - indexes.stop, -1)
+
+        body: dict[str, t.Any] = {
+            "status": "success",
+            "data": [make_record(index) for index in indexes],
+        }
+        if page * per_page < total:
+            query["page"] = str(page + 1)
+            body["next"] = f"{self.server.url}{url.path}?{urlencode(query)}"
+        self._send_json(body)
+
+    def _send_json(self, body: dict, status: int = HTTPStatus.OK) -> None:
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add command line options for the fields of a `Dataset`.
+
+    Args:
+        parser: The argument parser.
+    """
+    defaults = Dataset()
+    for name, value in vars(defaults).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=type(value),
+            default=value,
+        )
+
+
+def dataset_from_arguments(args: argparse.Namespace) -> Dataset:
+    """Build a dataset from parsed command line options.
+
+    Args:
+        args: Options added by `add_dataset_arguments`.
+
+    Returns:
+        The dataset.
+    """
+    return Dataset(**{name: getattr(args, name) for name in vars(Dataset())})
+
+
+def main() -> None:
+    """Serve the mock API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=0)
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockCensusAPI(dataset_from_arguments(args), port=args.port)
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
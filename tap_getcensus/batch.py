@@ -0,0 +1,325 @@
+"""Batch files of records, announced with BATCH messages."""
+
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import typing as t
+from dataclasses import dataclass
+from uuid import uuid4
+
+import fs
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.helpers._batch import (
+    BaseBatchFileEncoding,
+    BatchConfig,
+    SDKBatchMessage,
+)
+
+from tap_getcensus.output import to_json_line
+
+if t.TYPE_CHECKING:
+    import pyarrow as pa
+    import singer_sdk._singerlib as singer
+    from fs.base import FS
+
+__all__ = ["BATCH_FORMATS", "BatchWriter", "ParquetEncoding"]
+
+BATCH_FORMATS = ("jsonl", "parquet")
+
+_JSONL_COMPRESSIONS = (None, "gzip", "none")
+
+# The SDK's default of 9 is several times slower, for files a few percent smaller
+_GZIP_LEVEL = 6
+
+
+@dataclass
+class ParquetEncoding(BaseBatchFileEncoding):
+    """Parquet encoding for batch files."""
+
+    __encoding_format__ = "parquet"
+
+
+def _types(schema: dict) -> list[str]:
+    types = schema.get("type", [])
+    return [
+        kind
+        for kind in ([types] if isinstance(types, str) else types)
+        if kind != "null"
+    ]
+
+
+def _is_free_form(schema: dict) -> bool:
+    """Whether values of a schema have no fixed type, and are written as JSON."""
+    types = _types(schema)
+    return len(types) != 1 or (
+        types[0] == "object"
+        and not schema.get("properties")
+        and not isinstance(schema.get("additionalProperties"), dict)
+    )
+
+
+def _arrow_type(schema: dict) -> pa.DataType:
+    import pyarrow as pa
+
+    if _is_free_form(schema):
+        return pa.string()
+    (kind,) = _types(schema)
+    if kind == "object":
+        if schema.get("properties"):
+            return pa.struct(_arrow_fields(schema))
+        return pa.map_(pa.string(), _arrow_type(schema["additionalProperties"]))
+    if kind == "array":
+        return pa.list_(_arrow_type(schema.get("items", {})))
+    return {
+        "integer": pa.int64(),
+        "number": pa.float64(),
+        "boolean": pa.bool_(),
+    }.get(kind, pa.string())
+
+
+def _arrow_fields(schema: dict) -> list[pa.Field]:
+    import pyarrow as pa
+
+    return [
+        pa.field(name, _arrow_type(property_schema))
+        for name, property_schema in schema.get("properties", {}).items()
+    ]
+
+
+def _to_arrow(value: t.Any, schema: dict) -> t.Any:  # noqa: ANN401
+    """Convert a value to the Python objects of its Arrow type."""
+    if value is None:
+        return None
+    if _is_free_form(schema):
+        return to_json_line(value).rstrip("\n")
+    if isinstance(value, dict):
+        properties = schema.get("properties")
+        if properties:
+            return {
+                name: _to_arrow(value.get(name), property_schema)
+                for name, property_schema in properties.items()
+            }
+        # Maps are converted from lists of pairs
+        return [
+            (key, _to_arrow(item, schema["additionalProperties"]))
+            for key, item in value.items()
+        ]
+    if isinstance(value, list):
+        return [_to_arrow(item, schema.get("items", {})) for item in value]
+    return value
+
+
+class _BatchFile:
+    """A batch file being written."""
+
+    def __init__(
+        self,
+        filesystem: FS,
+        filename: str,
+        encoding: BaseBatchFileEncoding,
+        schema: dict | None = None,
+    ) -> None:
+        self.filesystem = filesystem
+        self.filename = filename
+        self.encoding = encoding
+        self.schema = schema
+        self.records = 0
+        self.size = 0
+        self._rows: list[dict] = []
+        self._raw: t.BinaryIO | None = None
+        self._file: t.BinaryIO | None = None
+        if encoding.format == "jsonl":
+            self._raw = self._file = filesystem.openbin(filename, "w")
+            if encoding.compression in (None, "gzip"):
+                self._file = t.cast(
+                    t.BinaryIO,
+                    gzip.GzipFile(
+                        fileobj=self._raw,
+                        mode="wb",
+                        compresslevel=_GZIP_LEVEL,
+                    ),
+                )
+
+    def write(self, record: dict) -> None:
+        line = to_json_line(record).encode()
+        if self._file is not None:
+            self._file.write(line)
+        else:
+            self._rows.append(record)
+        self.records += 1
+        self.size += len(line)
+
+    def close(self) -> str:
+        if self._file is not None:
+            self._file.close()
+            # Closing a gzip file leaves the underlying file open
+            t.cast(t.BinaryIO, self._raw).close()
+        else:
+            # Imported here, since pyarrow is slow to import and rarely used
+            import pyarrow as pa
+            import pyarrow.parquet
+
+            if self.schema is None:
+                table = pa.Table.from_pylist(self._rows)
+            else:
+                table = pa.Table.from_pylist(
+                    [_to_arrow(row, self.schema) for row in self._rows],
+                    schema=pa.schema(_arrow_fields(self.schema)),
+                )
+            compression = self.encoding.compression
+            with self.filesystem.openbin(self.filename, "w") as file:
+                pa.parquet.write_table(
+                    table,
+                    file,
+                    **({"compression": compression} if compression else {}),
+                )
+        return self.filesystem.geturl(self.filename)
+
+
+class BatchWriter:
+    """Write the records of each stream to batch files.
+
+    Records are appended to one open file per stream, which is closed and
+    announced with a BATCH message once it holds `batch_size` records or
+    `max_file_size` bytes of JSON. Callers close the files of the streams whose
+    state moved past their records before writing a STATE message, so targets
+    never get a state that covers records they have not received, and close
+    all files once a stream is done.
+
+    JSON Lines files are written as records come. Parquet files are written
+    once closed, from the records kept in memory until then, with the Arrow
+    schema matching the stream's, and require the `pyarrow` package.
+    """
+
+    def __init__(
+        self,
+        batch_config: BatchConfig,
+        *,
+        tap_name: str,
+        write_message: t.Callable[[singer.Message], None],
+        max_file_size: int | None = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            batch_config: Encoding, storage and number of records of the files.
+            tap_name: Name of the tap, used in file names.
+            write_message: Callable that writes the BATCH messages.
+            max_file_size: Bytes of JSON records after which files are rolled
+                over, if any.
+
+        Raises:
+            ConfigValidationError: If the format or compression is not supported,
+                or pyarrow is not installed for Parquet files.
+        """
+        encoding = batch_config.encoding
+        if encoding.format not in BATCH_FORMATS:
+            msg = f"Unsupported batch file format: {encoding.format!r}"
+            raise ConfigValidationError(msg)
+        if (
+            encoding.format == "jsonl"
+            and encoding.compression not in _JSONL_COMPRESSIONS
+        ):
+            msg = f"Unsupported compression of jsonl files: {encoding.compression!r}"
+            raise ConfigValidationError(msg)
+        if encoding.format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            msg = "Parquet batch files require the 'pyarrow' package"
+            raise ConfigValidationError(msg)
+
+        self.batch_config = batch_config
+        self.max_file_size = max_file_size
+        self._write_message = write_message
+        self._prefix = f"{batch_config.storage.prefix or ''}{tap_name}--"
+        self._sync_id = uuid4()
+        self._filesystem: FS | None = None
+        self._files: dict[str, _BatchFile] = {}
+        self._counts: dict[str, int] = {}
+        self._schemas: dict[str, dict] = {}
+
+    def set_schema(self, stream: str, schema: dict) -> None:
+        """Set the schema of a stream's records, used to type Parquet files.
+
+        Args:
+            stream: Name of the stream.
+            schema: JSON schema of the stream's records.
+        """
+        self._schemas[stream] = schema
+
+    def write(self, message: singer.RecordMessage) -> None:
+        """Write a record to the file of its stream, rolling it over if full.
+
+        Args:
+            message: The RECORD message of the record.
+        """
+        file = self._files.get(message.stream) or self._open(message.stream)
+        file.write(message.record)
+        if file.records >= self.batch_config.batch_size or (
+            self.max_file_size and file.size >= self.max_file_size
+        ):
+            self._close(message.stream)
+
+    def write_all(self, messages: t.Iterable[singer.RecordMessage]) -> None:
+        """Write several records.
+
+        Args:
+            messages: The RECORD messages of the records.
+        """
+        for message in messages:
+            self.write(message)
+
+    def close(self, stream: str) -> bool:
+        """Close the open file of a stream, announcing it with a BATCH message.
+
+        Args:
+            stream: Name of the stream.
+
+        Returns:
+            True if the stream had an open file.
+        """
+        if stream not in self._files:
+            return False
+        self._close(stream)
+        return True
+
+    def close_all(self) -> bool:
+        """Close the open files, announcing each with a BATCH message.
+
+        Returns:
+            True if any file was closed.
+        """
+        streams = list(self._files)
+        for stream in streams:
+            self._close(stream)
+        return bool(streams)
+
+    def _open(self, stream: str) -> _BatchFile:
+        if self._filesystem is None:
+            self._filesystem = fs.open_fs(
+                self.batch_config.storage.fs_url.geturl(),
+                writeable=True,
+                create=True,
+            )
+        index = self._counts[stream] = self._counts.get(stream, 0) + 1
+        encoding = self.batch_config.encoding
+        if encoding.format == "parquet":
+            extension = "parquet"
+        else:
+            extension = "json.gz" if encoding.compression in (None, "gzip") else "json"
+        file = self._files[stream] = _BatchFile(
+            self._filesystem,
+            f"{self._prefix}{stream}-{self._sync_id}-{index}.{extension}",
+            encoding,
+            self._schemas.get(stream),
+        )
+        return file
+
+    def _close(self, stream: str) -> None:
+        url = self._files.pop(stream).close()
+        self._write_message(
+            SDKBatchMessage(
+                stream=stream,
+                encoding=self.batch_config.encoding,
+                manifest=[url],
+            ),
+        )
@@ -0,0 +1,147 @@
+"""On-disk cache of parent stream records."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import tempfile
+import time
+import typing as t
+from dataclasses import dataclass, field
+from pathlib import Path
+
+if t.TYPE_CHECKING:
+    import os
+
+    import requests
+
+__all__ = ["CacheEntry", "ParentCache", "get_conditional_headers", "get_validators"]
+
+
+def get_validators(response: requests.Response) -> dict[str, str]:
+    """Get the cache validators of a response.
+
+    Args:
+        response: A response from the API.
+
+    Returns:
+        The `ETag` and `Last-Modified` headers that were sent, if any.
+    """
+    return {
+        name: response.headers[name]
+        for name in ("ETag", "Last-Modified")
+        if name in response.headers
+    }
+
+
+def get_conditional_headers(validators: dict[str, str]) -> dict[str, str]:
+    """Get the request headers to revalidate a cached response.
+
+    Args:
+        validators: Validators of the cached response.
+
+    Returns:
+        `If-None-Match` and `If-Modified-Since` headers.
+    """
+    headers = {}
+    if "ETag" in validators:
+        headers["If-None-Match"] = validators["ETag"]
+    if "Last-Modified" in validators:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+    return headers
+
+
+@dataclass
+class CacheEntry:
+    """Parent records cached for a stream.
+
+    `pages` holds the URL and validators of every page the records were read
+    from, so the listing can be revalidated page by page.
+    """
+
+    records: list[dict]
+    pages: list[dict[str, str]] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+
+
+class ParentCache:
+    """Store the records of parent streams on disk, for a limited time.
+
+    Only the fields needed to build child contexts are cached. Entries are
+    keyed by stream name and by a digest of the connection settings, so the
+    API token itself is never written to disk.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], ttl: float) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory the cache files are stored in.
+            ttl: Seconds after which entries must be revalidated.
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def _path(self, stream_name: str, config: dict[str, t.Any]) -> Path:
+        digest = hashlib.sha256(
+            json.dumps(config, sort_keys=True, default=str).encode(),
+        ).hexdigest()[:16]
+        return self.directory / f"{stream_name}-{digest}.json"
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether an entry can be used without revalidation.
+
+        Args:
+            entry: A cache entry.
+
+        Returns:
+            True if the entry is younger than the TTL.
+        """
+        return time.time() - entry.created_at < self.ttl
+
+    def load(self, stream_name: str, config: dict[str, t.Any]) -> CacheEntry | None:
+        """Load the cached records of a stream.
+
+        Args:
+            stream_name: Name of the parent stream.
+            config: Settings the records depend on.
+
+        Returns:
+            The cache entry, or None if there is no readable entry.
+        """
+        try:
+            with self._path(stream_name, config).open() as cache_file:
+                return CacheEntry(**json.load(cache_file))
+        except (OSError, TypeError, ValueError):
+            return None
+
+    def save(
+        self,
+        stream_name: str,
+        config: dict[str, t.Any],
+        entry: CacheEntry,
+    ) -> None:
+        """Atomically write the cached records of a stream.
+
+        Args:
+            stream_name: Name of the parent stream.
+            config: Settings the records depend on.
+            entry: The cache entry.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(stream_name, config)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=self.directory,
+            prefix=f".{path.name}",
+            delete=False,
+        ) as cache_file:
+            json.dump(
+                {
+                    "records": entry.records,
+                    "pages": entry.pages,
+                    "created_at": entry.created_at,
+                },
+                cache_file,
+            )
+        Path(cache_file.name).replace(path)
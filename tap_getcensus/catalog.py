@@ -0,0 +1,76 @@
+"""Catalog of the tap's streams, precomputed for fast discovery.
+
+Building the catalog requires creating every stream and its schema, although
+it only depends on the stream classes. It is written to `catalog.json` in the
+package whenever the streams change, by running::
+
+    python -m tap_getcensus.catalog
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import typing as t
+from pathlib import Path
+
+from singer_sdk._singerlib import Catalog
+
+if t.TYPE_CHECKING:
+    from singer_sdk import Stream
+
+__all__ = ["CATALOG_PATH", "build_catalog", "load_catalog", "read_catalog_text"]
+
+#: Path of the precomputed catalog.
+CATALOG_PATH = Path(__file__).with_name("catalog.json")
+
+
+def build_catalog(streams: t.Iterable[Stream]) -> dict:
+    """Build the catalog of streams, as discovery would.
+
+    Args:
+        streams: The streams of the tap.
+
+    Returns:
+        The catalog, as a dictionary.
+    """
+    return Catalog(
+        (stream.tap_stream_id, stream._singer_catalog_entry)  # noqa: SLF001
+        for stream in streams
+    ).to_dict()
+
+
+@functools.lru_cache(maxsize=None)
+def read_catalog_text() -> str | None:
+    """Read the precomputed catalog, formatted as discovery prints it.
+
+    Returns:
+        The catalog JSON, or None if it was not written.
+    """
+    try:
+        return CATALOG_PATH.read_text(encoding="utf-8").rstrip("\n")
+    except FileNotFoundError:
+        return None
+
+
+def load_catalog() -> Catalog | None:
+    """Load the precomputed catalog.
+
+    Returns:
+        The catalog, or None if it was not written.
+    """
+    text = read_catalog_text()
+    return None if text is None else Catalog.from_dict(json.loads(text))
+
+
+def main() -> None:
+    """Write the catalog of the tap's streams to the package."""
+    from tap_getcensus.tap import TapCensus
+
+    tap = TapCensus(config={"api_token": ""}, validate_config=False)
+    catalog = build_catalog(tap.discover_streams())
+    CATALOG_PATH.write_text(json.dumps(catalog, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,258 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import queue
+import threading
+import time
 import typing as t
-from urllib.parse import ParseResult, parse_qsl
+import weakref
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from urllib.parse import ParseResult, parse_qsl, urlparse
 
-from singer_sdk import RESTStream
+import requests
+import singer_sdk._singerlib as singer
+from singer_sdk import RESTStream, metrics
 from singer_sdk.authenticators import BasicAuthenticator
+from singer_sdk.exceptions import FatalAPIError
+from singer_sdk.helpers._state import PROGRESS_MARKERS
+from singer_sdk.helpers._typing import TypeConformanceLevel
+from singer_sdk.helpers._util import utc_now
 from singer_sdk.pagination import BaseHATEOASPaginator
 
+from tap_getcensus.cache import CacheEntry, get_conditional_headers, get_validators
+from tap_getcensus.conform import RecordConformer
+from tap_getcensus.dedupe import DuplicateFilter
+from tap_getcensus.fingerprint import DELETED_AT, FINGERPRINTS, FingerprintIndex
+from tap_getcensus.jsonstream import StreamingBody
+from tap_getcensus.pagesize import PageSizer
+from tap_getcensus.ratelimit import get_retry_after
+from tap_getcensus.state import compact_partitions, get_watermark
+from tap_getcensus.telemetry import Counter, Phase, take_connection_times
+
 if t.TYPE_CHECKING:
-    import requests
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from backoff.types import Details
+    from singer_sdk import Stream, Tap
+    from singer_sdk import typing as th
+    from singer_sdk.helpers._batch import BatchConfig
+
+    from tap_getcensus.tap import TapCensus
+
+DEFAULT_API_URL = "https://app.getcensus.com"
+
+_JSONLoads = t.Callable[[t.Union[str, bytes]], t.Any]
+
+
+def _get_json_loads() -> _JSONLoads:
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        return json.loads
+    return orjson.loads
+
+
+# Decoder of JSON bodies, orjson's if it is installed
+json_loads = _get_json_loads()
+
+_decoded_bodies: weakref.WeakKeyDictionary[
+    requests.Response,
+    t.Any,
+] = weakref.WeakKeyDictionary()
+
+_END = object()
+
+# Pages of records a partition fetched in advance holds, until they are emitted
+_PREFETCHED_PAGES = 2
+
+# Label of the workspace of a record, when several workspaces are synced
+_WORKSPACE_SCHEMA = {
+    "type": ["string", "null"],
+    "description": "Label of the workspace, when several are synced",
+}
+
+# Statuses of requests whose parameters, such as the page size, were rejected
+_REJECTED_STATUSES = (HTTPStatus.BAD_REQUEST, HTTPStatus.UNPROCESSABLE_ENTITY)
+
+# A requested page: the request, the requested page size, the response and
+# the cached page it was revalidated against
+_Page = t.Tuple[
+    "requests.PreparedRequest",
+    int,
+    "requests.Response",
+    t.Optional[t.Dict[str, str]],
+]
+
+# Contexts of the responses whose bodies are still to be parsed
+_response_contexts: weakref.WeakKeyDictionary[
+    requests.Response,
+    dict | None,
+] = weakref.WeakKeyDictionary()
+
+
+def decode_response(response: requests.Response) -> t.Any:  # noqa: ANN401
+    """Decode a response's JSON body, at most once per response.
+
+    The paginator and the record parser both need the body, so the decoded
+    value is cached for as long as the response object is alive.
+
+    Args:
+        response: The response from the API.
+
+    Returns:
+        The decoded JSON body.
+    """
+    try:
+        return _decoded_bodies[response]
+    except KeyError:
+        body = _decoded_bodies[response] = json_loads(response.content)
+        return body
+
+
+def context_key(context: dict | None) -> tuple:
+    """Get a hashable key for a stream context.
+
+    Args:
+        context: Stream partition or context dictionary.
+
+    Returns:
+        A tuple of the context's sorted items.
+    """
+    return tuple(sorted((context or {}).items()))
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp returned by the Census API.
+
+    Args:
+        value: The timestamp string.
+
+    Returns:
+        A timezone-aware datetime. Naive values are assumed to be UTC.
+    """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def workspace_context(context: dict | None) -> dict:
+    """Get the part of a stream context that identifies its workspace.
+
+    Args:
+        context: Stream partition or context dictionary.
+
+    Returns:
+        The `workspace` item of the context, if several workspaces are synced.
+    """
+    if not context or "workspace" not in context:
+        return {}
+    return {"workspace": context["workspace"]}
+
+
+def iter_descendants(stream: Stream) -> t.Iterator[Stream]:
+    """Iterate over the child streams of a stream, recursively.
+
+    Args:
+        stream: The parent stream.
+
+    Yields:
+        Each child, followed by its own descendants.
+    """
+    for child in stream.child_streams:
+        yield child
+        yield from iter_descendants(child)
+
+
+class RejectedRequestError(FatalAPIError):
+    """The API rejected the parameters of a request, such as its page size."""
+
+
+class LazySchema:
+    """A stream schema, built the first time it is read.
+
+    Assigned as the `schema` class attribute of a stream, it defers building
+    the JSON schema until a stream of that class is created, so importing the
+    streams of the tap does not pay for those that are never synced.
+    """
+
+    def __init__(self, build: t.Callable[[], th.PropertiesList]) -> None:
+        """Initialize the schema.
+
+        Args:
+            build: Callable returning the properties of the schema.
+        """
+        self._build = build
+        self._schema: dict | None = None
+
+    def __get__(self, instance: object, owner: type | None = None) -> dict:
+        """Get the JSON schema, building it on first access.
+
+        Streams created with a schema of their own, e.g. extended for the
+        tap's settings, get that one instead.
+
+        Args:
+            instance: The stream, or None if read from the class.
+            owner: The stream class.
+
+        Returns:
+            The JSON schema.
+        """
+        own_schema = getattr(instance, "_schema", None)
+        if own_schema is not None:
+            return own_schema
+        if self._schema is None:
+            self._schema = self._build().to_dict()
+        return self._schema
+
+
+class _PageQueue:
+    """A bounded queue of pages, handed over by a fetcher thread."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=maxsize)
+        self._closed = threading.Event()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the consumer is done with the pages."""
+        return self._closed.is_set()
+
+    def put(self, item: object) -> None:
+        """Put an item, waiting for a free slot unless the queue is closed."""
+        while not self.closed:
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def get(self) -> object:
+        """Get the next item, waiting for it if needed."""
+        return self._queue.get()
+
+    def close(self) -> None:
+        """Stop the fetcher, which is waiting to put an item or will be soon."""
+        self._closed.set()
 
 
 class CensusPaginator(BaseHATEOASPaginator):
     """Census API pagination class."""
 
+    def __init__(self, start_url: str | None = None) -> None:
+        """Create a new paginator.
+
+        Args:
+            start_url: URL of the page to start from, instead of the first page.
+        """
+        super().__init__()
+        if start_url:
+            self._value = urlparse(start_url)
+
     def get_next_url(self, response: requests.Response) -> str | None:
         """Get the next URL.
 
@@ -25,28 +263,243 @@ class CensusPaginator(BaseHATEOASPaginator):
         Returns:
             The next URL.
         """
-        return response.json().get("next")
+        return decode_response(response).get("next")
 
 
 class CensusStream(RESTStream):
     """Census stream class."""
 
-    url_base = "https://app.getcensus.com"
-    records_jsonpath = "$.data[*]"
+    #: Size of the chunks read from the socket when streaming responses.
+    stream_chunk_size = 1 << 16
+
+    def __init__(
+        self,
+        tap: Tap,
+        name: str | None = None,
+        schema: dict[str, t.Any] | None = None,
+        path: str | None = None,
+    ) -> None:
+        """Initialize the Census stream.
+
+        Args:
+            tap: Singer Tap this stream belongs to.
+            name: Name of this stream.
+            schema: JSON schema for records in this stream, instead of the
+                class schema extended for the tap's settings.
+            path: URL path for this entity stream.
+        """
+        if schema is None:
+            schema = self.get_extended_schema(tap.config)
+        super().__init__(tap=tap, name=name, schema=schema, path=path)
+        if self.config.get("workspaces"):
+            # Records of different workspaces may have the same IDs
+            self.primary_keys = ["workspace", *(self.primary_keys or ())]
+        self._prefetched: dict[tuple, tuple[Future[None], _PageQueue]] = {}
+        self._partition_page_sizes: dict[tuple, int] = {}
+        self._page_validators: dict[tuple, list[dict[str, str]]] = {}
+        self._page_sizer: PageSizer | None = None
+        self._current_context: dict | None = None
+        self._conformer: RecordConformer | None = None
+        self._warned_unmapped: set[tuple[str, ...]] = set()
+        self._context_states: dict[tuple, dict] = {}
+        self._fingerprints: dict[tuple, FingerprintIndex] = {}
+        self._synced_partitions: list[dict] = []
+        self._state_written_at = float("-inf")
+        # Streams of the batch files with records of this stream, and whether
+        # the state moved past those records
+        self._batched_streams: set[str] = set()
+        self._batches_covered = False
+
+    @classmethod
+    def get_extended_schema(
+        cls: type[CensusStream],
+        config: t.Mapping[str, t.Any],
+    ) -> dict:
+        """Get the class schema, with the properties some settings add.
+
+        Records get a `workspace` property when several workspaces are synced,
+        and tombstones a `_sdc_deleted_at` one when they are emitted.
+
+        Args:
+            config: Tap configuration dictionary.
+
+        Returns:
+            A copy of the JSON schema, if it is extended.
+        """
+        schema: dict = cls.schema  # type: ignore[assignment]
+        properties = schema["properties"]
+        if config.get("workspaces"):
+            properties = {"workspace": _WORKSPACE_SCHEMA, **properties}
+        # Like `_emits_tombstones`, which needs the stream's config
+        if (
+            config.get("change_detection")
+            and config.get("emit_tombstones")
+            and cls.replication_key is None
+        ):
+            properties = {
+                **properties,
+                DELETED_AT: {"type": ["string", "null"], "format": "date-time"},
+            }
+        if properties is schema["properties"]:
+            return schema
+        return {**schema, "properties": properties}
 
     @property
-    def authenticator(self) -> BasicAuthenticator:
-        """Get an authenticator object.
+    def census_tap(self) -> TapCensus:
+        """Get the tap this stream belongs to.
 
         Returns:
-            The authenticator instance for this REST stream.
+            The Census tap instance.
+        """
+        return t.cast("TapCensus", self._tap)
+
+    @property
+    def url_base(self) -> str:
+        """Get the base URL of the API.
+
+        Returns:
+            The `api_url` setting, without a trailing slash.
+        """
+        return self.config.get("api_url", DEFAULT_API_URL).rstrip("/")
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Get the HTTP session, shared with the other streams of the tap.
+
+        Returns:
+            The tap's `requests.Session`.
+        """
+        return self.census_tap.http_session
+
+    @property
+    def max_concurrency(self) -> int:
+        """Maximum number of child partitions fetched in parallel.
+
+        Returns:
+            The configured concurrency, at least 1.
+        """
+        return max(int(self.config.get("max_concurrency", 1)), 1)
+
+    #: Sort order requested from the API. Incremental streams request newest
+    #: records first so pagination can stop once the bookmark is reached.
+    sort_order = "asc"
+
+    #: Whether unchanged pages may be skipped when `conditional_requests` is
+    #: enabled. Only slowly changing metadata streams opt in.
+    conditional_requests = False
+
+    #: Setting with the IDs of the records to sync instead of listing them all,
+    #: for parent streams that support it.
+    ids_setting: str | None = None
+
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Get the partitions of the stream, one per workspace if several.
+
+        Returns:
+            The context of each workspace, or the partitions in the state if a
+            single workspace is synced.
+        """
+        workspaces = self.census_tap.workspaces
+        if workspaces is None or self.parent_stream_type is not None:
+            return super().partitions
+        return [{"workspace": label} for label in workspaces]
+
+    def get_workspace_config(self, context: dict | None) -> t.Mapping[str, t.Any]:
+        """Get the settings of the workspace a partition belongs to.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The settings of the partition's workspace, or those of the tap if a
+            single workspace is synced.
+        """
+        workspaces = self.census_tap.workspaces
+        if workspaces is None or not context or "workspace" not in context:
+            return self.config
+        return workspaces[context["workspace"]]
+
+    def get_configured_ids(self, context: dict | None) -> list[int] | None:
+        """Get the IDs of the records to sync, if the listing is skipped.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The IDs in the `ids_setting` setting of the workspace, or None if
+            it is not set.
         """
-        api_token = self.config["api_token"]
+        config = self.get_workspace_config(context)
+        if self.ids_setting is None or config.get(self.ids_setting) is None:
+            return None
+        return list(config[self.ids_setting])
+
+    def get_authenticator(self, context: dict | None) -> BasicAuthenticator:
+        """Get an authenticator for the requests of a partition.
 
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            An authenticator with the token of the partition's workspace.
+        """
         return BasicAuthenticator.create_for_stream(
             self,
             username="bearer",
-            password=api_token,
+            password=self.get_workspace_config(context).get("api_token", ""),
+        )
+
+    @property
+    def authenticator(self) -> BasicAuthenticator:
+        """Get an authenticator object.
+
+        Returns:
+            The authenticator instance for this REST stream.
+        """
+        return self.get_authenticator(None)
+
+    def build_prepared_request(
+        self,
+        *args: t.Any,  # noqa: ANN401
+        **kwargs: t.Any,  # noqa: ANN401
+    ) -> requests.PreparedRequest:
+        """Build a request, authenticated with `authenticator` unless given `auth`.
+
+        Unlike the SDK, the authenticator is not set on the shared session,
+        which requests of other workspaces are prepared with at the same time.
+
+        Args:
+            *args: Arguments to pass to `requests.Request`.
+            **kwargs: Keyword arguments to pass to `requests.Request`.
+
+        Returns:
+            The prepared request.
+        """
+        kwargs.setdefault("auth", self.authenticator)
+        return self.requests_session.prepare_request(requests.Request(*args, **kwargs))
+
+    def prepare_request(
+        self,
+        context: dict | None,
+        next_page_token: ParseResult | None,
+    ) -> requests.PreparedRequest:
+        """Prepare the request for a page of a partition.
+
+        Args:
+            context: Stream partition or context dictionary.
+            next_page_token: URL of the page, or None for the first one.
+
+        Returns:
+            The request, authenticated with the token of the partition's
+            workspace.
+        """
+        return self.build_prepared_request(
+            method=self.rest_method,
+            url=self.get_url(context),
+            params=self.get_url_params(context, next_page_token),
+            headers=self.http_headers,
+            auth=self.get_authenticator(context),
         )
 
     @property
@@ -60,13 +513,37 @@ class CensusStream(RESTStream):
         headers["User-Agent"] = f"{self.tap_name}/{self._tap.plugin_version}"
         return headers
 
+    @property
+    def page_sizer(self) -> PageSizer:
+        """Get the page sizer for this stream.
+
+        Returns:
+            A page sizer configured from `page_size`, `stream_page_sizes` and
+            the adaptive page size settings.
+        """
+        if self._page_sizer is None:
+            size = self.config.get("stream_page_sizes", {}).get(
+                self.name,
+                self.config.get("page_size", 250),
+            )
+            self._page_sizer = PageSizer(
+                size,
+                adaptive=self.config.get("adaptive_page_size", False),
+                max_size=self.config.get("max_page_size", 1000),
+                target_latency=self.config.get("target_page_latency", 2.0),
+            )
+        return self._page_sizer
+
     def get_url_params(
         self,
-        context: dict | None,  # noqa: ARG002
+        context: dict | None,
         next_page_token: ParseResult | None,
     ) -> dict[str, t.Any]:
         """Get URL query parameters.
 
+        The page size is chosen on the first page of each partition and kept
+        for the rest of it, so page offsets stay consistent.
+
         Args:
             context: Stream sync context.
             next_page_token: Next offset.
@@ -74,9 +551,13 @@ class CensusStream(RESTStream):
         Returns:
             Mapping of URL query parameters.
         """
+        key = context_key(context)
+        if next_page_token is None or key not in self._partition_page_sizes:
+            self._partition_page_sizes[key] = self.page_sizer.size
+
         params = {
-            "order": "asc",
-            "per_page": "250",
+            "order": self.sort_order,
+            "per_page": str(self._partition_page_sizes[key]),
         }
 
         if next_page_token:
@@ -84,10 +565,1658 @@ class CensusStream(RESTStream):
 
         return params
 
-    def get_new_paginator(self) -> CensusPaginator:
+    def get_new_paginator(self, start_url: str | None = None) -> CensusPaginator:
         """Get a new paginator instance.
 
+        Args:
+            start_url: URL of the page to start from, when resuming a partition.
+
         Returns:
             A new paginator instance.
         """
-        return CensusPaginator()
+        return CensusPaginator(start_url)
+
+    @property
+    def stream_responses(self) -> bool:
+        """Whether to parse response bodies incrementally.
+
+        Pages revalidated with conditional requests are always downloaded in
+        full, since their body hash must be known before records are emitted.
+
+        Returns:
+            True if records should be parsed as the body is downloaded.
+        """
+        return (
+            bool(self.config.get("stream_responses", False))
+            and not self._uses_conditional_requests
+        )
+
+    @property
+    def _uses_conditional_requests(self) -> bool:
+        # Parents of selected streams are read in full, since their records
+        # are needed to sync the child partitions.
+        return (
+            self.conditional_requests
+            and bool(self.config.get("conditional_requests", False))
+            and not self.has_selected_descendents
+        )
+
+    @property
+    def _detects_changes(self) -> bool:
+        # Incremental streams only emit changed records already
+        return (
+            bool(self.config.get("change_detection", False))
+            and self.replication_key is None
+        )
+
+    @property
+    def _emits_tombstones(self) -> bool:
+        return self._detects_changes and bool(
+            self.config.get("emit_tombstones", False),
+        )
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a request, deferring the body download when streaming.
+
+        Requests are paced by the rate limiter of their workspace, and go
+        through the tap's async transport when it is enabled, in which case
+        bodies are always downloaded before parsing.
+
+        Connection, time to first byte and download times are added to the
+        tap's metrics, as well as the body size unless it is streamed.
+
+        Args:
+            prepared_request: The request to send.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The validated response.
+        """
+        rate_limiter = self.census_tap.get_rate_limiter(
+            self.get_workspace_config(context).get("api_token", ""),
+        )
+        rate_limiter.acquire()
+
+        transport = self.census_tap.http_transport
+        take_connection_times()
+        start = time.perf_counter()
+        if transport is not None:
+            response = transport.send(prepared_request, timeout=self.timeout)
+        else:
+            response = self.requests_session.send(
+                prepared_request,
+                timeout=self.timeout,
+                stream=self.stream_responses,
+            )
+        self._record_response_times(response, context, time.perf_counter() - start)
+        _response_contexts[response] = context
+
+        rate_limiter.update(response)
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        self.validate_response(response)
+        return response
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Validate a response, telling rejected parameters from other errors.
+
+        Args:
+            response: The response to validate.
+
+        Raises:
+            RejectedRequestError: If the API rejected the request's parameters.
+        """
+        if response.status_code in _REJECTED_STATUSES:
+            raise RejectedRequestError(self.response_error_message(response))
+        super().validate_response(response)
+
+    def _record_response_times(
+        self,
+        response: requests.Response,
+        context: dict | None,
+        seconds: float,
+    ) -> None:
+        telemetry = self.census_tap.telemetry
+        connect, tls = take_connection_times()
+        elapsed = response.elapsed.total_seconds()
+        telemetry.add_time(self.name, context, Phase.CONNECT, connect)
+        telemetry.add_time(self.name, context, Phase.TLS, tls)
+        telemetry.add_time(
+            self.name,
+            context,
+            Phase.TTFB,
+            max(elapsed - connect - tls, 0.0),
+        )
+        if not self.stream_responses:
+            telemetry.add_time(
+                self.name,
+                context,
+                Phase.DOWNLOAD,
+                max(seconds - elapsed, 0.0),
+            )
+            telemetry.increment(
+                self.name,
+                context,
+                Counter.BYTES,
+                len(response.content),
+            )
+
+    def backoff_handler(self, details: Details) -> None:
+        """Log and count a retry.
+
+        Args:
+            details: backoff invocation details
+                https://github.com/litl/backoff#event-handlers
+        """
+        super().backoff_handler(details)
+        args = details.get("args") or ()
+        context = args[1] if len(args) > 1 else None
+        self.census_tap.telemetry.increment(self.name, context, Counter.RETRIES)
+
+    def backoff_wait_generator(self) -> t.Generator[float, t.Any, None]:
+        """Wait for the server's `Retry-After` delay, or back off exponentially.
+
+        Yields:
+            The number of seconds to wait before each retry.
+        """
+        exception = yield  # type: ignore[misc]
+        attempt = 0
+        while True:
+            retry_after = get_retry_after(getattr(exception, "response", None))
+            if retry_after is None:
+                retry_after = 2 * 2**attempt
+                attempt += 1
+            exception = yield retry_after
+
+    def parse_response(self, response: requests.Response) -> t.Iterable[dict]:
+        """Parse the response and return an iterator of result records.
+
+        All Census list endpoints return their records in a top-level `data`
+        array, so it is read directly instead of through a JSONPath expression.
+
+        Args:
+            response: The response from the API.
+
+        Yields:
+            One item for every item found in the response.
+        """
+        if not self.stream_responses:
+            yield from decode_response(response).get("data") or []
+            return
+
+        context = _response_contexts.get(response)
+        telemetry = self.census_tap.telemetry
+        download = 0.0
+        received = 0
+
+        def read_chunks() -> t.Iterator[bytes]:
+            nonlocal download, received
+            chunks = response.iter_content(self.stream_chunk_size)
+            while True:
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                download += time.perf_counter() - start
+                if chunk is None:
+                    return
+                received += len(chunk)
+                yield chunk
+
+        body = StreamingBody(read_chunks())
+        records = iter(body)
+        parsing = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                record = next(records, _END)
+                parsing += time.perf_counter() - start
+                if record is _END:
+                    break
+                yield t.cast(dict, record)
+        finally:
+            response.close()
+            telemetry.add_time(self.name, context, Phase.DOWNLOAD, download)
+            telemetry.add_time(self.name, context, Phase.DECODE, parsing - download)
+            telemetry.increment(self.name, context, Counter.BYTES, received)
+        _decoded_bodies[response] = body.fields
+
+    def get_bookmark(self, context: dict | None) -> datetime | None:
+        """Get the bookmark to filter records and stop pagination.
+
+        Only applies to incremental streams sorted newest-first. Unlike
+        `get_starting_timestamp`, this never writes to the tap state, so it is
+        safe to call before the partition is synced.
+
+        Partitions with a bookmark of their own, e.g. those skipped or resumed
+        when the watermark was last moved, are not covered by the watermark.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The starting timestamp, or None if records should not be filtered.
+        """
+        if not self.replication_key or self.sort_order != "desc":
+            return None
+
+        state = self._read_context_state(context)
+        bookmark = (
+            state.get("replication_key_value")
+            if state.get("replication_key") == self.replication_key
+            else None
+        ) or get_watermark(
+            self._read_context_state(None),
+            context,
+            self.replication_key,
+        )
+        values = [
+            parse_datetime(value)
+            for value in (bookmark, self.config.get("start_date"))
+            if value
+        ]
+        return max(values) if values else None
+
+    @property
+    def end_date(self) -> datetime | None:
+        """Get the latest replication key value of the records to sync.
+
+        Returns:
+            None, unless the stream is synced up to a configured date.
+        """
+        return None
+
+    def get_cached_pages(self, context: dict | None) -> list[dict[str, str]] | None:
+        """Get the pages saved by the previous sync, to revalidate them.
+
+        Like `get_bookmark`, this never writes to the tap state.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            URL, validators, body hash and next link of every page, or None if
+            the stream does not use conditional requests.
+        """
+        if not self._uses_conditional_requests:
+            return None
+        return self._read_context_state(context).get("pages", [])
+
+    def get_checkpoint(self, context: dict | None) -> dict[str, t.Any]:
+        """Get the progress of a partition saved by an interrupted sync.
+
+        Like `get_bookmark`, this never writes to the tap state.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            Either `{"complete": True}` for partitions that were fully synced,
+            or the `next` URL of the first page that was not, with the latest
+            replication key value seen before it. Empty if the partition should
+            be synced from the start.
+        """
+        if not context:
+            return {}
+        return self._read_context_state(context).get("checkpoint", {})
+
+    def _read_context_state(self, context: dict | None) -> dict:
+        state = self.tap_state.get("bookmarks", {}).get(self.name, {})
+        if context and context_key(context) in self._context_states:
+            return self._context_states[context_key(context)]
+        if context:
+            state = next(
+                (
+                    partition
+                    for partition in state.get("partitions", [])
+                    if partition.get("context") == context
+                ),
+                {},
+            )
+        return state
+
+    def get_records(self, context: dict | None) -> t.Iterable[dict]:
+        """Return a generator of record-type dictionary objects.
+
+        Records of this partition may have been fetched in advance by the
+        parent stream, and parent streams that only run to feed their children
+        may read their records from the tap's parent cache. When child
+        partitions are fetched concurrently, child fetches are started while
+        this stream's records are still being emitted.
+
+        With conditional requests, records of unchanged pages are skipped and
+        the validators of every page are saved in the partition state once all
+        records were emitted.
+
+        Child partitions are checkpointed in the state: the URL of the next
+        page is saved after each page, and the partition is marked complete
+        once all its records were emitted. If the sync is interrupted, the next
+        one skips complete partitions and resumes the others at their saved
+        page. Checkpoints are cleared when the parent stream is done.
+
+        When profiling is enabled, the work done while the records are synced
+        is charged to this stream.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        profiler = self.census_tap.profiler
+        if profiler is None:
+            yield from self._get_records(context)
+            return
+
+        with profiler.profile(self.name):
+            yield from self._get_records(context)
+
+    def get_context_state(self, context: dict | None) -> dict:
+        """Get the writable state of a partition, creating it if needed.
+
+        Partition states are looked up once and then indexed by context, since
+        the SDK does a linear search of the partitions on every record.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The partition state, or the stream state if there is no context.
+        """
+        if not context:
+            return super().get_context_state(context)
+        key = context_key(context)
+        try:
+            return self._context_states[key]
+        except KeyError:
+            state = self._context_states[key] = super().get_context_state(context)
+            return state
+
+    def _increment_stream_state(
+        self,
+        latest_record: dict[str, t.Any],
+        *,
+        context: dict | None = None,
+    ) -> None:
+        """Update the state of a partition with a record's replication key value.
+
+        Args:
+            latest_record: The record.
+            context: Stream partition or context dictionary.
+        """
+        super()._increment_stream_state(latest_record, context=context)
+        if self.replication_key:
+            # The bookmark now covers the records in batch files
+            self._batches_covered = True
+
+    def _get_records(self, context: dict | None) -> t.Iterator[dict]:
+        key = context_key(context)
+        started = datetime.now(timezone.utc)
+        checkpoint = self.get_checkpoint(context)
+        if checkpoint.get("complete"):
+            self.logger.info(
+                "Skipping partition %s, synced before the previous sync was "
+                "interrupted",
+                context,
+            )
+            return
+        if checkpoint.get("replication_key_value") and self.replication_key:
+            self._increment_stream_state(
+                {self.replication_key: checkpoint["replication_key_value"]},
+                context=context,
+            )
+
+        if self.parent_stream_type is None and self.max_concurrency > 1:
+            self._prefetch_workspaces(context)
+
+        prefetched = self._prefetched.pop(key, None)
+        records: t.Iterable[dict]
+        if prefetched is not None and not prefetched[0].cancel():
+            records = self._receive_records(prefetched[1], context)
+        else:
+            # Partitions whose fetch has not started are fetched here, so this
+            # thread never waits for workers blocked on other partitions
+            records = self._fetch_records(
+                context,
+                self.get_bookmark(context),
+                self.get_cached_pages(context),
+                self.get_context_state(context)
+                if self.parent_stream_type is not None
+                else None,
+            )
+
+        if self.primary_keys and self.config.get("dedupe_records", True):
+            records = self._drop_duplicates(records, context)
+        if self.max_concurrency > 1 and self._children_to_prefetch:
+            records = self._prefetch_children(records, context)
+
+        self._current_context = context
+        workspace = (context or {}).get("workspace")
+        for record in records:
+            if workspace is not None:
+                record["workspace"] = workspace
+            yield record
+        self._finish_records(context, started, resumed=bool(checkpoint))
+
+    def _drop_duplicates(
+        self,
+        records: t.Iterable[dict],
+        context: dict | None,
+    ) -> t.Iterator[dict]:
+        """Drop the records of a partition whose primary key was already seen.
+
+        Args:
+            records: The records of the partition.
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The first record of each primary key.
+        """
+        duplicates = DuplicateFilter(self.primary_keys or ())
+        for record in records:
+            if duplicates.seen(record):
+                self.census_tap.telemetry.increment(
+                    self.name,
+                    context,
+                    Counter.DUPLICATE_RECORDS,
+                )
+                continue
+            yield record
+
+    def _fetch_records(
+        self,
+        context: dict | None,
+        bookmark: datetime | None,
+        cached_pages: list[dict[str, str]] | None,
+        partition_state: dict | None = None,
+    ) -> t.Iterator[dict]:
+        """Get the records of a partition from the API or the parent cache.
+
+        Args:
+            context: Stream partition or context dictionary.
+            bookmark: Timestamp of the oldest record to request, if any.
+            cached_pages: Pages saved by the previous sync, if conditional
+                requests are used.
+            partition_state: State of the partition, to resume from its
+                checkpoint and save the next page URL in after each page.
+
+        Returns:
+            The records of the partition.
+        """
+        if self.parent_stream_type is None:
+            ids = self.get_configured_ids(context)
+            if ids is not None:
+                return self._get_records_by_id(ids, context)
+            if self._uses_parent_cache:
+                return self._get_cached_parent_records(context)
+        return self._get_partition_records(
+            context,
+            bookmark,
+            cached_pages,
+            partition_state,
+        )
+
+    def get_child_contexts(self, context: dict | None) -> t.Iterator[dict]:
+        """Get the child contexts of a partition, without writing its records.
+
+        The records are read from the parent cache if it is used, or from the
+        configured IDs.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The child context of each record.
+        """
+        for record in self._fetch_records(context, None, None):
+            child_context = self.get_child_context(record, context)
+            if child_context is not None:
+                yield child_context
+
+    def _prefetch_workspaces(self, context: dict | None) -> None:
+        """Start fetching the records of the next workspaces in the background.
+
+        Up to `max_concurrency - 1` workspaces after the current one are
+        fetched ahead, in the tap's shared thread pool.
+
+        Args:
+            context: Context of the current workspace, if several are synced.
+        """
+        partitions = self.partitions
+        if not context or not partitions or context not in partitions:
+            return
+        index = partitions.index(context)
+        for upcoming in partitions[index + 1 : index + self.max_concurrency]:
+            if context_key(upcoming) not in self._prefetched:
+                self.prefetch(upcoming, self.census_tap.executor)
+
+    def _finish_records(
+        self,
+        context: dict | None,
+        started: datetime,
+        *,
+        resumed: bool,
+    ) -> None:
+        """Update the state once all records of a partition were emitted.
+
+        Args:
+            context: Stream partition or context dictionary.
+            started: When the partition started syncing.
+            resumed: Whether the partition was resumed from a checkpoint.
+        """
+        if self._uses_conditional_requests:
+            pages = self._page_validators.pop(context_key(context), [])
+            self.get_context_state(context)["pages"] = pages
+
+        if self._detects_changes and self.selected:
+            self._save_fingerprints(context, resumed=resumed)
+
+        if self.parent_stream_type is None:
+            for stream in iter_descendants(self):
+                if isinstance(stream, CensusStream):
+                    stream.compact_state(
+                        started,
+                        fold=self.get_configured_ids(context) is None,
+                        scope=context,
+                    )
+            # The final state is written next, and covers every batch file
+            self._close_batch_files()
+            self._is_state_flushed = False
+            self.census_tap.telemetry.stream_done(
+                self.name,
+                *(stream.name for stream in iter_descendants(self)),
+            )
+        elif context is not None:
+            # Partitions of child streams are the contexts of parent records
+            self.get_context_state(context)["checkpoint"] = {"complete": True}
+            self._is_state_flushed = False
+            self._batches_covered = True
+            if not resumed:
+                self._synced_partitions.append(context)
+            self.census_tap.telemetry.partition_done(self.name, context)
+
+    def _lists_all_records(self, context: dict | None) -> bool:
+        """Whether every record of a partition is emitted when it is synced.
+
+        Records of pages skipped with conditional requests are not seen, nor
+        are those left out of the configured IDs, so they cannot be told apart
+        from deleted ones.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            True if records missing from the partition were deleted.
+        """
+        return (
+            not self._uses_conditional_requests
+            and self.get_configured_ids(context) is None
+        )
+
+    def _save_fingerprints(self, context: dict | None, *, resumed: bool) -> None:
+        """Drop the fingerprints of deleted records once a partition is synced.
+
+        Records are only known to be deleted if the partition was listed in
+        full, otherwise their fingerprints are kept.
+
+        Args:
+            context: Stream partition or context dictionary.
+            resumed: Whether the partition was resumed from a checkpoint.
+        """
+        index = self._get_fingerprint_index(context)
+        del self._fingerprints[context_key(context)]
+        if not resumed and self._lists_all_records(context):
+            self._write_tombstones(index.pop_deleted(), context)
+        if not index.fingerprints:
+            self.get_context_state(context).pop(FINGERPRINTS, None)
+
+    def _get_fingerprint_index(self, context: dict | None) -> FingerprintIndex:
+        """Get the fingerprints of a partition's records, saved in its state.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The fingerprint index of the partition.
+        """
+        key = context_key(context)
+        try:
+            return self._fingerprints[key]
+        except KeyError:
+            state = self.get_context_state(context)
+            index = self._fingerprints[key] = FingerprintIndex(
+                state.setdefault(FINGERPRINTS, {}),
+                self.primary_keys or (),
+            )
+            return index
+
+    def _write_tombstones(self, deleted: list[dict], context: dict | None) -> None:
+        """Count the records deleted since the previous sync, and emit tombstones.
+
+        Args:
+            deleted: Primary key values of the deleted records.
+            context: Stream partition or context dictionary.
+        """
+        if not deleted:
+            return
+        self.census_tap.telemetry.increment(
+            self.name,
+            context,
+            Counter.DELETED_RECORDS,
+            len(deleted),
+        )
+        if not self._emits_tombstones:
+            return
+        deleted_at = utc_now().isoformat()
+        for key in deleted:
+            self._write_record({**key, DELETED_AT: deleted_at})
+
+    def compact_state(
+        self,
+        started: datetime,
+        *,
+        fold: bool = True,
+        scope: dict | None = None,
+    ) -> None:
+        """Clear partition checkpoints once the parent stream is done.
+
+        With `compact_state`, the bookmarks of partitions synced in full are
+        also folded into the stream watermark, set to the time the parent
+        started syncing less `state_watermark_margin`.
+
+        Args:
+            started: When the parent stream started syncing.
+            fold: Whether bookmarks may be folded. Only parents synced in full
+                cover every partition up to the watermark.
+            scope: Context of the parent's workspace, whose partitions alone
+                are compacted, if several are synced.
+        """
+        stream_state = self.tap_state.get("bookmarks", {}).get(self.name, {})
+        for partition in stream_state.get("partitions", []):
+            if not scope or scope.items() <= partition.get("context", {}).items():
+                partition.pop("checkpoint", None)
+
+        synced, self._synced_partitions = self._synced_partitions, []
+        self._context_states.clear()
+        if not fold or not self.config.get("compact_state", True):
+            return
+
+        margin = timedelta(seconds=self.config.get("state_watermark_margin", 300))
+        watermark = started - margin
+        if self.end_date is not None:
+            # Records after the end date were not synced
+            watermark = min(watermark, self.end_date)
+        compact_partitions(
+            stream_state,
+            synced,
+            replication_key=self.replication_key,
+            watermark=watermark.isoformat() if self.replication_key else None,
+            scope=scope,
+        )
+
+    def _write_state_message(self) -> None:
+        """Write out a STATE message, throttled for child streams.
+
+        Child streams write at most one STATE message every
+        `state_message_interval` seconds. The latest state is written by the
+        parent stream when it is done.
+
+        Batch files are closed first if the state moved past their records,
+        i.e. for each page checkpoint, bookmark or partition of their stream.
+        Other files stay open, and are closed once full or once the top-level
+        stream is done.
+        """
+        interval = self.config.get("state_message_interval", 5)
+        now = time.monotonic()
+        if (
+            self.parent_stream_type is not None
+            and now - self._state_written_at < interval
+        ):
+            return
+        self._close_covered_batch_files()
+        if not self._is_state_flushed:
+            self.census_tap.message_writer.write(
+                singer.StateMessage(value=self.tap_state),
+            )
+            self._is_state_flushed = True
+        elif self.parent_stream_type is None:
+            # Messages written since the last STATE, e.g. SCHEMA ones, are not
+            # held until the next stream
+            self.census_tap.message_writer.flush()
+        self._state_written_at = now
+
+    def flush_state(self) -> None:
+        """Write out a STATE message now, regardless of `state_message_interval`.
+
+        Open batch files are closed first.
+        """
+        self._close_batch_files()
+        self._is_state_flushed = False
+        self._state_written_at = float("-inf")
+        self._write_state_message()
+
+    def _close_batch_files(self) -> None:
+        """Close the open batch files, announcing them with BATCH messages."""
+        batch_writer = self.census_tap.batch_writer
+        if batch_writer is not None:
+            batch_writer.close_all()
+
+    def _close_covered_batch_files(self) -> None:
+        """Close the batch files of every stream whose state moved past them."""
+        if self.census_tap.batch_writer is None:
+            return
+        for stream in self.census_tap.streams.values():
+            if isinstance(stream, CensusStream):
+                stream.close_covered_batch_files()
+
+    def close_covered_batch_files(self) -> None:
+        """Close the batch files of this stream if its state moved past them."""
+        batch_writer = self.census_tap.batch_writer
+        if batch_writer is None or not self._batches_covered:
+            return
+        for name in self._batched_streams:
+            batch_writer.close(name)
+        self._batched_streams.clear()
+        self._batches_covered = False
+
+    def _write_schema_message(self) -> None:
+        """Write out a SCHEMA message with the stream schema.
+
+        The schema also types the stream's batch files, if any.
+        """
+        messages = list(self._generate_schema_messages())
+        batch_writer = self.census_tap.batch_writer
+        if batch_writer is not None:
+            for message in messages:
+                batch_writer.set_schema(message.stream, message.schema)
+        self.census_tap.message_writer.write_all(messages)
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write out a RECORD message, unless the record is unchanged.
+
+        With `change_detection`, records of full table streams are skipped if
+        their fingerprint matches the one saved by the previous sync.
+
+        Args:
+            record: A single stream record.
+        """
+        context = self._current_context
+        if self._detects_changes and not self._get_fingerprint_index(
+            context,
+        ).update(record):
+            self.census_tap.telemetry.increment(
+                self.name,
+                context,
+                Counter.UNCHANGED_RECORDS,
+            )
+            return
+        self._write_record(record)
+
+    def _write_record(self, record: dict) -> None:
+        """Write out a RECORD message, timing its validation and writing.
+
+        Records are written to batch files instead, if `batch_config` is set.
+
+        Args:
+            record: A single stream record.
+        """
+        start = time.perf_counter()
+        record_messages = list(self._generate_record_messages(record))
+        generated = time.perf_counter()
+        batch_writer = self.census_tap.batch_writer
+        if batch_writer is not None:
+            batch_writer.write_all(record_messages)
+            self._batched_streams.update(message.stream for message in record_messages)
+        else:
+            self.census_tap.message_writer.write_all(record_messages)
+        written = time.perf_counter()
+
+        telemetry = self.census_tap.telemetry
+        context = self._current_context
+        telemetry.add_time(self.name, context, Phase.VALIDATION, generated - start)
+        telemetry.add_time(self.name, context, Phase.WRITE, written - generated)
+        self._is_state_flushed = False
+
+    def get_batch_config(self, config: t.Mapping) -> BatchConfig | None:  # noqa: ARG002
+        """Get the batch config shared by all streams.
+
+        Args:
+            config: Tap configuration dictionary.
+
+        Returns:
+            The batch config, or None if records are written as RECORD messages.
+        """
+        batch_writer = self.census_tap.batch_writer
+        return batch_writer.batch_config if batch_writer else None
+
+    def _sync_batches(
+        self,
+        batch_config: BatchConfig,  # noqa: ARG002
+        context: dict | None = None,
+    ) -> None:
+        """Sync records to batch files.
+
+        Records go through the same steps as when they are written as RECORD
+        messages, STATE messages included, but end up in the files of the
+        tap's batch writer. Files are shared by the partitions of a stream, and
+        announced with BATCH messages once they are rolled over, a STATE
+        message covers their records, or the top-level stream is done.
+
+        Args:
+            batch_config: The batch configuration.
+            context: Stream partition or context dictionary.
+        """
+        for _ in self._sync_records(context=context):
+            pass
+
+    @property
+    def conformer(self) -> RecordConformer:
+        """Get the conformer of this stream's records.
+
+        It is compiled from the schema and selection mask on first use.
+
+        Returns:
+            The record conformer.
+        """
+        if self._conformer is None:
+            self._conformer = RecordConformer(
+                self.schema,
+                self.mask,
+                coerce_types=self.config.get("validate_records", True),
+            )
+        return self._conformer
+
+    def _generate_record_messages(
+        self,
+        record: dict,
+    ) -> t.Generator[singer.RecordMessage, None, None]:
+        """Conform a record and generate its RECORD messages.
+
+        This replaces the SDK's property selection and type conformance, which
+        walk the schema of every record, with the precompiled `conformer`.
+
+        Args:
+            record: A single stream record.
+
+        Yields:
+            Record message objects.
+        """
+        if self.TYPE_CONFORMANCE_LEVEL != TypeConformanceLevel.RECURSIVE:
+            yield from super()._generate_record_messages(record)
+            return
+
+        conformer = self.conformer
+        record, unmapped = conformer.conform(record)
+        if unmapped and conformer.coerce_types:
+            self._warn_unmapped(tuple(unmapped))
+
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            if mapped_record is not None:
+                yield singer.RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=utc_now(),
+                )
+
+    def _warn_unmapped(self, unmapped: tuple[str, ...]) -> None:
+        if unmapped not in self._warned_unmapped:
+            self._warned_unmapped.add(unmapped)
+            self.logger.warning(
+                "Properties %s were present in the '%s' stream but not found in "
+                "catalog schema. Ignoring.",
+                unmapped,
+                self.name,
+            )
+
+    @property
+    def _uses_parent_cache(self) -> bool:
+        return (
+            self.census_tap.parent_cache is not None
+            and bool(self.child_streams)
+            and not self.selected
+        )
+
+    def _get_records_by_id(
+        self,
+        ids: list[int],
+        context: dict | None,
+    ) -> t.Iterator[dict]:
+        """Get the records of the given IDs, without listing them all.
+
+        Streams that only run for their children yield the IDs alone, since
+        child contexts are built from them. Selected streams request each
+        record on its own.
+
+        Args:
+            ids: IDs of the records to get.
+            context: Context of the workspace, if several are synced.
+
+        Yields:
+            The record of each ID.
+        """
+        if not self.selected:
+            self.logger.info("Syncing the children of %d '%s'", len(ids), self.name)
+            for record_id in ids:
+                yield {"id": record_id}
+            return
+
+        decorated_request = self.request_decorator(self._request)
+        for record_id in ids:
+            prepared_request = self.build_prepared_request(
+                method="GET",
+                url=f"{self.get_url(context)}/{record_id}",
+                headers=self.http_headers,
+                auth=self.get_authenticator(context),
+            )
+            resp = decorated_request(prepared_request, context)
+            self.update_sync_costs(prepared_request, resp, context)
+            self._decode_page(resp, context)
+            record = decode_response(resp).get("data")
+            transformed_record = record and self.post_process(record, context)
+            if transformed_record:
+                yield transformed_record
+
+    def _get_cached_parent_records(self, context: dict | None) -> t.Iterator[dict]:
+        """Get the primary keys of parent records, from the cache if valid.
+
+        Cached entries past their TTL are revalidated with conditional requests
+        for each page of the listing. Any changed page triggers a full crawl.
+
+        Args:
+            context: Context of the workspace, if several are synced.
+
+        Yields:
+            Parent records, reduced to their primary keys when cached.
+        """
+        cache = self.census_tap.parent_cache
+        if cache is None:  # pragma: no cover
+            return
+        cache_config = {
+            "url_base": self.url_base,
+            "token": self.get_workspace_config(context)["api_token"],
+        }
+
+        entry = cache.load(self.name, cache_config)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                self.logger.info("Using cached '%s' records", self.name)
+                yield from entry.records
+                return
+
+            if self._revalidate(entry.pages, context):
+                self.logger.info("Using revalidated cached '%s' records", self.name)
+                entry.created_at = time.time()
+                cache.save(self.name, cache_config, entry)
+                yield from entry.records
+                return
+
+        records = []
+        for record in self._get_partition_records(context, None, None):
+            # The workspace is only added once the records are emitted
+            records.append(
+                {key: record[key] for key in self.primary_keys or () if key in record},
+            )
+            yield record
+
+        pages = self._page_validators.pop(context_key(context), [])
+        cache.save(self.name, cache_config, CacheEntry(records, pages))
+
+    def _revalidate(self, pages: list[dict[str, str]], context: dict | None) -> bool:
+        """Check with conditional requests that no page has changed.
+
+        Args:
+            pages: URL and validators of each cached page.
+            context: Context of the workspace, if several are synced.
+
+        Returns:
+            True if the server confirmed that every page is unchanged.
+        """
+        decorated_request = self.request_decorator(self._request)
+        for page in pages:
+            headers = get_conditional_headers(page)
+            if not headers:
+                return False
+
+            prepared_request = self.build_prepared_request(
+                method="GET",
+                url=page["url"],
+                headers={**self.http_headers, **headers},
+                auth=self.get_authenticator(context),
+            )
+            response = decorated_request(prepared_request, context)
+            response.close()
+            if response.status_code != HTTPStatus.NOT_MODIFIED:
+                return False
+        return bool(pages)
+
+    @property
+    def _children_to_prefetch(self) -> list[CensusStream]:
+        return [
+            child
+            for child in self.child_streams
+            if isinstance(child, CensusStream)
+            and (child.selected or child.has_selected_descendents)
+        ]
+
+    def _prefetch_children(
+        self,
+        records: t.Iterable[dict],
+        context: dict | None,
+    ) -> t.Iterator[dict]:
+        """Start fetching child partitions ahead of the parent records.
+
+        Up to `max_concurrency` parent records are held back while their child
+        partitions are fetched in the tap's shared thread pool. Records and
+        state are still written from the main thread, in the same order as a
+        serial sync.
+
+        Args:
+            records: The parent records.
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The parent records, in their original order.
+        """
+        children = self._children_to_prefetch
+        executor = self.census_tap.executor
+        window: deque[dict] = deque()
+
+        try:
+            for record in records:
+                child_context = self.get_child_context(record, context)
+                if child_context is not None:
+                    for child in children:
+                        child.prefetch(child_context, executor)
+
+                window.append(record)
+                if len(window) > self.max_concurrency:
+                    yield window.popleft()
+
+            while window:
+                yield window.popleft()
+        finally:
+            for child in children:
+                child.cancel_prefetch()
+
+    def prefetch(self, context: dict | None, executor: ThreadPoolExecutor) -> None:
+        """Start fetching the records of a partition in the background.
+
+        The bookmark, cached pages and checkpoint are read here, from the
+        calling thread, so that worker threads never touch the tap state: they
+        get a detached partition state to resume from. Partitions completed by
+        an interrupted sync are not fetched.
+
+        The records are handed over through a bounded queue, a page at a time,
+        so a worker holds no more than a few pages until they are emitted.
+        Checkpoints are handed over along, and saved once the records before
+        them are emitted.
+
+        Args:
+            context: Stream partition or context dictionary.
+            executor: The pool to fetch the partition in.
+        """
+        checkpoint = self.get_checkpoint(context)
+        if checkpoint.get("complete"):
+            return
+        bookmark = self.get_bookmark(context)
+        cached_pages = self.get_cached_pages(context)
+        partition_state = (
+            {"checkpoint": checkpoint} if self.parent_stream_type is not None else None
+        )
+        records = _PageQueue(_PREFETCHED_PAGES)
+        future = executor.submit(
+            self._hand_over_records,
+            self._fetch_records(context, bookmark, cached_pages, partition_state),
+            records,
+            self.page_sizer.size,
+            partition_state,
+        )
+        self._prefetched[context_key(context)] = (future, records)
+
+    def cancel_prefetch(self) -> None:
+        """Discard partitions fetched in advance that were never synced."""
+        for future, records in self._prefetched.values():
+            future.cancel()
+            records.close()
+        self._prefetched.clear()
+
+    def _hand_over_records(
+        self,
+        records: t.Iterator[dict],
+        pages: _PageQueue,
+        page_size: int,
+        partition_state: dict | None,
+    ) -> None:
+        """Hand records over a page at a time, until the last one or a stop.
+
+        Each page is handed over with the next page URL checkpointed after its
+        records, if any. Errors are handed over too, and the end of the records
+        is marked with the `_END` sentinel.
+
+        Args:
+            records: The records of the partition.
+            pages: Queue to hand the records over through.
+            page_size: Number of records handed over at once.
+            partition_state: Detached state the partition is checkpointed in.
+        """
+        state = partition_state or {}
+        handed_over = state.get("checkpoint")
+        page: list[dict] = []
+
+        def hand_over() -> None:
+            nonlocal handed_over, page
+            # Checkpoints are saved once the records of their page were read
+            checkpoint = state.get("checkpoint")
+            next_url = None
+            if checkpoint is not None and checkpoint is not handed_over:
+                next_url = checkpoint["next"]
+            pages.put((page, next_url))
+            handed_over = checkpoint
+            page = []
+
+        try:
+            for record in records:
+                if state.get("checkpoint") is not handed_over or len(page) >= page_size:
+                    hand_over()
+                    if pages.closed:
+                        return
+                page.append(record)
+            hand_over()
+        except Exception as ex:  # noqa: BLE001
+            hand_over()
+            pages.put(ex)
+        finally:
+            pages.put(_END)
+
+    def _receive_records(
+        self,
+        pages: _PageQueue,
+        context: dict | None,
+    ) -> t.Iterator[dict]:
+        """Get the records handed over by a worker, waiting for them if needed.
+
+        Checkpoints handed over are saved in the partition state once the
+        records before them were emitted.
+
+        Args:
+            pages: Queue the records are handed over through.
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The records of the partition.
+
+        Raises:
+            Exception: Any error raised while fetching the records.
+        """
+        try:
+            while True:
+                item = pages.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                page, next_url = t.cast("tuple[list[dict], str | None]", item)
+                yield from page
+                if next_url is not None:
+                    self._checkpoint(self.get_context_state(context), next_url)
+        finally:
+            pages.close()
+
+    def _get_partition_records(
+        self,
+        context: dict | None,
+        bookmark: datetime | None,
+        cached_pages: list[dict[str, str]] | None,
+        partition_state: dict | None = None,
+    ) -> t.Iterator[dict]:
+        for record in self._request_records(
+            context,
+            bookmark,
+            cached_pages,
+            partition_state,
+        ):
+            transformed_record = self.post_process(record, context)
+            if transformed_record is not None:
+                yield transformed_record
+
+    def request_records(self, context: dict | None) -> t.Iterable[dict]:
+        """Request records from the API, following `next` links.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every record in the response.
+        """
+        yield from self._request_records(
+            context,
+            self.get_bookmark(context),
+            self.get_cached_pages(context),
+        )
+
+    def _request_records(
+        self,
+        context: dict | None,
+        bookmark: datetime | None,
+        cached_pages: list[dict[str, str]] | None,
+        partition_state: dict | None = None,
+    ) -> t.Iterator[dict]:
+        """Request records, stopping at the bookmark.
+
+        Records older than the bookmark are dropped, and pagination stops at
+        the first page that contains such records.
+
+        Pages from the previous sync are requested conditionally, and their
+        records are skipped if the server answers 304 Not Modified or the body
+        hash has not changed.
+
+        Args:
+            context: Stream partition or context dictionary.
+            bookmark: Timestamp of the oldest record to request, if any.
+            cached_pages: Pages saved by the previous sync, if conditional
+                requests are used.
+            partition_state: State of the partition, to resume from its
+                checkpoint and save the next page URL in after each page.
+
+        Yields:
+            An item for every record in the response.
+        """
+        key = context_key(context)
+        if cached_pages is not None or (
+            self.parent_stream_type is None and self._uses_parent_cache
+        ):
+            # Validators are saved for the whole listing, so it is never resumed
+            self._page_validators[key] = []
+            partition_state = None
+        paginator = self._start_paginator(context, partition_state)
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            pages = self._request_pages(context, paginator, cached_pages, bookmark)
+            try:
+                for prepared_request, requested, resp, cached_page in pages:
+                    request_counter.increment()
+                    self.update_sync_costs(prepared_request, resp, context)
+                    if key in self._page_validators and self._track_page(
+                        key,
+                        resp,
+                        cached_page,
+                        tracks_changes=cached_pages is not None,
+                    ):
+                        self.logger.debug("Skipping unchanged page %s", resp.url)
+                        paginator.advance(resp)
+                        continue
+
+                    received = 0
+                    older_found = False
+                    for record in self.parse_response(resp):
+                        received += 1
+                        if bookmark is not None and record.get(self.replication_key):
+                            updated = parse_datetime(record[self.replication_key])
+                            if updated < bookmark:
+                                older_found = True
+                                continue
+                        yield record
+
+                    self.page_sizer.observe(
+                        requested=requested,
+                        received=received,
+                        latency=resp.elapsed.total_seconds(),
+                        has_more=paginator.has_more(resp),
+                    )
+
+                    if older_found:
+                        # Pages are sorted newest-first, so the rest is older
+                        break
+
+                    paginator.advance(resp)
+                    self._save_checkpoint(context, partition_state, paginator)
+            finally:
+                pages.close()
+
+        self._partition_page_sizes.pop(key, None)
+
+    @property
+    def prefetch_pages(self) -> int:
+        """Number of pages requested ahead of the records being emitted.
+
+        Returns:
+            The configured number of pages, 0 if pages are requested one at a
+            time.
+        """
+        return max(int(self.config.get("prefetch_pages", 0)), 0)
+
+    def _pipelines_pages(self, key: tuple) -> bool:
+        """Whether the next pages of a partition can be requested ahead.
+
+        Streamed bodies are read while records are emitted, and the pages of
+        conditional listings must be requested with the validators of the
+        previous sync, in order, so neither is pipelined.
+
+        Args:
+            key: Key of the partition's context.
+
+        Returns:
+            True if pages may be prefetched.
+        """
+        return (
+            self.prefetch_pages > 0
+            and not self.stream_responses
+            and key not in self._page_validators
+        )
+
+    def _prepare_page(
+        self,
+        context: dict | None,
+        next_page_token: ParseResult | None,
+    ) -> tuple[requests.PreparedRequest, int]:
+        prepared_request = self.prepare_request(
+            context,
+            next_page_token=next_page_token,
+        )
+        url: str = t.cast(str, prepared_request.url)
+        per_page: str = dict(parse_qsl(urlparse(url).query))["per_page"]
+        return prepared_request, int(per_page)
+
+    def _request_pages(
+        self,
+        context: dict | None,
+        paginator: CensusPaginator,
+        cached_pages: list[dict[str, str]] | None,
+        bookmark: datetime | None,
+    ) -> t.Generator[_Page, None, None]:
+        """Request the pages of a partition, in order.
+
+        The caller advances the paginator once the records of a page were
+        read. With `prefetch_pages` set, the pages after the first one are
+        requested by a background thread instead, which follows the `next`
+        links on its own and stays up to `prefetch_pages` pages ahead.
+
+        Args:
+            context: Stream partition or context dictionary.
+            paginator: The paginator of the partition.
+            cached_pages: Pages saved by the previous sync, if conditional
+                requests are used.
+            bookmark: Timestamp of the oldest record to request, if any.
+
+        Yields:
+            The request, requested page size, response and cached page of each
+            page.
+        """
+        key = context_key(context)
+        decorated_request = self.request_decorator(self._request)
+
+        while not paginator.finished:
+            prepared_request, requested = self._prepare_page(
+                context,
+                paginator.current_value,
+            )
+            cached_page = self._get_cached_page(
+                cached_pages,
+                len(self._page_validators.get(key, [])),
+                prepared_request,
+            )
+            try:
+                resp = decorated_request(prepared_request, context)
+            except RejectedRequestError:
+                if paginator.current_value is None and self.page_sizer.reject(
+                    requested,
+                ):
+                    self.logger.info(
+                        "Page size %d rejected by the API, probing smaller sizes",
+                        requested,
+                    )
+                    continue
+                raise
+            self._decode_page(resp, context)
+            yield prepared_request, requested, resp, cached_page
+
+            if not paginator.finished and self._pipelines_pages(key):
+                yield from self._prefetch_pages(
+                    context,
+                    t.cast(ParseResult, paginator.current_value).geturl(),
+                    bookmark,
+                )
+                return
+
+    def _prefetch_pages(
+        self,
+        context: dict | None,
+        start_url: str,
+        bookmark: datetime | None,
+    ) -> t.Generator[_Page, None, None]:
+        """Request pages in a background thread, ahead of the caller.
+
+        The thread stops at the last page, at the first page that reaches the
+        bookmark, or once the caller closes the iterator.
+
+        Args:
+            context: Stream partition or context dictionary.
+            start_url: URL of the first page to request.
+            bookmark: Timestamp of the oldest record to request, if any.
+
+        Yields:
+            The request, requested page size, response and cached page of each
+            page.
+
+        Raises:
+            Exception: Any error raised while requesting a page.
+        """
+        pages = _PageQueue(self.prefetch_pages)
+        threading.Thread(
+            target=self._fetch_pages,
+            args=(context, start_url, bookmark, pages),
+            name=f"{self.name}-pages",
+            daemon=True,
+        ).start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield t.cast(_Page, item)
+        finally:
+            pages.close()
+
+    def _fetch_pages(
+        self,
+        context: dict | None,
+        start_url: str,
+        bookmark: datetime | None,
+        pages: _PageQueue,
+    ) -> None:
+        """Request pages and hand them over, until the last one or a stop.
+
+        Errors are handed over too, and the end of the pages is marked with
+        the `_END` sentinel.
+
+        Args:
+            context: Stream partition or context dictionary.
+            start_url: URL of the first page to request.
+            bookmark: Timestamp of the oldest record to request, if any.
+            pages: Queue to hand the pages over through.
+        """
+        paginator = self.get_new_paginator(start_url)
+        decorated_request = self.request_decorator(self._request)
+        try:
+            while not paginator.finished and not pages.closed:
+                prepared_request, requested = self._prepare_page(
+                    context,
+                    paginator.current_value,
+                )
+                resp = decorated_request(prepared_request, context)
+                self._decode_page(resp, context)
+                pages.put((prepared_request, requested, resp, None))
+                if self._reaches_bookmark(resp, bookmark):
+                    break
+                paginator.advance(resp)
+        except Exception as ex:  # noqa: BLE001
+            pages.put(ex)
+        finally:
+            pages.put(_END)
+
+    def _reaches_bookmark(
+        self,
+        response: requests.Response,
+        bookmark: datetime | None,
+    ) -> bool:
+        """Whether a page holds records older than the bookmark.
+
+        Args:
+            response: The response for the page, already decoded.
+            bookmark: Timestamp of the oldest record to request, if any.
+
+        Returns:
+            True if no further pages are needed.
+        """
+        if bookmark is None:
+            return False
+        records = decode_response(response).get("data") or []
+        updated = records[-1].get(self.replication_key) if records else None
+        if not updated:
+            return False
+        return parse_datetime(updated) < bookmark
+
+    def _start_paginator(
+        self,
+        context: dict | None,
+        partition_state: dict | None,
+    ) -> CensusPaginator:
+        start_url = (partition_state or {}).get("checkpoint", {}).get("next")
+        if start_url:
+            self.logger.info("Resuming partition %s at %s", context, start_url)
+        return self.get_new_paginator(start_url)
+
+    def _save_checkpoint(
+        self,
+        context: dict | None,
+        state: dict | None,
+        paginator: CensusPaginator,
+    ) -> None:
+        """Save the next page of a partition, once the previous ones were emitted.
+
+        The latest replication key value is saved along, since progress
+        markers are reset at the start of each sync. A STATE message is then
+        written, unless one was written less than `state_message_interval`
+        seconds ago, so an interrupted sync resumes at the latest page.
+
+        Partitions fetched in advance are checkpointed in a detached state
+        instead, since their records are not emitted yet. The next page URL is
+        handed over with the records, and saved once they are emitted.
+
+        Args:
+            context: Stream partition or context dictionary.
+            state: State of the partition, if it is checkpointed.
+            paginator: The paginator, advanced to the next page.
+        """
+        if state is None or paginator.finished:
+            return
+        next_url = t.cast(ParseResult, paginator.current_value).geturl()
+        if state is self._context_states.get(context_key(context)):
+            self._checkpoint(state, next_url)
+        else:
+            state["checkpoint"] = {"next": next_url}
+
+    def _checkpoint(self, state: dict, next_url: str) -> None:
+        """Save the next page of a partition, then write a throttled STATE message.
+
+        Args:
+            state: State of the partition.
+            next_url: URL of the next page.
+        """
+        checkpoint = {"next": next_url}
+        progress = state.get(PROGRESS_MARKERS, {}).get("replication_key_value")
+        if progress:
+            checkpoint["replication_key_value"] = progress
+        state["checkpoint"] = checkpoint
+        self._is_state_flushed = False
+        self._batches_covered = True
+        self._write_state_message()
+
+    def _decode_page(self, response: requests.Response, context: dict | None) -> None:
+        """Count a page and decode its body, unless it is streamed.
+
+        Args:
+            response: The response for the page.
+            context: Stream partition or context dictionary.
+        """
+        telemetry = self.census_tap.telemetry
+        telemetry.increment(self.name, context, Counter.PAGES)
+        if (
+            not self.stream_responses
+            and response.status_code != HTTPStatus.NOT_MODIFIED
+        ):
+            with telemetry.timed(self.name, context, Phase.DECODE):
+                decode_response(response)
+
+    @staticmethod
+    def _get_cached_page(
+        cached_pages: list[dict[str, str]] | None,
+        index: int,
+        prepared_request: requests.PreparedRequest,
+    ) -> dict[str, str] | None:
+        """Add conditional headers to a request for a page seen before.
+
+        Args:
+            cached_pages: Pages saved by the previous sync.
+            index: Index of the requested page.
+            prepared_request: The request for the page.
+
+        Returns:
+            The cached page, if its URL has not changed.
+        """
+        if not cached_pages or index >= len(cached_pages):
+            return None
+
+        cached_page = cached_pages[index]
+        if cached_page.get("url") != prepared_request.url:
+            return None
+
+        prepared_request.headers.update(get_conditional_headers(cached_page))
+        return cached_page
+
+    def _track_page(
+        self,
+        key: tuple,
+        response: requests.Response,
+        cached_page: dict[str, str] | None,
+        *,
+        tracks_changes: bool,
+    ) -> bool:
+        """Save the validators of a page and check whether it has changed.
+
+        Args:
+            key: Key of the partition context.
+            response: The response for the page.
+            cached_page: The page saved by the previous sync, if any.
+            tracks_changes: Whether to hash the body and save the next link.
+
+        Returns:
+            True if the page is unchanged since the previous sync.
+        """
+        pages = self._page_validators[key]
+        if cached_page is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            # There is no body to read the next link from
+            _decoded_bodies[response] = {"next": cached_page.get("next")}
+            pages.append(cached_page)
+            return True
+
+        page = get_validators(response)
+        page["url"] = t.cast(str, response.request.url)
+        if tracks_changes:
+            page["hash"] = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+            page["next"] = decode_response(response).get("next")
+        pages.append(page)
+        return cached_page is not None and cached_page.get("hash") == page.get("hash")
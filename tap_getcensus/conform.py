@@ -0,0 +1,191 @@
+"""Record conformance compiled from stream schemas."""
+
+from __future__ import annotations
+
+import typing as t
+
+from singer_sdk.helpers._typing import (
+    _conform_primitive_property,
+    is_boolean_type,
+    is_object_type,
+    is_uniform_list,
+)
+
+if t.TYPE_CHECKING:
+    from singer_sdk._singerlib import SelectionMask
+
+__all__ = ["RecordConformer"]
+
+# Values of these types are left as is by the SDK, unless the schema is boolean
+_JSON_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+_BOOLEAN_SCHEMA = {"type": "boolean"}
+
+# Converters take a value, the list to append unmapped property paths to and
+# the path of the value in the record
+_Converter = t.Callable[[t.Any, t.List[str], str], object]
+
+
+def _identity(value: object, *_: object) -> object:
+    return value
+
+
+def _to_boolean(value: object, *_: object) -> object:
+    if value is None:
+        return None
+    if type(value) in _JSON_SCALARS:
+        return value != 0
+    return _conform_primitive_property(value, _BOOLEAN_SCHEMA)
+
+
+class RecordConformer:
+    """Select and conform the properties of records in a single pass.
+
+    The schema and selection mask of a stream are walked once, to build a tree
+    of converters for each property. Records then go through the converters
+    directly, with the same results as the SDK's property selection followed by
+    its recursive type conformance: deselected and unknown properties are
+    dropped, booleans are coerced and non-JSON values are serialized.
+
+    With `coerce_types` off, only property selection is done and values are
+    kept as decoded from the API.
+    """
+
+    def __init__(
+        self,
+        schema: dict,
+        mask: SelectionMask,
+        *,
+        coerce_types: bool = True,
+    ) -> None:
+        """Compile the converters.
+
+        Args:
+            schema: JSON schema of the stream.
+            mask: Selection mask of the stream's properties.
+            coerce_types: Whether to conform the type of each value.
+        """
+        self.coerce_types = coerce_types
+        self._mask = mask
+        self._convert = self._compile_object(schema, ())
+
+    def conform(self, record: dict) -> tuple[dict, list[str]]:
+        """Conform a record.
+
+        The record itself is left unchanged.
+
+        Args:
+            record: A record from the API.
+
+        Returns:
+            The conformed record, and the paths of properties that are not in
+            the schema.
+        """
+        unmapped: list[str] = []
+        return t.cast(dict, self._convert(record, unmapped, "")), unmapped
+
+    def _compile_properties(
+        self,
+        schema: dict,
+        breadcrumb: tuple[str, ...] | None,
+    ) -> dict[str, _Converter | None]:
+        converters: dict[str, _Converter | None] = {}
+        for name, property_schema in schema.get("properties", {}).items():
+            if breadcrumb is None:
+                converters[name] = self._compile_property(property_schema, None)
+                continue
+            property_breadcrumb = (*breadcrumb, "properties", name)
+            converters[name] = (
+                self._compile_property(property_schema, property_breadcrumb)
+                if self._mask[property_breadcrumb]
+                else None
+            )
+        return converters
+
+    def _compile_object(
+        self,
+        schema: dict,
+        breadcrumb: tuple[str, ...] | None,
+    ) -> _Converter:
+        """Compile an object schema.
+
+        Args:
+            schema: The object's schema.
+            breadcrumb: Breadcrumb of the object in the selection mask, or None
+                for objects in arrays, to which the mask does not apply.
+
+        Returns:
+            A converter of objects.
+        """
+        converters = self._compile_properties(schema, breadcrumb)
+
+        def convert_object(value: dict, unmapped: list[str], path: str) -> dict:
+            output = {}
+            for name, item in value.items():
+                try:
+                    converter = converters[name]
+                except KeyError:
+                    unmapped.append(f"{path}.{name}" if path else name)
+                    continue
+                if converter is not None:
+                    output[name] = converter(
+                        item,
+                        unmapped,
+                        f"{path}.{name}" if path else name,
+                    )
+            return output
+
+        return convert_object
+
+    def _compile_property(
+        self,
+        schema: dict,
+        breadcrumb: tuple[str, ...] | None,
+    ) -> _Converter:
+        primitive = self._compile_primitive(schema)
+
+        if is_uniform_list(schema):
+            item_schema = schema["items"]
+            convert_item = self._compile_primitive(item_schema)
+            convert_dict = (
+                self._compile_object(item_schema, None)
+                if is_object_type(item_schema)
+                else convert_item
+            )
+
+            def convert_array(value: object, unmapped: list[str], path: str) -> object:
+                if not isinstance(value, list):
+                    return primitive(value, unmapped, path)
+                return [
+                    convert_dict(item, unmapped, path)
+                    if isinstance(item, dict)
+                    else convert_item(item, unmapped, path)
+                    for item in value
+                ]
+
+            return convert_array
+
+        if is_object_type(schema) and "properties" in schema:
+            convert_object = self._compile_object(schema, breadcrumb)
+
+            def convert_nested(value: object, unmapped: list[str], path: str) -> object:
+                if isinstance(value, dict):
+                    return convert_object(value, unmapped, path)
+                return primitive(value, unmapped, path)
+
+            return convert_nested
+
+        return primitive
+
+    def _compile_primitive(self, schema: dict) -> _Converter:
+        if not self.coerce_types:
+            return _identity
+        if is_boolean_type(schema):
+            return _to_boolean
+
+        def convert_primitive(value: object, *_: object) -> object:
+            if type(value) in _JSON_SCALARS:
+                return value
+            return _conform_primitive_property(value, schema)
+
+        return convert_primitive
@@ -0,0 +1,152 @@
+"""Filtering of records listed twice while a partition is crawled.
+
+Pages are requested by offset, so a record can be listed again on the next
+page when records are created or deleted during the crawl. The primary keys
+seen in a partition are kept as 64-bit integers, in a hash table that takes 16
+to 32 bytes per key once the partition is large.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import typing as t
+from array import array
+
+__all__ = ["DuplicateFilter", "KeySet"]
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# Fibonacci hashing multiplier, to spread sequential IDs over the table
+_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+class KeySet:
+    """A set of 64-bit integers that stays compact as it grows.
+
+    Small sets are Python sets, which are the fastest. Past `compact_size`
+    keys, they are moved to an open addressing hash table stored in an array
+    of 64-bit integers, kept at most half full, instead of taking about 70
+    bytes per key.
+    """
+
+    def __init__(self, compact_size: int = 1 << 16) -> None:
+        """Initialize the set.
+
+        Args:
+            compact_size: Number of keys from which the set is compacted.
+        """
+        self.compact_size = compact_size
+        self._keys: set[int] | None = set()
+        self._slots = array("q")
+        self._mask = -1
+        self._size = 0
+        # 0 marks empty slots, so it is tracked on its own
+        self._has_zero = False
+
+    def __len__(self) -> int:
+        """Get the number of keys.
+
+        Returns:
+            The number of keys in the set.
+        """
+        if self._keys is not None:
+            return len(self._keys)
+        return self._size + self._has_zero
+
+    def add(self, key: int) -> bool:
+        """Add a key to the set.
+
+        Args:
+            key: A 64-bit integer.
+
+        Returns:
+            True if the key was not in the set.
+        """
+        keys = self._keys
+        if keys is not None:
+            if key in keys:
+                return False
+            keys.add(key)
+            if len(keys) > self.compact_size:
+                self._compact(keys)
+            return True
+
+        if key == 0:
+            added = not self._has_zero
+            self._has_zero = True
+            return added
+
+        slots = self._slots
+        mask = self._mask
+        index = ((key * _MULTIPLIER) >> 32) & mask
+        while True:
+            slot = slots[index]
+            if slot == key:
+                return False
+            if slot == 0:
+                break
+            index = (index + 1) & mask
+        slots[index] = key
+        self._size += 1
+        if self._size * 2 > mask:
+            self._resize(len(slots) * 2)
+        return True
+
+    def _compact(self, keys: set[int]) -> None:
+        self._keys = None
+        self._resize(1 << (len(keys) * 2).bit_length())
+        for key in keys:
+            self.add(key)
+
+    def _resize(self, capacity: int) -> None:
+        old_slots = self._slots
+        self._slots = array("q", bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._size = 0
+        for key in old_slots:
+            if key:
+                self.add(key)
+
+
+class DuplicateFilter:
+    """Tell whether a record with the same primary key was seen before.
+
+    Integer primary keys are kept as they are. Other keys are kept as a 64-bit
+    hash, which is unlikely to collide among the records of a partition.
+    """
+
+    def __init__(self, key_properties: t.Sequence[str]) -> None:
+        """Initialize the filter.
+
+        Args:
+            key_properties: Primary keys of the records.
+        """
+        self.key_properties = list(key_properties)
+        self._keys = KeySet()
+
+    def _key(self, record: dict) -> int:
+        values = [record.get(name) for name in self.key_properties]
+        if len(values) == 1:
+            value = values[0]
+            if (
+                isinstance(value, int)
+                and not isinstance(value, bool)
+                and _INT64_MIN <= value <= _INT64_MAX
+            ):
+                return value
+        content = json.dumps(values, separators=(",", ":"), default=str).encode()
+        digest = hashlib.blake2b(content, digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True)
+
+    def seen(self, record: dict) -> bool:
+        """Check whether a record was seen before, and remember it if not.
+
+        Args:
+            record: The record.
+
+        Returns:
+            True if a record with the same primary key was seen before.
+        """
+        return not self._keys.add(self._key(record))
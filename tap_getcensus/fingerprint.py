@@ -0,0 +1,97 @@
+"""Fingerprints of record contents, to emit only the records that changed.
+
+The fingerprint index of a partition maps the primary key of each record seen
+by the previous sync to a short hash of its content. It is kept in the state
+of the partition, so it is only committed along with the records it covers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import typing as t
+
+__all__ = ["DELETED_AT", "FINGERPRINTS", "FingerprintIndex", "fingerprint"]
+
+#: Key of the fingerprint index in the state of a partition.
+FINGERPRINTS = "fingerprints"
+
+#: Property set on the tombstones of deleted records, as Singer targets expect.
+DELETED_AT = "_sdc_deleted_at"
+
+# 64 bits keep collisions unlikely for the few thousand records of a partition
+_DIGEST_SIZE = 8
+
+
+def fingerprint(record: dict) -> str:
+    """Hash the content of a record.
+
+    Args:
+        record: The record.
+
+    Returns:
+        A hash of the record, independent of the order of its properties.
+    """
+    content = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(content.encode(), digest_size=_DIGEST_SIZE).hexdigest()
+
+
+class FingerprintIndex:
+    """Track which records of a partition are new, changed or deleted.
+
+    Records are keyed by the JSON list of their primary key values, so that
+    tombstones can be built from the keys alone.
+    """
+
+    def __init__(
+        self,
+        fingerprints: dict[str, str],
+        key_properties: t.Sequence[str],
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            fingerprints: The index saved by the previous sync, updated in
+                place as records are seen.
+            key_properties: Primary keys of the records.
+        """
+        self.fingerprints = fingerprints
+        self.key_properties = list(key_properties)
+        self._seen: set[str] = set()
+
+    def _key(self, record: dict) -> str:
+        return json.dumps(
+            [record.get(name) for name in self.key_properties],
+            separators=(",", ":"),
+            default=str,
+        )
+
+    def update(self, record: dict) -> bool:
+        """Save the fingerprint of a record.
+
+        Args:
+            record: The record.
+
+        Returns:
+            True if the record is new or changed since the previous sync.
+        """
+        key = self._key(record)
+        self._seen.add(key)
+        value = fingerprint(record)
+        if self.fingerprints.get(key) == value:
+            return False
+        self.fingerprints[key] = value
+        return True
+
+    def pop_deleted(self) -> list[dict]:
+        """Drop the records that were not seen since the index was created.
+
+        Only call this once every record of the partition was seen.
+
+        Returns:
+            The primary key values of each dropped record.
+        """
+        deleted = [key for key in self.fingerprints if key not in self._seen]
+        for key in deleted:
+            del self.fingerprints[key]
+        return [dict(zip(self.key_properties, json.loads(key))) for key in deleted]
@@ -0,0 +1,145 @@
+"""Incremental parsing of Census API list responses."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import typing as t
+
+__all__ = ["StreamingBody"]
+
+_WHITESPACE = " \t\n\r"
+
+# Drop consumed text from the buffer once it grows past this many characters
+_COMPACT_THRESHOLD = 1 << 16
+
+
+class StreamingBody:
+    """Parse a JSON object body chunk by chunk, yielding one array's items.
+
+    Items of the array under `array_key` are yielded as soon as they are fully
+    read, so the page is never held in memory as a whole. Every other top-level
+    key is decoded normally and is available in `fields` once iteration ends.
+    """
+
+    def __init__(
+        self,
+        chunks: t.Iterable[bytes],
+        array_key: str = "data",
+    ) -> None:
+        """Initialize the parser.
+
+        Args:
+            chunks: Raw body chunks, e.g. from `requests.Response.iter_content`.
+            array_key: Top-level key of the array to stream.
+        """
+        self.array_key = array_key
+        self.fields: dict[str, t.Any] = {}
+
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+
+    def __iter__(self) -> t.Iterator[dict]:
+        """Iterate over the items of the streamed array.
+
+        Yields:
+            One item of the array at a time.
+
+        Raises:
+            ValueError: If the body is not a JSON object.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == self.array_key and self._peek() == "[":
+                yield from self._array()
+            else:
+                self.fields[key] = self._value()
+
+            separator = self._next()
+            if separator == "}":
+                return
+            if separator != ",":
+                msg = f"Expected ',' or '}}' in response body, got {separator!r}"
+                raise ValueError(msg)
+
+    def _array(self) -> t.Iterator[dict]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._value()
+            separator = self._next()
+            if separator == "]":
+                return
+            if separator != ",":
+                msg = f"Expected ',' or ']' in response body, got {separator!r}"
+                raise ValueError(msg)
+
+    def _fill(self) -> bool:
+        if self._exhausted:
+            return False
+
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+
+        for chunk in self._chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._exhausted = True
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in _WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                msg = "Unexpected end of response body"
+                raise ValueError(msg)
+
+    def _next(self) -> str:
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, char: str) -> None:
+        found = self._next()
+        if found != char:
+            msg = f"Expected {char!r} in response body, got {found!r}"
+            raise ValueError(msg)
+
+    def _value(self) -> t.Any:  # noqa: ANN401
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._exhausted:
+                self._fill()
+                continue
+
+            self._pos = end
+            return value
@@ -0,0 +1,175 @@
+"""Buffered writing of Singer messages."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import typing as t
+from decimal import Decimal
+
+import simplejson
+import singer_sdk._singerlib as singer
+
+if t.TYPE_CHECKING:
+    import orjson
+else:
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        orjson = None
+
+__all__ = ["MessageWriter", "format_message", "to_json_line"]
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_APPEND_NEWLINE | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+)
+
+
+def _orjson_default(value: object) -> str:
+    if isinstance(value, Decimal):
+        # Decimals are written as numbers by the SDK, which orjson cannot do
+        raise TypeError
+    return str(value)
+
+
+def to_json_line(value: object) -> str:
+    """Serialize a value as a line of JSON, like the SDK does.
+
+    Values are serialized with orjson if it is installed, falling back to
+    simplejson for those it does not support, such as decimals. Datetimes and
+    other non-JSON values are written as `str` does, like the SDK.
+
+    Args:
+        value: The value to serialize.
+
+    Returns:
+        The JSON line, ending with a newline.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                value,
+                default=_orjson_default,
+                option=_ORJSON_OPTIONS,
+            ).decode()
+        except TypeError:
+            pass
+    return simplejson.dumps(value, use_decimal=True, default=str) + "\n"
+
+
+def format_message(message: singer.Message) -> str:
+    """Format a message as a line of JSON.
+
+    Args:
+        message: The message to format.
+
+    Returns:
+        The JSON line, ending with a newline.
+    """
+    return to_json_line(message.to_dict())
+
+
+class MessageWriter:
+    """Write Singer messages to stdout.
+
+    With a `buffer_size`, formatted messages are buffered and written in a
+    single call once the buffer holds that many characters, or once
+    `flush_interval` seconds passed since the last write. A background thread
+    writes the buffer when no message comes for that long, e.g. while waiting
+    for a response. Messages are always written in order, and the buffer is
+    flushed after every STATE message, so targets never see a state before the
+    records it covers, nor wait for a state that was already emitted.
+
+    Without a buffer size, each message is written and flushed right away, as
+    the SDK does.
+    """
+
+    def __init__(self, *, buffer_size: int = 0, flush_interval: float = 1.0) -> None:
+        """Initialize the writer.
+
+        Args:
+            buffer_size: Characters to buffer before writing, or 0 to write each
+                message as it comes.
+            flush_interval: Maximum seconds between writes of buffered messages.
+        """
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._lines: list[str] = []
+        self._buffered = 0
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def write(self, message: singer.Message) -> None:
+        """Write a message, or buffer it.
+
+        Args:
+            message: The message to write.
+        """
+        if self.buffer_size <= 0:
+            singer.write_message(message)
+            return
+
+        line = format_message(message)
+        with self._lock:
+            if self._flusher is None:
+                self._start_flusher()
+            self._lines.append(line)
+            self._buffered += len(line)
+            if (
+                self._buffered >= self.buffer_size
+                or isinstance(message, singer.StateMessage)
+                or time.monotonic() - self._flushed_at >= self.flush_interval
+            ):
+                self._flush()
+
+    def write_all(self, messages: t.Iterable[singer.Message]) -> None:
+        """Write several messages, in order.
+
+        Args:
+            messages: The messages to write.
+        """
+        for message in messages:
+            self.write(message)
+
+    def flush(self) -> None:
+        """Write the buffered messages."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Write the buffered messages, and stop the background thread."""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _flush(self) -> None:
+        self._flushed_at = time.monotonic()
+        if not self._lines:
+            return
+        sys.stdout.write("".join(self._lines))
+        sys.stdout.flush()
+        self._lines.clear()
+        self._buffered = 0
+
+    def _start_flusher(self) -> None:
+        self._closed.clear()
+        self._flusher = threading.Thread(
+            target=self._flush_when_idle,
+            name="message-writer",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_when_idle(self) -> None:
+        delay = self.flush_interval
+        while not self._closed.wait(delay):
+            with self._lock:
+                delay = self._flushed_at + self.flush_interval - time.monotonic()
+                if delay <= 0:
+                    self._flush()
+                    delay = self.flush_interval
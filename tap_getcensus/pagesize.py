@@ -0,0 +1,107 @@
+"""Adaptive page sizing for Census list endpoints."""
+
+from __future__ import annotations
+
+import math
+import threading
+
+__all__ = ["PageSizer"]
+
+MIN_PAGE_SIZE = 25
+
+
+class PageSizer:
+    """Choose the `per_page` value for new partitions of a stream.
+
+    In adaptive mode, the first request probes the API with the largest
+    allowed size. If the API returns fewer records than requested while more
+    pages remain, the smaller count is taken as the server-side maximum, and a
+    rejected request halves the probe. After that, the size follows the
+    observed latency of full pages so it stays under the target latency.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        adaptive: bool = False,
+        max_size: int = 1000,
+        target_latency: float = 2.0,
+    ) -> None:
+        """Initialize the page sizer.
+
+        Args:
+            size: The configured page size, used as is unless adaptive.
+            adaptive: Whether to tune the page size from observed latencies.
+            max_size: Largest page size to probe the API with.
+            target_latency: Target latency of a single page, in seconds.
+        """
+        self.adaptive = adaptive
+        self.max_size = max(max_size, size) if adaptive else size
+        self.target_latency = target_latency
+        self.probing = adaptive
+
+        self._size = self.max_size if adaptive else size
+        self._min_size = min(size, MIN_PAGE_SIZE)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Get the page size to use for the next partition.
+
+        Returns:
+            The number of records to request per page.
+        """
+        with self._lock:
+            return self._size
+
+    def reject(self, requested: int) -> bool:
+        """Record that the API rejected a page size while probing.
+
+        Args:
+            requested: The rejected page size.
+
+        Returns:
+            True if a smaller size should be tried, False if the error is not
+            caused by the page size.
+        """
+        with self._lock:
+            if not self.probing or requested <= self._min_size:
+                return False
+            self.max_size = self._size = max(requested // 2, self._min_size)
+            return True
+
+    def observe(
+        self,
+        *,
+        requested: int,
+        received: int,
+        latency: float,
+        has_more: bool,
+    ) -> None:
+        """Update the page size from a completed page request.
+
+        Args:
+            requested: The page size that was requested.
+            received: Number of records in the page.
+            latency: Time to first byte of the response, in seconds.
+            has_more: Whether the API linked to a next page.
+        """
+        if not self.adaptive:
+            return
+
+        with self._lock:
+            self.probing = False
+
+            if received < requested:
+                if has_more and received:
+                    # The server clamped the page to its own maximum
+                    self.max_size = min(self.max_size, received)
+                    self._size = min(self._size, self.max_size)
+                return
+
+            # Latency grows roughly linearly with the page size, so scale
+            # towards the target and damp the step with a geometric mean.
+            ideal = requested * self.target_latency / max(latency, 1e-3)
+            size = math.sqrt(self._size * ideal)
+            self._size = int(min(max(size, self._min_size), self.max_size))
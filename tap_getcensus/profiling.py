@@ -0,0 +1,146 @@
+"""Per-stream profiling of tap runs."""
+
+from __future__ import annotations
+
+import cProfile
+import sys
+import threading
+import time
+import typing as t
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+if t.TYPE_CHECKING:
+    import os
+    from types import FrameType
+
+__all__ = ["StreamProfiler"]
+
+PROFILE_FORMATS = ("pstats", "collapsed")
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StreamProfiler:
+    """Profile the work done by each stream on the thread that syncs it.
+
+    Time is charged to the innermost stream being synced, so the records of a
+    parent stream and the partitions of its children end up in separate
+    profiles. Child partitions fetched in the background are not profiled.
+
+    In "pstats" mode, each stream gets a deterministic `cProfile` profile. In
+    "collapsed" mode, the stack of the syncing thread is sampled at a fixed
+    interval and written in the collapsed format read by flame graph tools.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        profile_format: str = "pstats",
+        interval: float = 0.005,
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            directory: Directory to write the profile of each stream to.
+            profile_format: Either "pstats" or "collapsed".
+            interval: Seconds between stack samples, in "collapsed" mode.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if profile_format not in PROFILE_FORMATS:
+            msg = f"Unsupported profile format: {profile_format!r}"
+            raise ValueError(msg)
+
+        self.directory = Path(directory)
+        self.profile_format = profile_format
+        self.interval = interval
+
+        self._active: list[str] = []
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._samples: dict[str, Counter[str]] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._thread_id: int | None = None
+        self._sampler: threading.Thread | None = None
+
+    @contextmanager
+    def profile(self, stream_name: str) -> t.Iterator[None]:
+        """Charge the work done in a block to a stream.
+
+        Blocks can be nested, e.g. when a parent stream syncs its children.
+        When the outermost block exits, the profiles are written to disk.
+
+        Args:
+            stream_name: Name of the stream being synced.
+
+        Yields:
+            Nothing.
+        """
+        self._switch(self._active[-1] if self._active else None, stream_name)
+        self._active.append(stream_name)
+        try:
+            yield
+        finally:
+            self._active.pop()
+            self._switch(stream_name, self._active[-1] if self._active else None)
+            if not self._active:
+                self.write()
+
+    def _switch(self, previous: str | None, current: str | None) -> None:
+        if self.profile_format == "collapsed":
+            self._start_sampler()
+            return
+
+        if previous is not None:
+            self._profiles[previous].disable()
+        if current is not None:
+            self._profiles.setdefault(current, cProfile.Profile()).enable()
+
+    def _start_sampler(self) -> None:
+        if self._sampler is not None:
+            return
+        self._thread_id = threading.get_ident()
+        self._sampler = threading.Thread(
+            target=self._sample,
+            name="census-profiler",
+            daemon=True,
+        )
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                stream_name = self._active[-1]
+            except IndexError:
+                continue
+            frames = sys._current_frames()  # noqa: SLF001
+            frame = frames.get(t.cast(int, self._thread_id))
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            with self._lock:
+                self._samples[stream_name][";".join(reversed(stack))] += 1
+
+    def write(self) -> None:
+        """Write the profile of every stream profiled so far."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.profile_format == "pstats":
+            for stream_name, profile in self._profiles.items():
+                profile.dump_stats(self.directory / f"{stream_name}.pstats")
+            return
+
+        with self._lock:
+            samples = {name: dict(stacks) for name, stacks in self._samples.items()}
+        for stream_name, stacks in samples.items():
+            path = self.directory / f"{stream_name}.collapsed"
+            path.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in stacks.items()),
+            )
@@ -0,0 +1,179 @@
+"""Client-side rate limiting shared by the Census streams of a workspace."""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+if t.TYPE_CHECKING:
+    import requests
+
+__all__ = ["RateLimiter", "get_retry_after"]
+
+#: Fraction of the server's advertised budget the limiter paces requests to.
+HEADROOM = 0.9
+
+# Reset headers larger than this are epoch timestamps rather than durations
+_EPOCH_THRESHOLD = 10**9
+
+# Tolerance for floating point error when counting refilled tokens
+_EPSILON = 1e-9
+
+
+def _first_header(response: requests.Response, *names: str) -> str | None:
+    for name in names:
+        value = response.headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def _seconds_until(value: str, now: float) -> float | None:
+    """Parse a duration, epoch timestamp or HTTP date into seconds from now."""
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            return parsedate_to_datetime(value).timestamp() - now
+        except (TypeError, ValueError):
+            return None
+
+    return seconds - now if seconds > _EPOCH_THRESHOLD else seconds
+
+
+def get_retry_after(response: requests.Response | None) -> float | None:
+    """Get how long the server asked clients to wait before retrying.
+
+    Args:
+        response: A response from the API.
+
+    Returns:
+        The `Retry-After` delay in seconds for 429 and 503 responses, if any.
+    """
+    if response is None or response.status_code not in (
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+    ):
+        return None
+
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    seconds = _seconds_until(value, time.time())
+    return None if seconds is None else max(seconds, 0.0)
+
+
+class RateLimiter:
+    """A thread-safe token bucket paced by the API's rate limit headers.
+
+    Tokens refill at the configured rate, which is lowered to stay just under
+    the budget the server advertises in `X-RateLimit-Remaining` and
+    `X-RateLimit-Reset` (or the `RateLimit-*` equivalents). A `Retry-After`
+    or an exhausted budget pauses every caller until the server is ready.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        *,
+        clock: t.Callable[[], float] = time.monotonic,
+        sleep: t.Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            rate: Maximum requests per second, or None for no client-side limit
+                until the server advertises one.
+            clock: Monotonic clock, in seconds.
+            sleep: Function used to wait, in seconds.
+        """
+        self.max_rate = rate
+        self.rate = rate
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    @property
+    def capacity(self) -> float:
+        """Get the maximum burst of requests.
+
+        Returns:
+            One second worth of requests, and at least one.
+        """
+        return max(self.rate or 1.0, 1.0)
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            elapsed = max(now - self._updated, 0.0)
+            self._tokens = min(self._tokens + elapsed * self.rate, self.capacity)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self.rate is None:
+                        return
+                    self._refill(now)
+                    if self._tokens >= 1 - _EPSILON:
+                        self._tokens = max(self._tokens - 1, 0.0)
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for a while.
+
+        Args:
+            seconds: How long to wait before the next request.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def update(self, response: requests.Response) -> None:
+        """Adjust the pace from a response's rate limit headers.
+
+        Args:
+            response: A response from the API.
+        """
+        retry_after = get_retry_after(response)
+        if retry_after is not None:
+            self.pause(retry_after)
+
+        remaining = _first_header(
+            response,
+            "X-RateLimit-Remaining",
+            "RateLimit-Remaining",
+        )
+        reset = _first_header(response, "X-RateLimit-Reset", "RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        reset_seconds = _seconds_until(reset, time.time())
+        try:
+            remaining_requests = float(remaining)
+        except ValueError:
+            return
+        if reset_seconds is None or reset_seconds <= 0:
+            return
+
+        if remaining_requests < 1:
+            self.pause(reset_seconds)
+            return
+
+        rate = remaining_requests * HEADROOM / reset_seconds
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = rate if self.max_rate is None else min(rate, self.max_rate)
+            self._tokens = min(self._tokens, self.capacity)
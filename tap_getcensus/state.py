@@ -0,0 +1,154 @@
+"""Compact state for streams with many partitions.
+
+Once every partition of a child stream was synced in full, their bookmarks
+are folded into a single watermark: the time the sync started, less a safety
+margin. Census assigns IDs in increasing order, so the watermark also records
+the largest partition context it covers, and partitions created later still
+start from `start_date`. Partitions that were not synced from their first page
+in that sync are kept as exceptions, with their own bookmark.
+
+When several workspaces are synced, each has its own watermark, scoped to the
+partitions of that workspace.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from singer_sdk.helpers._state import PROGRESS_MARKERS, STARTING_MARKER
+
+__all__ = ["WATERMARK", "WATERMARKS", "compact_partitions", "get_watermark"]
+
+#: Key of the watermark in the state of a stream.
+WATERMARK = "watermark"
+
+#: Key of the watermarks scoped to a subset of the partitions, e.g. a workspace.
+WATERMARKS = "watermarks"
+
+# Keys of partition states that can be derived from the watermark
+_FOLDABLE_KEYS = frozenset(
+    (
+        "context",
+        "checkpoint",
+        "replication_key",
+        "replication_key_value",
+        PROGRESS_MARKERS,
+        STARTING_MARKER,
+    ),
+)
+
+
+def _sort_key(context: dict) -> tuple:
+    return tuple(sorted(context.items()))
+
+
+def _in_scope(context: dict, scope: dict | None) -> bool:
+    return all(context.get(key) == value for key, value in (scope or {}).items())
+
+
+def _find_watermark(stream_state: dict, context: dict) -> dict | None:
+    for watermark in stream_state.get(WATERMARKS, []):
+        if _in_scope(context, watermark.get("scope")):
+            return watermark
+    return stream_state.get(WATERMARK)
+
+
+def get_watermark(
+    stream_state: dict,
+    context: dict | None,
+    replication_key: str | None,
+) -> str | None:
+    """Get the watermark covering a partition.
+
+    Args:
+        stream_state: State of the stream.
+        context: Stream partition or context dictionary.
+        replication_key: Replication key of the stream.
+
+    Returns:
+        The replication key value of the watermark, or None if there is none
+        or it does not cover the partition.
+    """
+    watermark = _find_watermark(stream_state, context or {})
+    if (
+        not context
+        or not watermark
+        or watermark.get("replication_key") != replication_key
+    ):
+        return None
+
+    max_context = watermark.get("max_context", {})
+    if max_context.keys() != context.keys():
+        return None
+    try:
+        if _sort_key(context) > _sort_key(max_context):
+            return None
+    except TypeError:
+        return None
+    return watermark.get("replication_key_value")
+
+
+def compact_partitions(
+    stream_state: dict,
+    synced: t.Iterable[dict],
+    *,
+    replication_key: str | None,
+    watermark: str | None,
+    scope: dict | None = None,
+) -> None:
+    """Fold the state of fully synced partitions into the stream watermark.
+
+    Partitions in `synced` are dropped from the state, unless they hold more
+    than bookmarks, e.g. page validators. Other partitions covered by the
+    previous watermark get its value as their own bookmark, since the new
+    watermark does not apply to them.
+
+    With a `scope`, only the partitions whose context includes it are
+    compacted, into a watermark of their own.
+
+    Args:
+        stream_state: State of the stream, updated in place.
+        synced: Contexts of the partitions synced from their first page.
+        replication_key: Replication key of the stream, if incremental.
+        watermark: New replication key value of the watermark, if incremental.
+        scope: Context items of the partitions to compact, if not all of them.
+    """
+    synced_keys = {_sort_key(context): context for context in synced}
+    kept = []
+    for partition in stream_state.get("partitions", []):
+        context = partition.get("context", {})
+        if not _in_scope(context, scope):
+            kept.append(partition)
+            continue
+        if _sort_key(context) in synced_keys and partition.keys() <= _FOLDABLE_KEYS:
+            continue
+
+        previous = get_watermark(stream_state, context, replication_key)
+        if previous and partition.get("replication_key") != replication_key:
+            partition["replication_key"] = replication_key
+            partition["replication_key_value"] = previous
+        kept.append(partition)
+
+    if kept:
+        stream_state["partitions"] = kept
+    else:
+        stream_state.pop("partitions", None)
+
+    if not replication_key or not watermark or not synced_keys:
+        return
+    new_watermark = {
+        "replication_key": replication_key,
+        "replication_key_value": watermark,
+        "max_context": synced_keys[max(synced_keys)],
+    }
+    if not scope:
+        stream_state[WATERMARK] = new_watermark
+        return
+    stream_state[WATERMARKS] = [
+        *(
+            previous
+            for previous in stream_state.get(WATERMARKS, [])
+            if previous.get("scope") != scope
+        ),
+        {"scope": scope, **new_watermark},
+    ]
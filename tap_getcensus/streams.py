@@ -2,9 +2,22 @@
 
 from __future__ import annotations
 
+import typing as t
+from collections import OrderedDict
+from datetime import datetime, timezone
+
 from singer_sdk import typing as th
 
-from tap_getcensus.client import CensusStream
+from tap_getcensus.client import (
+    CensusStream,
+    LazySchema,
+    context_key,
+    parse_datetime,
+    workspace_context,
+)
+
+if t.TYPE_CHECKING:
+    from singer_sdk import Tap
 
 __all__ = [
     "Syncs",
@@ -15,6 +28,9 @@ __all__ = [
     "SourceObjects",
 ]
 
+# Number of runs whose last emitted version is remembered in watch mode
+_MAX_TRACKED_RUNS = 10_000
+
 
 class Syncs(CensusStream):
     """Syncs stream."""
@@ -23,213 +39,220 @@ class Syncs(CensusStream):
     path = "/api/v1/syncs"
     primary_keys = ("id",)
     replication_key = None
-
-    schema = th.PropertiesList(
-        th.Property(
-            "id",
-            th.IntegerType,
-            description="The sync's system ID",
-        ),
-        th.Property(
-            "label",
-            th.StringType,
-            description="The sync's label",
-        ),
-        th.Property(
-            "schedule_frequency",
-            th.StringType,
-            description="The sync's schedule frequency",
-        ),
-        th.Property(
-            "schedule_day",
-            th.IntegerType,
-            description="The sync's schedule day",
-        ),
-        th.Property(
-            "schedule_hour",
-            th.IntegerType,
-            description="The sync's schedule hour",
-        ),
-        th.Property(
-            "schedule_minute",
-            th.IntegerType,
-            description="The sync's schedule minute",
-        ),
-        th.Property(
-            "created_at",
-            th.DateTimeType,
-            description="The sync's creation date",
-        ),
-        th.Property(
-            "updated_at",
-            th.DateTimeType,
-            description="The sync's last updated date",
-        ),
-        th.Property(
-            "operation",
-            th.StringType,
-            description="The sync's operation type",
-        ),
-        th.Property(
-            "paused",
-            th.BooleanType,
-            description="Whether the sync is paused",
-        ),
-        th.Property(
-            "status",
-            th.StringType,
-            description="The sync's status",
-        ),
-        th.Property(
-            "lead_union_insert_to",
-            th.StringType,
-            description="The sync's lead union insert to",
-        ),
-        th.Property(
-            "trigger_on_dbt_cloud_rebuild",
-            th.BooleanType,
-            description="Whether the sync is triggered on dbt Cloud rebuild",
-        ),
-        th.Property(
-            "field_behavior",
-            th.StringType,
-            description="The sync's field behavior type",
-        ),
-        th.Property(
-            "field_normalization",
-            th.StringType,
-            description="The sync's field normalization type",
-        ),
-        th.Property(
-            "mirror_strategy",
-            th.StringType,
-            description="The sync's mirror strategy type",
-        ),
-        # TODO(edgarrmondragon): Add advanced_configuration when Census documentation
-        # is updated
-        # https://github.com/edgarrmondragon/tap-getcensus/issues/155
-        # th.Property(
-        #     "advanced_configuration",
-        #     th.ObjectType(),  # noqa: ERA001
-        #     description="The sync's advanced configuration",  # noqa: ERA001
-        # ),
-        th.Property(
-            "source_attributes",
-            th.ObjectType(
-                th.Property(
-                    "connection_id",
-                    th.IntegerType,
-                    description="The sync's source connection ID",
-                ),
-                th.Property(
-                    "object",
-                    th.ObjectType(
-                        th.Property(
-                            "type",
-                            th.StringType,
-                            description="The sync's source object type",
-                        ),
-                        th.Property(
-                            "id",
-                            th.IntegerType,
-                            description="The sync's source object ID",
-                        ),
-                        th.Property(
-                            "name",
-                            th.StringType,
-                            description="The sync's source object name",
-                        ),
-                        th.Property(
-                            "created_at",
-                            th.DateTimeType,
-                            description="The sync's source object creation date",
-                        ),
-                        th.Property(
-                            "updated_at",
-                            th.DateTimeType,
-                            description="The sync's source object last updated date",
-                        ),
-                        th.Property(
-                            "query",
-                            th.StringType,
-                            description="The sync's source object query",
-                        ),
-                    ),
-                    description="The sync's source object",
-                ),
+    ids_setting = "sync_ids"
+
+    schema = LazySchema(
+        lambda: th.PropertiesList(
+            th.Property(
+                "id",
+                th.IntegerType,
+                description="The sync's system ID",
             ),
-            description="The sync's source attributes",
-        ),
-        th.Property(
-            "destination_attributes",
-            th.ObjectType(
-                th.Property(
-                    "connection_id",
-                    th.IntegerType,
-                    description="The sync's destination connection ID",
-                ),
-                th.Property(
-                    "object",
-                    th.StringType,
-                    description="The sync's destination object",
-                ),
+            th.Property(
+                "label",
+                th.StringType,
+                description="The sync's label",
             ),
-            description="The sync's destination attributes",
-        ),
-        th.Property(
-            "mappings",
-            th.ArrayType(
+            th.Property(
+                "schedule_frequency",
+                th.StringType,
+                description="The sync's schedule frequency",
+            ),
+            th.Property(
+                "schedule_day",
+                th.IntegerType,
+                description="The sync's schedule day",
+            ),
+            th.Property(
+                "schedule_hour",
+                th.IntegerType,
+                description="The sync's schedule hour",
+            ),
+            th.Property(
+                "schedule_minute",
+                th.IntegerType,
+                description="The sync's schedule minute",
+            ),
+            th.Property(
+                "created_at",
+                th.DateTimeType,
+                description="The sync's creation date",
+            ),
+            th.Property(
+                "updated_at",
+                th.DateTimeType,
+                description="The sync's last updated date",
+            ),
+            th.Property(
+                "operation",
+                th.StringType,
+                description="The sync's operation type",
+            ),
+            th.Property(
+                "paused",
+                th.BooleanType,
+                description="Whether the sync is paused",
+            ),
+            th.Property(
+                "status",
+                th.StringType,
+                description="The sync's status",
+            ),
+            th.Property(
+                "lead_union_insert_to",
+                th.StringType,
+                description="The sync's lead union insert to",
+            ),
+            th.Property(
+                "trigger_on_dbt_cloud_rebuild",
+                th.BooleanType,
+                description="Whether the sync is triggered on dbt Cloud rebuild",
+            ),
+            th.Property(
+                "field_behavior",
+                th.StringType,
+                description="The sync's field behavior type",
+            ),
+            th.Property(
+                "field_normalization",
+                th.StringType,
+                description="The sync's field normalization type",
+            ),
+            th.Property(
+                "mirror_strategy",
+                th.StringType,
+                description="The sync's mirror strategy type",
+            ),
+            # TODO(edgarrmondragon): Add advanced_configuration when Census
+            # documentation is updated
+            # https://github.com/edgarrmondragon/tap-getcensus/issues/155
+            # th.Property(
+            #     "advanced_configuration",
+            #     th.ObjectType(),  # noqa: ERA001
+            #     description="The sync's advanced configuration",  # noqa: ERA001
+            # ),
+            th.Property(
+                "source_attributes",
                 th.ObjectType(
                     th.Property(
-                        "from",
+                        "connection_id",
+                        th.IntegerType,
+                        description="The sync's source connection ID",
+                    ),
+                    th.Property(
+                        "object",
                         th.ObjectType(
                             th.Property(
                                 "type",
                                 th.StringType,
-                                description="The sync's mapping from type",
+                                description="The sync's source object type",
                             ),
                             th.Property(
-                                "email",
+                                "id",
+                                th.IntegerType,
+                                description="The sync's source object ID",
+                            ),
+                            th.Property(
+                                "name",
+                                th.StringType,
+                                description="The sync's source object name",
+                            ),
+                            th.Property(
+                                "created_at",
+                                th.DateTimeType,
+                                description="The sync's source object creation date",
+                            ),
+                            th.Property(
+                                "updated_at",
+                                th.DateTimeType,
+                                description=(
+                                    "The sync's source object last updated date"
+                                ),
+                            ),
+                            th.Property(
+                                "query",
                                 th.StringType,
-                                description="The sync's mapping from email",
+                                description="The sync's source object query",
                             ),
                         ),
-                        description="The sync's mapping from",
-                    ),
-                    th.Property(
-                        "to",
-                        th.StringType,
-                        description="The sync's mapping to",
-                    ),
-                    th.Property(
-                        "is_primary_identifier",
-                        th.BooleanType,
-                        description="Whether the sync's mapping is primary identifier",
-                    ),
-                    th.Property(
-                        "generate_field",
-                        th.BooleanType,
-                        description="Whether the sync's mapping generates field",
+                        description="The sync's source object",
                     ),
+                ),
+                description="The sync's source attributes",
+            ),
+            th.Property(
+                "destination_attributes",
+                th.ObjectType(
                     th.Property(
-                        "preserve_values",
-                        th.BooleanType,
-                        description="Whether the sync's mapping preserves values",
+                        "connection_id",
+                        th.IntegerType,
+                        description="The sync's destination connection ID",
                     ),
                     th.Property(
-                        "operation",
+                        "object",
                         th.StringType,
-                        description="The sync's mapping operation type",
+                        description="The sync's destination object",
+                    ),
+                ),
+                description="The sync's destination attributes",
+            ),
+            th.Property(
+                "mappings",
+                th.ArrayType(
+                    th.ObjectType(
+                        th.Property(
+                            "from",
+                            th.ObjectType(
+                                th.Property(
+                                    "type",
+                                    th.StringType,
+                                    description="The sync's mapping from type",
+                                ),
+                                th.Property(
+                                    "email",
+                                    th.StringType,
+                                    description="The sync's mapping from email",
+                                ),
+                            ),
+                            description="The sync's mapping from",
+                        ),
+                        th.Property(
+                            "to",
+                            th.StringType,
+                            description="The sync's mapping to",
+                        ),
+                        th.Property(
+                            "is_primary_identifier",
+                            th.BooleanType,
+                            description=(
+                                "Whether the sync's mapping is primary identifier"
+                            ),
+                        ),
+                        th.Property(
+                            "generate_field",
+                            th.BooleanType,
+                            description="Whether the sync's mapping generates field",
+                        ),
+                        th.Property(
+                            "preserve_values",
+                            th.BooleanType,
+                            description="Whether the sync's mapping preserves values",
+                        ),
+                        th.Property(
+                            "operation",
+                            th.StringType,
+                            description="The sync's mapping operation type",
+                        ),
                     ),
                 ),
             ),
         ),
-    ).to_dict()
+    )
 
     def get_child_context(
         self,
         record: dict,
-        context: dict | None,  # noqa: ARG002
+        context: dict | None,
     ) -> dict:
         """Get child context.
 
@@ -238,9 +261,9 @@ class Syncs(CensusStream):
             context: The context.
 
         Returns:
-            The child context.
+            The child context, in the workspace of the parent.
         """
-        return {"sync_id": record["id"]}
+        return {**workspace_context(context), "sync_id": record["id"]}
 
 
 class SyncRuns(CensusStream):
@@ -249,101 +272,278 @@ class SyncRuns(CensusStream):
     name = "sync_runs"
     path = "/api/v1/syncs/{sync_id}/sync_runs"
     primary_keys = ("id",)
-    replication_key = None
+    replication_key = "updated_at"
+    sort_order = "desc"
     parent_stream_type = Syncs
 
-    schema = th.PropertiesList(
-        th.Property(
-            "id",
-            th.IntegerType,
-            description="The sync run's system ID",
-        ),
-        th.Property(
-            "sync_id",
-            th.IntegerType,
-            description="The sync run's sync ID",
-        ),
-        th.Property(
-            "source_record_count",
-            th.IntegerType,
-            description="The sync run's source record count",
-        ),
-        th.Property(
-            "records_processed",
-            th.IntegerType,
-            description="The count of records processed",
-        ),
-        th.Property(
-            "records_updated",
-            th.IntegerType,
-            description="The count of records updated",
-        ),
-        th.Property(
-            "records_failed",
-            th.IntegerType,
-            description="The count of records failed",
-        ),
-        th.Property(
-            "records_invalid",
-            th.IntegerType,
-            description="The count of records invalid",
-        ),
-        th.Property(
-            "created_at",
-            th.DateTimeType,
-            description="The sync run's creation date",
-        ),
-        th.Property(
-            "updated_at",
-            th.DateTimeType,
-            description="The sync run's last updated date",
-        ),
-        th.Property(
-            "completed_at",
-            th.DateTimeType,
-            description="The sync run's completion date",
-        ),
-        th.Property(
-            "scheduled_execution_time",
-            th.DateTimeType,
-            description="The sync run's scheduled execution time",
-        ),
-        th.Property(
-            "error_code",
-            th.IntegerType,
-            description="The sync run's error code",
-        ),
-        th.Property(
-            "error_message",
-            th.StringType,
-            description="The sync run's error message",
-        ),
-        th.Property(
-            "error_detail",
-            th.StringType,
-            description="The sync run's error detail",
-        ),
-        th.Property(
-            "status",
-            th.StringType,
-            description="The sync run's status",
-        ),
-        th.Property(
-            "canceled",
-            th.BooleanType,
-            description="Whether the sync run is canceled",
-        ),
-        th.Property(
-            "full_sync",
-            th.BooleanType,
-            description="Whether the sync run is a full sync",
-        ),
-        th.Property(
-            "sync_trigger_reason",
-            th.ObjectType(additional_properties=th.StringType),
-            description="The sync run's sync trigger reason",
+    #: Statuses of the runs that are over, whose records no longer change.
+    terminal_statuses = frozenset(("completed", "failed", "skipped"))
+
+    # Parsed once, since every run is compared with it
+    _end_date: datetime | None = None
+
+    def __init__(
+        self,
+        tap: Tap,
+        name: str | None = None,
+        schema: dict[str, t.Any] | None = None,
+        path: str | None = None,
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            tap: Singer Tap this stream belongs to.
+            name: Name of this stream.
+            schema: JSON schema for records in this stream.
+            path: URL path for this entity stream.
+        """
+        super().__init__(tap=tap, name=name, schema=schema, path=path)
+        self._active_runs: dict[tuple, dict | None] = {}
+        self._run_versions: OrderedDict[tuple, tuple] = OrderedDict()
+
+    schema = LazySchema(
+        lambda: th.PropertiesList(
+            th.Property(
+                "id",
+                th.IntegerType,
+                description="The sync run's system ID",
+            ),
+            th.Property(
+                "sync_id",
+                th.IntegerType,
+                description="The sync run's sync ID",
+            ),
+            th.Property(
+                "source_record_count",
+                th.IntegerType,
+                description="The sync run's source record count",
+            ),
+            th.Property(
+                "records_processed",
+                th.IntegerType,
+                description="The count of records processed",
+            ),
+            th.Property(
+                "records_updated",
+                th.IntegerType,
+                description="The count of records updated",
+            ),
+            th.Property(
+                "records_failed",
+                th.IntegerType,
+                description="The count of records failed",
+            ),
+            th.Property(
+                "records_invalid",
+                th.IntegerType,
+                description="The count of records invalid",
+            ),
+            th.Property(
+                "created_at",
+                th.DateTimeType,
+                description="The sync run's creation date",
+            ),
+            th.Property(
+                "updated_at",
+                th.DateTimeType,
+                description="The sync run's last updated date",
+            ),
+            th.Property(
+                "completed_at",
+                th.DateTimeType,
+                description="The sync run's completion date",
+            ),
+            th.Property(
+                "scheduled_execution_time",
+                th.DateTimeType,
+                description="The sync run's scheduled execution time",
+            ),
+            th.Property(
+                "error_code",
+                th.IntegerType,
+                description="The sync run's error code",
+            ),
+            th.Property(
+                "error_message",
+                th.StringType,
+                description="The sync run's error message",
+            ),
+            th.Property(
+                "error_detail",
+                th.StringType,
+                description="The sync run's error detail",
+            ),
+            th.Property(
+                "status",
+                th.StringType,
+                description="The sync run's status",
+            ),
+            th.Property(
+                "canceled",
+                th.BooleanType,
+                description="Whether the sync run is canceled",
+            ),
+            th.Property(
+                "full_sync",
+                th.BooleanType,
+                description="Whether the sync run is a full sync",
+            ),
+            th.Property(
+                "sync_trigger_reason",
+                th.ObjectType(additional_properties=th.StringType),
+                description="The sync run's sync trigger reason",
+            ),
         ),
-    ).to_dict()
+    )
+
+    @property
+    def start_date(self) -> datetime | None:
+        """Get the earliest `updated_at` of the runs to sync.
+
+        Returns:
+            The `sync_runs_start_date` setting, if any.
+        """
+        start_date = self.config.get("sync_runs_start_date")
+        return parse_datetime(start_date) if start_date else None
+
+    @property
+    def end_date(self) -> datetime | None:
+        """Get the latest `updated_at` of the runs to sync.
+
+        Returns:
+            The `sync_runs_end_date` setting, if any.
+        """
+        if self._end_date is None and self.config.get("sync_runs_end_date"):
+            self._end_date = parse_datetime(self.config["sync_runs_end_date"])
+        return self._end_date
+
+    def get_bookmark(self, context: dict | None) -> datetime | None:
+        """Get the bookmark to filter runs and stop pagination.
+
+        Runs are sorted newest-first, so pagination also stops at the first
+        page with runs older than `sync_runs_start_date`.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The latest of the partition bookmark and the configured start date.
+        """
+        values = [
+            value for value in (super().get_bookmark(context), self.start_date) if value
+        ]
+        return max(values) if values else None
+
+    def post_process(
+        self,
+        row: dict,
+        context: dict | None = None,  # noqa: ARG002
+    ) -> dict | None:
+        """Drop runs outside of the configured time window and statuses.
+
+        The Census API does not filter sync runs, so they are dropped as soon
+        as they are received, before they are validated or written.
+
+        Args:
+            row: A sync run.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The run, or None if it is filtered out.
+        """
+        statuses = self.config.get("sync_runs_statuses")
+        if statuses and row.get("status") not in statuses:
+            return None
+        end_date = self.end_date
+        updated_at = row.get("updated_at")
+        if end_date and updated_at and parse_datetime(updated_at) > end_date:
+            return None
+        return row
+
+    @property
+    def has_active_runs(self) -> bool:
+        """Whether runs emitted in watch mode are still in progress.
+
+        Returns:
+            True if a run emitted since the watch started is not over.
+        """
+        return bool(self._active_runs)
+
+    def poll_active_runs(self) -> None:
+        """Sync the partitions of the runs in progress, then write the state.
+
+        Only runs updated since the partition bookmark are requested, which
+        usually takes a single page per partition.
+        """
+        started = datetime.now(timezone.utc)
+        partitions = {
+            context_key(context): context for context in self._active_runs.values()
+        }
+        for context in partitions.values():
+            self.sync(context)
+        self.compact_state(started, fold=False)
+        self.flush_state()
+
+    def poll_all_syncs(self) -> None:
+        """Sync the partitions of every sync to find new runs, then write the state.
+
+        The syncs are listed again, from the parent cache if it is used, but
+        their records are not written.
+        """
+        syncs = t.cast(Syncs, self.census_tap.streams[Syncs.name])
+        workspaces: list[dict | None] = [None]
+        if syncs.partitions:
+            workspaces = [*syncs.partitions]
+        for workspace in workspaces:
+            started = datetime.now(timezone.utc)
+            for context in syncs.get_child_contexts(workspace):
+                self.sync(context)
+            self.compact_state(
+                started,
+                fold=syncs.get_configured_ids(workspace) is None,
+                scope=workspace,
+            )
+        self.flush_state()
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write out a RECORD message, unless the run was emitted as it is.
+
+        In watch mode, runs in progress are tracked to be polled, and runs that
+        are listed again without changes, e.g. within the watermark margin, are
+        skipped.
+
+        Args:
+            record: A single stream record.
+        """
+        if self.config.get("watch") and not self._track_run(record):
+            return
+        super()._write_record_message(record)
+
+    def _track_run(self, record: dict) -> bool:
+        """Track whether a run is in progress, and whether it changed.
+
+        Args:
+            record: A sync run.
+
+        Returns:
+            True if the run was not emitted before with the same status and
+            `updated_at`.
+        """
+        context = self._current_context
+        run = (context_key(workspace_context(context)), record.get("id"))
+        if record.get("status") in self.terminal_statuses or record.get("canceled"):
+            self._active_runs.pop(run, None)
+        else:
+            self._active_runs[run] = context
+
+        version = (record.get("status"), record.get("updated_at"))
+        if self._run_versions.get(run) == version:
+            return False
+        self._run_versions[run] = version
+        self._run_versions.move_to_end(run)
+        if len(self._run_versions) > _MAX_TRACKED_RUNS:
+            self._run_versions.popitem(last=False)
+        return True
 
 
 class Destinations(CensusStream):
@@ -353,34 +553,38 @@ class Destinations(CensusStream):
     path = "/api/v1/destinations"
     primary_keys = ("id",)
     replication_key = None
-
-    schema = th.PropertiesList(
-        th.Property(
-            "id",
-            th.IntegerType,
-            description="The destination's system ID",
-        ),
-        th.Property(
-            "name",
-            th.StringType,
-            description="The destination's name",
-        ),
-        th.Property(
-            "type",
-            th.StringType,
-            description="The destination's type",
-        ),
-        th.Property(
-            "connection_details",
-            th.ObjectType(),
-            description="The destination's connection details",
+    ids_setting = "destination_ids"
+    conditional_requests = True
+
+    schema = LazySchema(
+        lambda: th.PropertiesList(
+            th.Property(
+                "id",
+                th.IntegerType,
+                description="The destination's system ID",
+            ),
+            th.Property(
+                "name",
+                th.StringType,
+                description="The destination's name",
+            ),
+            th.Property(
+                "type",
+                th.StringType,
+                description="The destination's type",
+            ),
+            th.Property(
+                "connection_details",
+                th.ObjectType(),
+                description="The destination's connection details",
+            ),
         ),
-    ).to_dict()
+    )
 
     def get_child_context(
         self,
         record: dict,
-        context: dict | None,  # noqa: ARG002
+        context: dict | None,
     ) -> dict:
         """Get child context.
 
@@ -389,9 +593,9 @@ class Destinations(CensusStream):
             context: The context.
 
         Returns:
-            The child context.
+            The child context, in the workspace of the parent.
         """
-        return {"destination_id": record["id"]}
+        return {**workspace_context(context), "destination_id": record["id"]}
 
 
 class DestinationObjects(CensusStream):
@@ -401,120 +605,123 @@ class DestinationObjects(CensusStream):
     path = "/api/v1/destinations/{destination_id}/objects"
     primary_keys = ("full_name",)
     replication_key = None
+    conditional_requests = True
     parent_stream_type = Destinations
 
-    schema = th.PropertiesList(
-        th.Property(
-            "destination_id",
-            th.IntegerType,
-            description="The destination's system ID",
-        ),
-        th.Property(
-            "label",
-            th.StringType,
-            description="The destination object's label",
-        ),
-        th.Property(
-            "full_name",
-            th.StringType,
-            description="The destination object's full name",
-        ),
-        th.Property(
-            "allow_custom_fields",
-            th.BooleanType,
-            description="Whether the destination object allows custom fields",
-        ),
-        th.Property(
-            "allow_case_sensitive_field_names",
-            th.BooleanType,
-            description=(
-                "Whether the destination object allows case sensitive field names"
+    schema = LazySchema(
+        lambda: th.PropertiesList(
+            th.Property(
+                "destination_id",
+                th.IntegerType,
+                description="The destination's system ID",
             ),
-        ),
-        th.Property(
-            "configurable_field_definitions",
-            th.ObjectType(),
-            description="The destination object's configurable field definitions",
-        ),
-        th.Property(
-            "fields",
-            th.ArrayType(
-                th.ObjectType(
-                    th.Property(
-                        "label",
-                        th.StringType,
-                        description="The field's label",
-                    ),
-                    th.Property(
-                        "full_name",
-                        th.StringType,
-                        description="The field's full name",
-                    ),
-                    th.Property(
-                        "creatable",
-                        th.BooleanType,
-                        description=("Whether the field is creatable"),
-                    ),
-                    th.Property(
-                        "updatable",
-                        th.BooleanType,
-                        description=("Whether the field is updatable"),
-                    ),
-                    th.Property(
-                        "operations",
-                        th.ArrayType(th.StringType),
-                        description="The field's operations",
-                    ),
-                    th.Property(
-                        "array",
-                        th.BooleanType,
-                        description="Whether the field is an array",
-                    ),
-                    th.Property(
-                        "preserve_values_supported",
-                        th.BooleanType,
-                        description="Whether the field supports preserving values",
-                    ),
-                    th.Property(
-                        "required_for_mapping",
-                        th.BooleanType,
-                        description="Whether the field is required for mapping",
-                    ),
-                    th.Property(
-                        "can_be_upsert_key",
-                        th.BooleanType,
-                        description="Whether the field can be an upsert key",
-                    ),
-                    th.Property(
-                        "can_be_update_key",
-                        th.BooleanType,
-                        description="Whether the field can be an update key",
-                    ),
-                    th.Property(
-                        "can_be_insert_key",
-                        th.BooleanType,
-                        description="Whether the field can be an insert key",
-                    ),
-                    th.Property(
-                        "can_be_reference_key",
-                        th.BooleanType,
-                        description="Whether the field can be a reference key",
-                    ),
-                    th.Property(
-                        "lookup_object",
-                        th.StringType,
-                        description="The field's lookup object",
-                    ),
-                    th.Property(
-                        "type",
-                        th.StringType,
-                        description="The field's type",
+            th.Property(
+                "label",
+                th.StringType,
+                description="The destination object's label",
+            ),
+            th.Property(
+                "full_name",
+                th.StringType,
+                description="The destination object's full name",
+            ),
+            th.Property(
+                "allow_custom_fields",
+                th.BooleanType,
+                description="Whether the destination object allows custom fields",
+            ),
+            th.Property(
+                "allow_case_sensitive_field_names",
+                th.BooleanType,
+                description=(
+                    "Whether the destination object allows case sensitive field names"
+                ),
+            ),
+            th.Property(
+                "configurable_field_definitions",
+                th.ObjectType(),
+                description="The destination object's configurable field definitions",
+            ),
+            th.Property(
+                "fields",
+                th.ArrayType(
+                    th.ObjectType(
+                        th.Property(
+                            "label",
+                            th.StringType,
+                            description="The field's label",
+                        ),
+                        th.Property(
+                            "full_name",
+                            th.StringType,
+                            description="The field's full name",
+                        ),
+                        th.Property(
+                            "creatable",
+                            th.BooleanType,
+                            description=("Whether the field is creatable"),
+                        ),
+                        th.Property(
+                            "updatable",
+                            th.BooleanType,
+                            description=("Whether the field is updatable"),
+                        ),
+                        th.Property(
+                            "operations",
+                            th.ArrayType(th.StringType),
+                            description="The field's operations",
+                        ),
+                        th.Property(
+                            "array",
+                            th.BooleanType,
+                            description="Whether the field is an array",
+                        ),
+                        th.Property(
+                            "preserve_values_supported",
+                            th.BooleanType,
+                            description="Whether the field supports preserving values",
+                        ),
+                        th.Property(
+                            "required_for_mapping",
+                            th.BooleanType,
+                            description="Whether the field is required for mapping",
+                        ),
+                        th.Property(
+                            "can_be_upsert_key",
+                            th.BooleanType,
+                            description="Whether the field can be an upsert key",
+                        ),
+                        th.Property(
+                            "can_be_update_key",
+                            th.BooleanType,
+                            description="Whether the field can be an update key",
+                        ),
+                        th.Property(
+                            "can_be_insert_key",
+                            th.BooleanType,
+                            description="Whether the field can be an insert key",
+                        ),
+                        th.Property(
+                            "can_be_reference_key",
+                            th.BooleanType,
+                            description="Whether the field can be a reference key",
+                        ),
+                        th.Property(
+                            "lookup_object",
+                            th.StringType,
+                            description="The field's lookup object",
+                        ),
+                        th.Property(
+                            "type",
+                            th.StringType,
+                            description="The field's type",
+                        ),
                     ),
                 ),
+                description="The destination object's fields",
             ),
-            description="The destination object's fields",
         ),
-    ).to_dict()
+    )
 
 
 class Sources(CensusStream):
@@ -524,54 +731,58 @@ class Sources(CensusStream):
     path = "/api/v1/sources"
     primary_keys = ("id",)
     replication_key = None
-
-    schema = th.PropertiesList(
-        th.Property(
-            "id",
-            th.IntegerType,
-            description="The source's system ID",
-        ),
-        th.Property(
-            "name",
-            th.StringType,
-            description="The source's name",
-        ),
-        th.Property(
-            "label",
-            th.StringType,
-            description="The source's label",
-        ),
-        th.Property(
-            "type",
-            th.StringType,
-            description="The source's type",
-        ),
-        th.Property(
-            "last_test_succeeded",
-            th.BooleanType,
-            description="Whether the last test succeeded",
-        ),
-        th.Property(
-            "last_tested_at",
-            th.DateTimeType,
-            description="The last test's timestamp",
-        ),
-        th.Property(
-            "connection_details",
-            th.ObjectType(),
-            description="The destination's connection details",
-        ),
-        th.Property(
-            "read_only_connection",
-            th.BooleanType,
-            description="Whether the source is read-only",
+    ids_setting = "source_ids"
+    conditional_requests = True
+
+    schema = LazySchema(
+        lambda: th.PropertiesList(
+            th.Property(
+                "id",
+                th.IntegerType,
+                description="The source's system ID",
+            ),
+            th.Property(
+                "name",
+                th.StringType,
+                description="The source's name",
+            ),
+            th.Property(
+                "label",
+                th.StringType,
+                description="The source's label",
+            ),
+            th.Property(
+                "type",
+                th.StringType,
+                description="The source's type",
+            ),
+            th.Property(
+                "last_test_succeeded",
+                th.BooleanType,
+                description="Whether the last test succeeded",
+            ),
+            th.Property(
+                "last_tested_at",
+                th.DateTimeType,
+                description="The last test's timestamp",
+            ),
+            th.Property(
+                "connection_details",
+                th.ObjectType(),
+                description="The destination's connection details",
+            ),
+            th.Property(
+                "read_only_connection",
+                th.BooleanType,
+                description="Whether the source is read-only",
+            ),
         ),
-    ).to_dict()
+    )
 
     def get_child_context(
         self,
         record: dict,
-        context: dict | None,  # noqa: ARG002
+        context: dict | None,
     ) -> dict:
         """Get child context.
 
@@ -580,9 +791,9 @@ class Sources(CensusStream):
             context: The context.
 
         Returns:
-            The child context.
+            The child context, in the workspace of the parent.
         """
-        return {"source_id": record["id"]}
+        return {**workspace_context(context), "source_id": record["id"]}
 
 
 class SourceObjects(CensusStream):
@@ -592,90 +803,93 @@ class SourceObjects(CensusStream):
     path = "/api/v1/sources/{source_id}/objects"
     primary_keys = ("id",)
     replication_key = None
+    conditional_requests = True
     parent_stream_type = Sources
 
-    schema = th.PropertiesList(
-        th.Property(
-            "id",
-            th.IntegerType,
-            description="The source object's ID",
-        ),
-        th.Property(
-            "source_object_id",
-            th.IntegerType,
-            description="The source object's ID",
-        ),
-        th.Property(
-            "source_id",
-            th.IntegerType,
-            description="The source object's source ID",
-        ),
-        th.Property(
-            "columns",
-            th.ArrayType(
-                th.ObjectType(
-                    th.Property(
-                        "name",
-                        th.StringType,
-                        description="The column's name",
-                    ),
-                    th.Property(
-                        "type",
-                        th.StringType,
-                        description="The column's type",
+    schema = LazySchema(
+        lambda: th.PropertiesList(
+            th.Property(
+                "id",
+                th.IntegerType,
+                description="The source object's ID",
+            ),
+            th.Property(
+                "source_object_id",
+                th.IntegerType,
+                description="The source object's ID",
+            ),
+            th.Property(
+                "source_id",
+                th.IntegerType,
+                description="The source object's source ID",
+            ),
+            th.Property(
+                "columns",
+                th.ArrayType(
+                    th.ObjectType(
+                        th.Property(
+                            "name",
+                            th.StringType,
+                            description="The column's name",
+                        ),
+                        th.Property(
+                            "type",
+                            th.StringType,
+                            description="The column's type",
+                        ),
                     ),
                 ),
+                description="The source object's columns",
+            ),
+            th.Property(
+                "name",
+                th.StringType,
+                description="The source object's name",
+            ),
+            th.Property(
+                "description",
+                th.StringType,
+                description="The source object's description",
+            ),
+            th.Property(
+                "approved",
+                th.BooleanType,
+                description="Whether the source object is approved",
+            ),
+            th.Property(
+                "type",
+                th.StringType,
+                description="The source object's type",
+            ),
+            th.Property(
+                "table_catalog",
+                th.StringType,
+                description="The source object's table catalog",
+            ),
+            th.Property(
+                "table_schema",
+                th.StringType,
+                description="The source object's table schema",
+            ),
+            th.Property(
+                "table_name",
+                th.StringType,
+                description="The source object's table name",
+            ),
+            th.Property(
+                "created_at",
+                th.DateTimeType,
+                description="The source object's creation timestamp",
+            ),
+            th.Property(
+                "updated_at",
+                th.DateTimeType,
+                description="The source object's update timestamp",
+            ),
+            th.Property(
+                "query",
+                th.StringType,
+                description="The source object's query",
             ),
-            description="The source object's columns",
-        ),
-        th.Property(
-            "name",
-            th.StringType,
-            description="The source object's name",
-        ),
-        th.Property(
-            "description",
-            th.StringType,
-            description="The source object's description",
-        ),
-        th.Property(
-            "approved",
-            th.BooleanType,
-            description="Whether the source object is approved",
-        ),
-        th.Property(
-            "type",
-            th.StringType,
-            description="The source object's type",
-        ),
-        th.Property(
-            "table_catalog",
-            th.StringType,
-            description="The source object's table catalog",
-        ),
-        th.Property(
-            "table_schema",
-            th.StringType,
-            description="The source object's table schema",
-        ),
-        th.Property(
-            "table_name",
-            th.StringType,
-            description="The source object's table name",
-        ),
-        th.Property(
-            "created_at",
-            th.DateTimeType,
-            description="The source object's creation timestamp",
-        ),
-        th.Property(
-            "updated_at",
-            th.DateTimeType,
-            description="The source object's update timestamp",
-        ),
-        th.Property(
-            "query",
-            th.StringType,
-            description="The source object's query",
         ),
-    ).to_dict()
+    )
@@ -2,39 +2,841 @@
 
 from __future__ import annotations
 
-from singer_sdk import Stream, Tap
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from singer_sdk import Stream, Tap, metrics
 from singer_sdk import typing as th
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.helpers._batch import BatchConfig
 
 from tap_getcensus import streams
+from tap_getcensus.batch import BATCH_FORMATS, BatchWriter
+from tap_getcensus.cache import ParentCache
+from tap_getcensus.catalog import load_catalog, read_catalog_text
+from tap_getcensus.client import DEFAULT_API_URL, CensusStream
+from tap_getcensus.output import MessageWriter
+from tap_getcensus.profiling import PROFILE_FORMATS, StreamProfiler
+from tap_getcensus.ratelimit import RateLimiter
+from tap_getcensus.telemetry import InstrumentedHTTPAdapter, Telemetry
+from tap_getcensus.watch import PollSchedule
+
+if t.TYPE_CHECKING:
+    from singer_sdk._singerlib import Catalog
+
+    from tap_getcensus.transport import AsyncTransport
 
 __all__ = ["TapCensus"]
 
+# Settings that change the schemas or primary keys of the streams
+_CATALOG_SETTINGS = ("workspaces", "emit_tombstones")
+
 
 class TapCensus(Tap):
     """Singer tap for Census."""
 
     name = "tap-getcensus"
 
+    _http_session: requests.Session | None = None
+    _http_transport: AsyncTransport | None = None
+    _rate_limiters: dict[str, RateLimiter] | None = None
+    _rate_limiters_lock = threading.Lock()
+    _parent_cache: ParentCache | None = None
+    _telemetry: Telemetry | None = None
+    _profiler: StreamProfiler | None = None
+    _message_writer: MessageWriter | None = None
+    _batch_writer: BatchWriter | None = None
+    _workspaces: dict[str, dict] | None = None
+    _executor: ThreadPoolExecutor | None = None
+
+    #: Stream classes by stream name, with parents before their children
+    stream_types: t.ClassVar[dict[str, type[CensusStream]]] = {
+        "syncs": streams.Syncs,
+        "sync_runs": streams.SyncRuns,
+        "destinations": streams.Destinations,
+        "destination_objects": streams.DestinationObjects,
+        "sources": streams.Sources,
+        "source_objects": streams.SourceObjects,
+    }
+
     config_jsonschema = th.PropertiesList(
         th.Property(
             "api_token",
             th.StringType,
-            required=True,
-            description="Auth token for getcensus.com API",
+            description="Auth token for getcensus.com API, unless `workspaces` is set",
+        ),
+        th.Property(
+            "workspaces",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property(
+                        "label",
+                        th.StringType,
+                        required=True,
+                        description=(
+                            "Label of the workspace, added to its records and "
+                            "partitions"
+                        ),
+                    ),
+                    th.Property(
+                        "api_token",
+                        th.StringType,
+                        required=True,
+                        description="Auth token of the workspace",
+                    ),
+                    th.Property("sync_ids", th.ArrayType(th.IntegerType)),
+                    th.Property("source_ids", th.ArrayType(th.IntegerType)),
+                    th.Property("destination_ids", th.ArrayType(th.IntegerType)),
+                ),
+            ),
+            description=(
+                "Workspaces to sync in one process, each with its own token and "
+                "optionally its own `sync_ids`, `source_ids` and `destination_ids`"
+            ),
+        ),
+        th.Property(
+            "api_url",
+            th.StringType,
+            default=DEFAULT_API_URL,
+            description="Base URL of the Census API",
+        ),
+        th.Property(
+            "sync_ids",
+            th.ArrayType(th.IntegerType),
+            description=(
+                "IDs of the syncs whose records and sync runs are synced, "
+                "instead of listing all syncs"
+            ),
+        ),
+        th.Property(
+            "source_ids",
+            th.ArrayType(th.IntegerType),
+            description=(
+                "IDs of the sources whose records and source objects are synced, "
+                "instead of listing all sources"
+            ),
+        ),
+        th.Property(
+            "destination_ids",
+            th.ArrayType(th.IntegerType),
+            description=(
+                "IDs of the destinations whose records and destination objects are "
+                "synced, instead of listing all destinations"
+            ),
+        ),
+        th.Property(
+            "start_date",
+            th.DateTimeType,
+            description=(
+                "Earliest replication key value of the records of incremental "
+                "streams to sync, for partitions without a later bookmark"
+            ),
+        ),
+        th.Property(
+            "sync_runs_start_date",
+            th.DateTimeType,
+            description=(
+                "Earliest `updated_at` of the sync runs to sync. Pagination stops at "
+                "older runs"
+            ),
+        ),
+        th.Property(
+            "sync_runs_end_date",
+            th.DateTimeType,
+            description="Latest `updated_at` of the sync runs to sync",
+        ),
+        th.Property(
+            "sync_runs_statuses",
+            th.ArrayType(th.StringType),
+            description=(
+                "Statuses of the sync runs to sync, e.g. `failed`. Runs of all "
+                "statuses are synced if not set"
+            ),
+        ),
+        th.Property(
+            "stream_responses",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Parse records while response bodies are downloaded, instead of "
+                "decoding each page as a whole"
+            ),
+        ),
+        th.Property(
+            "max_concurrency",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of stream partitions (e.g. the runs of each sync, "
+                "or the workspaces) fetched in parallel"
+            ),
+        ),
+        th.Property(
+            "prefetch_pages",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Number of pages requested ahead, while the records of the current "
+                "page are emitted. Pages are requested one at a time if 0"
+            ),
+        ),
+        th.Property(
+            "async_transport",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Send requests through a shared asyncio HTTP client. Requires the "
+                "'httpx' package"
+            ),
+        ),
+        th.Property(
+            "http2",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Multiplex requests over HTTP/2 when using the async transport. "
+                "Requires the 'h2' package"
+            ),
+        ),
+        th.Property(
+            "page_size",
+            th.IntegerType,
+            default=250,
+            description="Number of records requested per page",
+        ),
+        th.Property(
+            "stream_page_sizes",
+            th.ObjectType(additional_properties=th.IntegerType),
+            description=(
+                "Number of records requested per page for specific streams, keyed "
+                "by stream name"
+            ),
+        ),
+        th.Property(
+            "adaptive_page_size",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Probe the largest page size accepted by the API, then tune it to "
+                "keep each page under `target_page_latency`"
+            ),
+        ),
+        th.Property(
+            "max_page_size",
+            th.IntegerType,
+            default=1000,
+            description="Largest page size to probe when `adaptive_page_size` is on",
+        ),
+        th.Property(
+            "target_page_latency",
+            th.NumberType,
+            default=2.0,
+            description="Target latency in seconds of a single page request",
+        ),
+        th.Property(
+            "max_requests_per_second",
+            th.NumberType,
+            description=(
+                "Maximum rate of requests sent to the API by all streams of each "
+                "workspace. The rate is also lowered to stay under the limits "
+                "advertised in the API's rate limit headers for each token"
+            ),
+        ),
+        th.Property(
+            "parent_cache_dir",
+            th.StringType,
+            description=(
+                "Directory to cache the IDs of parent streams in, when they are only "
+                "synced for their child streams. Caching is disabled if not set"
+            ),
+        ),
+        th.Property(
+            "parent_cache_ttl",
+            th.IntegerType,
+            default=3600,
+            description=(
+                "Seconds after which cached parent IDs are revalidated with "
+                "conditional requests"
+            ),
+        ),
+        th.Property(
+            "conditional_requests",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Revalidate the pages of metadata streams (sources, destinations "
+                "and their objects) with the validators saved in the state, and "
+                "only emit records of pages that changed since the last sync"
+            ),
+        ),
+        th.Property(
+            "dedupe_records",
+            th.BooleanType,
+            default=True,
+            description=(
+                "Drop records listed again on a later page of the same partition, "
+                "e.g. when records are created during the sync"
+            ),
+        ),
+        th.Property(
+            "change_detection",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Save a fingerprint of each record of full table streams in the "
+                "state, and only emit the records that are new or changed since the "
+                "last sync"
+            ),
+        ),
+        th.Property(
+            "emit_tombstones",
+            th.BooleanType,
+            default=False,
+            description=(
+                "With `change_detection`, emit a record with the primary key and "
+                "`_sdc_deleted_at` for each record deleted since the last sync"
+            ),
+        ),
+        th.Property(
+            "compact_state",
+            th.BooleanType,
+            default=True,
+            description=(
+                "Once a parent stream is done, fold the bookmarks of the child "
+                "partitions synced in full into a single watermark per stream, so "
+                "the state does not grow with the number of partitions"
+            ),
+        ),
+        th.Property(
+            "state_watermark_margin",
+            th.IntegerType,
+            default=300,
+            description=(
+                "Seconds subtracted from the start time of a sync to get the "
+                "watermark of compacted child partitions, to allow for clock skew "
+                "with the Census API"
+            ),
+        ),
+        th.Property(
+            "state_message_interval",
+            th.NumberType,
+            default=5,
+            description=(
+                "Minimum seconds between STATE messages written while child "
+                "partitions are synced. The latest state is always written when "
+                "each parent stream is done"
+            ),
+        ),
+        th.Property(
+            "validate_records",
+            th.BooleanType,
+            default=True,
+            description=(
+                "Conform the type of record values to the stream schemas and warn "
+                "about properties missing from them. When off, records are only "
+                "reduced to their selected properties, which is faster"
+            ),
+        ),
+        th.Property(
+            "output_buffer_size",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Characters of Singer messages to buffer before writing them to "
+                "stdout in a single call. Messages are written one at a time if 0"
+            ),
+        ),
+        th.Property(
+            "output_flush_interval",
+            th.NumberType,
+            default=1.0,
+            description="Maximum seconds between writes of buffered messages",
+        ),
+        th.Property(
+            "batch_config",
+            th.ObjectType(
+                th.Property(
+                    "encoding",
+                    th.ObjectType(
+                        th.Property(
+                            "format",
+                            th.StringType,
+                            allowed_values=list(BATCH_FORMATS),
+                        ),
+                        th.Property(
+                            "compression",
+                            th.StringType,
+                            allowed_values=["gzip", "snappy", "zstd", "none"],
+                        ),
+                    ),
+                    description="Format and compression of the batch files",
+                ),
+                th.Property(
+                    "storage",
+                    th.ObjectType(
+                        th.Property("root", th.StringType),
+                        th.Property("prefix", th.StringType),
+                    ),
+                    description="Directory or filesystem URL to write files to",
+                ),
+                th.Property(
+                    "batch_size",
+                    th.IntegerType,
+                    description="Maximum number of records in a file",
+                ),
+                th.Property(
+                    "max_file_size",
+                    th.IntegerType,
+                    description="Bytes of JSON records after which a file is closed",
+                ),
+            ),
+            description=(
+                "Write records to batch files announced with BATCH messages, instead "
+                "of RECORD messages"
+            ),
+        ),
+        th.Property(
+            "watch",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Keep running after the first sync, and poll the sync runs to emit "
+                "them as their status changes. Requires the `sync_runs` stream"
+            ),
+        ),
+        th.Property(
+            "watch_min_interval",
+            th.NumberType,
+            default=10,
+            description="Seconds between polls of the syncs with runs in progress",
+        ),
+        th.Property(
+            "watch_max_interval",
+            th.NumberType,
+            default=300,
+            description=(
+                "Maximum seconds between polls of every sync for new runs. Polls "
+                "back off from `watch_min_interval` to it while no run is in "
+                "progress"
+            ),
+        ),
+        th.Property(
+            "watch_duration",
+            th.NumberType,
+            description=(
+                "Seconds after which watch mode stops. It runs until interrupted "
+                "if not set"
+            ),
+        ),
+        th.Property(
+            "metrics_log_interval",
+            th.NumberType,
+            default=60,
+            description=(
+                "Seconds between METRIC log lines with the time spent in each phase "
+                "of the sync (connect, TLS, time to first byte, download, decode, "
+                "validation and write) and the page, byte and retry counts of each "
+                "stream"
+            ),
+        ),
+        th.Property(
+            "metrics_dump_path",
+            th.StringType,
+            description=(
+                "File to write the metrics of each stream to, after each stream and "
+                "at every log interval"
+            ),
+        ),
+        th.Property(
+            "metrics_dump_format",
+            th.StringType,
+            default="json",
+            allowed_values=["json", "prometheus"],
+            description="Format of the metrics dump file",
+        ),
+        th.Property(
+            "profile_dir",
+            th.StringType,
+            description=(
+                "Directory to write a profile of each stream's sync to. Profiling is "
+                "disabled if not set"
+            ),
+        ),
+        th.Property(
+            "profile_format",
+            th.StringType,
+            default="pstats",
+            allowed_values=list(PROFILE_FORMATS),
+            description=(
+                "Either `pstats` for cProfile statistics, or `collapsed` for sampled "
+                "stacks in the collapsed format used by flame graph tools"
+            ),
+        ),
+        th.Property(
+            "profile_interval",
+            th.NumberType,
+            default=0.005,
+            description="Seconds between stack samples in the `collapsed` format",
         ),
     ).to_dict()
 
+    @property
+    def max_connections(self) -> int:
+        """Size of the HTTP connection pool shared by all streams.
+
+        Each partition fetched in parallel may have another request in flight
+        for its next pages, when they are prefetched.
+
+        Returns:
+            The maximum number of connections to the Census API.
+        """
+        requesters = max(int(self.config.get("max_concurrency", 1)), 1)
+        if self.config.get("prefetch_pages"):
+            requesters *= 2
+        return max(requesters, 10)
+
+    @property
+    def workspaces(self) -> dict[str, dict] | None:
+        """Get the settings of each workspace, if several are synced.
+
+        Workspace settings override those of the tap.
+
+        Returns:
+            The settings of each workspace by label, or None if a single
+            workspace is synced with `api_token`.
+
+        Raises:
+            ConfigValidationError: If neither `api_token` nor `workspaces` is
+                set, or several workspaces have the same label.
+        """
+        if not self.config.get("workspaces"):
+            if not self.config.get("api_token"):
+                msg = "Either 'api_token' or 'workspaces' must be set"
+                raise ConfigValidationError(msg)
+            return None
+        if self._workspaces is None:
+            workspaces = {
+                workspace["label"]: {**self.config, **workspace}
+                for workspace in self.config["workspaces"]
+            }
+            if len(workspaces) < len(self.config["workspaces"]):
+                msg = "Workspace labels must be unique"
+                raise ConfigValidationError(msg)
+            self._workspaces = workspaces
+        return self._workspaces
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool that partitions are fetched in ahead of time.
+
+        The pool is shared by all streams and workspaces, so that no more than
+        `max_concurrency` partitions are fetched at once.
+
+        Returns:
+            The thread pool.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(int(self.config.get("max_concurrency", 1)), 1),
+                thread_name_prefix=f"{self.name}-partitions",
+            )
+        return self._executor
+
+    @property
+    def http_session(self) -> requests.Session:
+        """Get the HTTP session shared by all streams.
+
+        Returns:
+            A session whose keep-alive connection pool is reused across streams.
+        """
+        if self._http_session is None:
+            adapter = InstrumentedHTTPAdapter(pool_maxsize=self.max_connections)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._http_session = session
+        return self._http_session
+
+    @property
+    def http_transport(self) -> AsyncTransport | None:
+        """Get the async HTTP transport shared by all streams, if enabled.
+
+        Returns:
+            The async transport, or None to send requests with `http_session`.
+        """
+        if self._http_transport is None and self.config.get("async_transport"):
+            # Imported here, since httpx is slow to import and rarely used
+            from tap_getcensus.transport import AsyncTransport
+
+            self._http_transport = AsyncTransport(
+                http2=self.config.get("http2", False),
+                max_connections=self.max_connections,
+            )
+        return self._http_transport
+
+    def get_rate_limiter(self, api_token: str) -> RateLimiter:
+        """Get the rate limiter shared by all streams of a workspace.
+
+        The API advertises a budget for each token, so each workspace is paced
+        on its own.
+
+        Args:
+            api_token: Auth token of the workspace.
+
+        Returns:
+            A token bucket limiter.
+        """
+        with self._rate_limiters_lock:
+            if self._rate_limiters is None:
+                self._rate_limiters = {}
+            if api_token not in self._rate_limiters:
+                self._rate_limiters[api_token] = RateLimiter(
+                    self.config.get("max_requests_per_second"),
+                )
+            return self._rate_limiters[api_token]
+
+    @property
+    def parent_cache(self) -> ParentCache | None:
+        """Get the on-disk cache of parent stream records, if enabled.
+
+        Returns:
+            The parent cache, or None if `parent_cache_dir` is not set.
+        """
+        if self._parent_cache is None and self.config.get("parent_cache_dir"):
+            self._parent_cache = ParentCache(
+                self.config["parent_cache_dir"],
+                ttl=self.config.get("parent_cache_ttl", 3600),
+            )
+        return self._parent_cache
+
+    @property
+    def telemetry(self) -> Telemetry:
+        """Get the timing and volume metrics shared by all streams.
+
+        Returns:
+            The metrics, logged as METRIC lines and optionally dumped to
+            `metrics_dump_path`.
+        """
+        if self._telemetry is None:
+            self._telemetry = Telemetry(
+                metrics.get_metrics_logger(),
+                log_interval=self.config.get("metrics_log_interval", 60),
+                dump_path=self.config.get("metrics_dump_path"),
+                dump_format=self.config.get("metrics_dump_format", "json"),
+            )
+        return self._telemetry
+
+    @property
+    def profiler(self) -> StreamProfiler | None:
+        """Get the profiler of stream syncs, if enabled.
+
+        Returns:
+            The profiler, or None if `profile_dir` is not set.
+        """
+        if self._profiler is None and self.config.get("profile_dir"):
+            self._profiler = StreamProfiler(
+                self.config["profile_dir"],
+                profile_format=self.config.get("profile_format", "pstats"),
+                interval=self.config.get("profile_interval", 0.005),
+            )
+        return self._profiler
+
+    @property
+    def message_writer(self) -> MessageWriter:
+        """Get the writer of Singer messages shared by all streams.
+
+        Returns:
+            A writer that buffers messages if `output_buffer_size` is set.
+        """
+        if self._message_writer is None:
+            self._message_writer = MessageWriter(
+                buffer_size=self.config.get("output_buffer_size", 0),
+                flush_interval=self.config.get("output_flush_interval", 1.0),
+            )
+        return self._message_writer
+
+    @property
+    def batch_writer(self) -> BatchWriter | None:
+        """Get the writer of batch files shared by all streams.
+
+        Returns:
+            The writer, or None if `batch_config` is not set.
+        """
+        if self._batch_writer is None and self.config.get("batch_config"):
+            batch_config = dict(self.config["batch_config"])
+            max_file_size = batch_config.pop("max_file_size", None)
+            self._batch_writer = BatchWriter(
+                BatchConfig.from_dict(batch_config),
+                tap_name=self.name,
+                write_message=self.message_writer.write,
+                max_file_size=max_file_size,
+            )
+        return self._batch_writer
+
+    @classmethod
+    def invoke(  # type: ignore[override]  # noqa: PLR0913
+        cls: type[TapCensus],
+        *,
+        about: bool = False,
+        about_format: str | None = None,
+        config: tuple[str, ...] = (),
+        state: str | None = None,
+        catalog: str | None = None,
+    ) -> None:
+        """Invoke the tap's command line interface.
+
+        Like the SDK's, except that the tap is run with `run`, which also watches
+        the sync runs and releases the tap's resources.
+
+        Args:
+            about: Display package metadata and settings.
+            about_format: Specify output style for `--about`.
+            config: Configuration file location or 'ENV' to use environment
+                variables. Accepts multiple inputs as a tuple.
+            state: Use a bookmarks file for incremental replication.
+            catalog: Use a Singer catalog file with the tap.
+        """
+        super(Tap, cls).invoke(about=about, about_format=about_format)
+        cls.print_version(print_fn=cls.logger.info)
+        config_files, parse_env_config = cls.config_from_cli_args(*config)
+
+        tap = cls(
+            config=config_files,  # type: ignore[arg-type]
+            state=state,
+            catalog=catalog,
+            parse_env_config=parse_env_config,
+            validate_config=True,
+        )
+        tap.run()
+
+    def run(self) -> None:
+        """Sync all streams, then close the tap.
+
+        With `watch`, the sync runs are then polled until the watch is over.
+
+        The tap is also closed if the sync fails, so no message emitted before
+        the failure is lost.
+
+        Raises:
+            ConfigValidationError: If `watch` is set but the `sync_runs` stream
+                is not selected.
+        """
+        watching = bool(self.config.get("watch"))
+        if watching and not (
+            "sync_runs" in self.streams and self.streams["sync_runs"].selected
+        ):
+            msg = "Watch mode requires the 'sync_runs' stream to be selected"
+            raise ConfigValidationError(msg)
+        try:
+            self.sync_all()
+            if watching:
+                self.watch()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop the worker threads, then write the files and messages still buffered.
+
+        Partitions fetched in advance are discarded first, since their workers
+        wait for them to be emitted. The connections of the async transport are
+        closed too.
+        """
+        if self._executor is not None:
+            for stream in self.streams.values():
+                if isinstance(stream, CensusStream):
+                    stream.cancel_prefetch()
+            self._executor.shutdown()
+            self._executor = None
+        if self._http_transport is not None:
+            self._http_transport.close()
+            self._http_transport = None
+        if self._batch_writer is not None:
+            self._batch_writer.close_all()
+        if self._message_writer is not None:
+            self._message_writer.close()
+
+    def watch(self) -> None:
+        """Poll the sync runs until the watch is over, emitting those that changed.
+
+        The syncs with runs in progress are synced again on their own. The runs
+        of every sync are synced again to find new runs, from syncs listed
+        without being written, or read from the parent cache. The HTTP
+        connections are kept open in between.
+        """
+        sync_runs = t.cast("streams.SyncRuns", self.streams["sync_runs"])
+        schedule = PollSchedule(
+            self.config.get("watch_min_interval", 10),
+            self.config.get("watch_max_interval", 300),
+            duration=self.config.get("watch_duration"),
+        )
+        self.logger.info("Watching sync runs")
+        full = True
+        while True:
+            next_full = schedule.wait(active=sync_runs.has_active_runs, full=full)
+            if next_full is None:
+                return
+            full = next_full
+            if full:
+                sync_runs.poll_all_syncs()
+            else:
+                sync_runs.poll_active_runs()
+            self.message_writer.flush()
+
+    @property
+    def _changes_catalog(self) -> bool:
+        return any(self.config.get(name) for name in _CATALOG_SETTINGS)
+
+    @property
+    def _singer_catalog(self) -> Catalog:
+        """Get the catalog of all streams.
+
+        The catalog is read from the one precomputed in the package, if any, so
+        discovery does not create every stream. It only depends on the stream
+        classes, and `python -m tap_getcensus.catalog` writes it, unless several
+        workspaces are synced or tombstones are emitted, since the primary keys
+        or schemas then differ.
+
+        Returns:
+            The catalog.
+        """
+        catalog = None if self._changes_catalog else load_catalog()
+        if catalog is None:
+            return super()._singer_catalog
+        return catalog
+
+    @property
+    def catalog_json_text(self) -> str:
+        """Get the catalog of all streams as JSON, precomputed if possible.
+
+        Returns:
+            The catalog, formatted as JSON.
+        """
+        if self._changes_catalog:
+            return super().catalog_json_text
+        return read_catalog_text() or super().catalog_json_text
+
     def discover_streams(self) -> list[Stream]:
         """Return a list of discovered streams.
 
+        With an input catalog, only the selected streams are created, along
+        with the parents they are synced from. Streams missing from the
+        catalog are created too, as the SDK does, which decides whether they
+        are selected.
+
         Returns:
             A list of Census streams.
         """
-        return [
-            streams.Syncs(tap=self),
-            streams.SyncRuns(tap=self),
-            streams.Destinations(tap=self),
-            streams.DestinationObjects(tap=self),
-            streams.Sources(tap=self),
-            streams.SourceObjects(tap=self),
-        ]
+        stream_types = list(self.stream_types.values())
+        if self.input_catalog is not None:
+            wanted: set[type[Stream]] = set()
+            for name, stream_type in self.stream_types.items():
+                entry = self.input_catalog.get_stream(name)
+                if entry is None or entry.metadata.resolve_selection().get((), True):
+                    ancestor: type[Stream] | None = stream_type
+                    while ancestor is not None:
+                        wanted.add(ancestor)
+                        ancestor = ancestor.parent_stream_type
+            stream_types = [st for st in stream_types if st in wanted]
+        return [stream_type(tap=self) for stream_type in stream_types]
@@ -0,0 +1,365 @@
+"""Timing and volume metrics for each stream and partition."""
+
+from __future__ import annotations
+
+import enum
+import json
+import tempfile
+import threading
+import time
+import typing as t
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+from singer_sdk import metrics
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+if t.TYPE_CHECKING:
+    import logging
+    import os
+    import socket
+
+__all__ = [
+    "Counter",
+    "InstrumentedHTTPAdapter",
+    "Phase",
+    "Telemetry",
+    "take_connection_times",
+]
+
+
+class Phase(str, enum.Enum):
+    """Phases of a sync that are timed, in seconds."""
+
+    #: DNS resolution and TCP connection, for new connections only.
+    CONNECT = "connect"
+    #: TLS handshake, for new connections only.
+    TLS = "tls"
+    #: Time from sending the request to reading the response headers.
+    TTFB = "ttfb"
+    #: Reading the response body.
+    DOWNLOAD = "download"
+    #: Decoding JSON bodies into records.
+    DECODE = "decode"
+    #: Conforming records to the stream schema.
+    VALIDATION = "validation"
+    #: Writing Singer messages.
+    WRITE = "write"
+
+
+class Counter(str, enum.Enum):
+    """Counted events."""
+
+    PAGES = "pages"
+    BYTES = "bytes"
+    RETRIES = "retries"
+    UNCHANGED_RECORDS = "unchanged_records"
+    DELETED_RECORDS = "deleted_records"
+    DUPLICATE_RECORDS = "duplicate_records"
+
+
+class _Metric(str, enum.Enum):
+    SYNC_PROFILE = "sync_profile"
+
+
+_connection_times = threading.local()
+
+
+def take_connection_times() -> tuple[float, float]:
+    """Get and reset the time the current thread spent opening connections.
+
+    Returns:
+        Seconds spent connecting and in TLS handshakes since the last call.
+    """
+    times = getattr(_connection_times, "value", (0.0, 0.0))
+    _connection_times.value = (0.0, 0.0)
+    return times
+
+
+def _add_connection_times(connect: float, tls: float) -> None:
+    previous_connect, previous_tls = getattr(_connection_times, "value", (0.0, 0.0))
+    _connection_times.value = (previous_connect + connect, previous_tls + tls)
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self) -> socket.socket:
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _add_connection_times(time.perf_counter() - start, 0.0)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self) -> socket.socket:
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._connected_at = time.perf_counter()
+            _add_connection_times(self._connected_at - start, 0.0)
+
+    def connect(self) -> None:
+        super().connect()
+        _add_connection_times(0.0, time.perf_counter() - self._connected_at)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """An HTTP adapter that times new connections and TLS handshakes.
+
+    The times are collected per thread, and read with `take_connection_times`
+    after each request.
+    """
+
+    def init_poolmanager(self, *args: t.Any, **kwargs: t.Any) -> None:  # noqa: ANN401
+        """Create the pool manager, with timed connection pools.
+
+        Args:
+            args: Positional arguments for `HTTPAdapter.init_poolmanager`.
+            kwargs: Keyword arguments for `HTTPAdapter.init_poolmanager`.
+        """
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class _Totals:
+    def __init__(self) -> None:
+        self.seconds: dict[Phase, float] = defaultdict(float)
+        self.counts: dict[Counter, int] = defaultdict(int)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            **{
+                f"{phase.value}_seconds": round(self.seconds[phase], 6)
+                for phase in Phase
+            },
+            **{counter.value: self.counts[counter] for counter in Counter},
+        }
+
+
+class Telemetry:
+    """Collect metrics of all streams, from any thread.
+
+    Totals are kept for each stream and for each of its partitions. Partition
+    totals are logged as a METRIC line when the partition is done, and stream
+    totals every `log_interval` seconds and when the stream is done. They can
+    also be written to a JSON or Prometheus text file.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        *,
+        log_interval: float = 60,
+        dump_path: str | os.PathLike[str] | None = None,
+        dump_format: str = "json",
+    ) -> None:
+        """Initialize the metrics.
+
+        Args:
+            logger: Logger to write METRIC lines to.
+            log_interval: Seconds between METRIC lines with stream totals.
+            dump_path: File to write the totals to, if any.
+            dump_format: Format of the dump file, "json" or "prometheus".
+        """
+        self.logger = logger
+        self.log_interval = log_interval
+        self.dump_path = Path(dump_path) if dump_path else None
+        self.dump_format = dump_format
+
+        self._lock = threading.Lock()
+        self._streams: dict[str, _Totals] = defaultdict(_Totals)
+        self._partitions: dict[tuple[str, tuple], tuple[dict, _Totals]] = {}
+        self._last_logged = time.monotonic()
+
+    def _totals(self, stream: str, context: dict | None) -> list[_Totals]:
+        totals = [self._streams[stream]]
+        if context:
+            key = (stream, tuple(sorted(context.items())))
+            if key not in self._partitions:
+                self._partitions[key] = (dict(context), _Totals())
+            totals.append(self._partitions[key][1])
+        return totals
+
+    def add_time(
+        self,
+        stream: str,
+        context: dict | None,
+        phase: Phase,
+        seconds: float,
+    ) -> None:
+        """Add time spent in a phase.
+
+        Args:
+            stream: Name of the stream.
+            context: Stream partition or context dictionary.
+            phase: The timed phase.
+            seconds: Time spent, in seconds.
+        """
+        with self._lock:
+            for totals in self._totals(stream, context):
+                totals.seconds[phase] += seconds
+
+    def increment(
+        self,
+        stream: str,
+        context: dict | None,
+        counter: Counter,
+        value: int = 1,
+    ) -> None:
+        """Increment a counter.
+
+        Args:
+            stream: Name of the stream.
+            context: Stream partition or context dictionary.
+            counter: The counter.
+            value: Amount to add.
+        """
+        with self._lock:
+            for totals in self._totals(stream, context):
+                totals.counts[counter] += value
+
+    @contextmanager
+    def timed(
+        self,
+        stream: str,
+        context: dict | None,
+        phase: Phase,
+    ) -> t.Iterator[None]:
+        """Time a block of code.
+
+        Args:
+            stream: Name of the stream.
+            context: Stream partition or context dictionary.
+            phase: The timed phase.
+
+        Yields:
+            Nothing.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stream, context, phase, time.perf_counter() - start)
+
+    def _log(self, totals: _Totals, tags: dict[str, t.Any]) -> None:
+        point = metrics.Point(
+            "summary",
+            metric=_Metric.SYNC_PROFILE,  # type: ignore[arg-type]
+            value=totals.to_dict(),
+            tags=tags,
+        )
+        metrics.log(self.logger, point)
+
+    def partition_done(self, stream: str, context: dict) -> None:
+        """Log the totals of a synced partition.
+
+        Stream totals are also logged if the log interval has elapsed.
+
+        Args:
+            stream: Name of the stream.
+            context: Stream partition or context dictionary.
+        """
+        with self._lock:
+            entry = self._partitions.pop((stream, tuple(sorted(context.items()))), None)
+        if entry is not None:
+            self._log(
+                entry[1],
+                {metrics.Tag.STREAM: stream, metrics.Tag.CONTEXT: entry[0]},
+            )
+
+        if time.monotonic() - self._last_logged >= self.log_interval:
+            self._last_logged = time.monotonic()
+            with self._lock:
+                streams = list(self._streams.items())
+            for name, totals in streams:
+                self._log(totals, {metrics.Tag.STREAM: name})
+            self.dump()
+
+    def stream_done(self, *streams: str) -> None:
+        """Log the totals of synced streams and update the dump file.
+
+        Args:
+            streams: Names of a top-level stream and of its descendants.
+        """
+        for stream in streams:
+            with self._lock:
+                totals = self._streams.get(stream)
+            if totals is not None:
+                self._log(totals, {metrics.Tag.STREAM: stream})
+        self.dump()
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Get the totals of every stream.
+
+        Returns:
+            A JSON-serializable dictionary.
+        """
+        with self._lock:
+            return {
+                "streams": {
+                    name: totals.to_dict() for name, totals in self._streams.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Get the totals of every stream in the Prometheus text format.
+
+        Returns:
+            The exposition text.
+        """
+        with self._lock:
+            streams = {name: totals.to_dict() for name, totals in self._streams.items()}
+
+        lines = [
+            "# HELP tap_getcensus_phase_seconds_total Time spent in each phase.",
+            "# TYPE tap_getcensus_phase_seconds_total counter",
+        ]
+        for name, values in streams.items():
+            lines.extend(
+                f'tap_getcensus_phase_seconds_total{{stream="{name}",'
+                f'phase="{phase.value}"}} {values[f"{phase.value}_seconds"]}'
+                for phase in Phase
+            )
+        for counter in Counter:
+            metric = f"tap_getcensus_{counter.value}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(
+                f'{metric}{{stream="{name}"}} {values[counter.value]}'
+                for name, values in streams.items()
+            )
+        return "\n".join(lines) + "\n"
+
+    def dump(self) -> None:
+        """Atomically write the totals to the dump file, if configured."""
+        if self.dump_path is None:
+            return
+
+        if self.dump_format == "prometheus":
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), indent=2)
+
+        self.dump_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=self.dump_path.parent,
+            prefix=f".{self.dump_path.name}",
+            delete=False,
+        ) as dump_file:
+            dump_file.write(content)
+        Path(dump_file.name).replace(self.dump_path)
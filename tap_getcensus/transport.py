@@ -0,0 +1,140 @@
+"""Asyncio HTTP transport shared by all Census streams."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+import typing as t
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from singer_sdk.exceptions import ConfigValidationError
+
+if t.TYPE_CHECKING:
+    import httpx
+else:
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover
+        httpx = None
+
+__all__ = ["AsyncTransport"]
+
+
+class AsyncTransport:
+    """Send prepared requests through a single asyncio HTTP client.
+
+    The client runs on an event loop in a background thread, so any number of
+    threads (e.g. concurrent child partition fetches) can send requests over
+    one keep-alive connection pool, multiplexed over HTTP/2 when enabled.
+
+    Responses are converted to `requests.Response` objects, so pagination,
+    parsing and error handling work the same as with the default transport.
+    """
+
+    def __init__(self, *, http2: bool = False, max_connections: int = 10) -> None:
+        """Start the event loop and the HTTP client.
+
+        Args:
+            http2: Whether to negotiate HTTP/2.
+            max_connections: Size of the connection pool.
+
+        Raises:
+            ConfigValidationError: If httpx, or h2 for HTTP/2, is not installed.
+        """
+        if httpx is None:
+            msg = "The async transport requires the 'httpx' package"
+            raise ConfigValidationError(msg)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="census-async-transport",
+            daemon=True,
+        )
+        self._thread.start()
+
+        try:
+            self._client = self._run(
+                self._create_client(http2=http2, max_connections=max_connections),
+            )
+        except ImportError as ex:
+            self.close()
+            msg = "HTTP/2 support requires the 'h2' package"
+            raise ConfigValidationError(msg) from ex
+
+    @staticmethod
+    async def _create_client(*, http2: bool, max_connections: int) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def _run(
+        self,
+        coroutine: t.Coroutine[t.Any, t.Any, t.Any],
+    ) -> t.Any:  # noqa: ANN401
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def send(
+        self,
+        prepared_request: requests.PreparedRequest,
+        timeout: float | None = None,
+    ) -> requests.Response:
+        """Send a request and wait for the complete response.
+
+        Args:
+            prepared_request: The request to send.
+            timeout: Timeout in seconds for the request.
+
+        Returns:
+            The response, as a `requests.Response`.
+
+        Raises:
+            ReadTimeout: If the request timed out.
+            ConnectionError: If the connection failed.
+        """
+        try:
+            response = self._run(
+                self._client.request(
+                    t.cast(str, prepared_request.method),
+                    t.cast(str, prepared_request.url),
+                    headers=dict(prepared_request.headers),
+                    content=prepared_request.body,
+                    timeout=timeout,
+                ),
+            )
+        except httpx.TimeoutException as ex:
+            raise requests.exceptions.ReadTimeout(str(ex)) from ex
+        except httpx.TransportError as ex:
+            raise requests.exceptions.ConnectionError(str(ex)) from ex
+
+        return self._to_requests_response(response, prepared_request)
+
+    @staticmethod
+    def _to_requests_response(
+        response: httpx.Response,
+        prepared_request: requests.PreparedRequest,
+    ) -> requests.Response:
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.raw = io.BytesIO(response.content)
+        result.url = str(response.url)
+        result.reason = response.reason_phrase
+        result.encoding = response.encoding
+        result.elapsed = response.elapsed
+        result.request = prepared_request
+        return result
+
+    def close(self) -> None:
+        """Close the HTTP client and stop the event loop."""
+        if hasattr(self, "_client"):
+            self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,98 @@
+"""Scheduling of the polls made in watch mode.
+
+After the first sync, watch mode keeps polling the sync runs. The syncs with
+runs in progress are polled often, since their runs are about to change, while
+every sync is polled for new runs less and less often as long as none is in
+progress.
+"""
+
+from __future__ import annotations
+
+import time
+import typing as t
+
+__all__ = ["PollSchedule"]
+
+
+class PollSchedule:
+    """Decide when to poll next, and whether to poll every sync.
+
+    Syncs with runs in progress are polled every `min_interval`, and every
+    sync at least every `max_interval`. While no run is in progress, the
+    interval between polls of every sync starts at `min_interval` and doubles
+    after each poll, up to `max_interval`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        min_interval: float,
+        max_interval: float,
+        *,
+        duration: float | None = None,
+        clock: t.Callable[[], float] = time.monotonic,
+        sleep: t.Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the schedule.
+
+        Args:
+            min_interval: Seconds between polls of the syncs with runs in
+                progress.
+            max_interval: Maximum seconds between polls of every sync.
+            duration: Seconds after which no more polls are scheduled, or None
+                to poll forever.
+            clock: Monotonic clock returning seconds.
+            sleep: Function to wait with.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._clock = clock
+        self._sleep = sleep
+        now = clock()
+        self._deadline = None if duration is None else now + duration
+        self._backoff = min_interval
+        self._full_poll_at = now
+
+    def next_poll(self, *, active: bool, full: bool) -> tuple[float, bool] | None:
+        """Schedule the next poll, once the previous one is done.
+
+        Args:
+            active: Whether runs are in progress.
+            full: Whether the previous poll covered every sync.
+
+        Returns:
+            The seconds to wait for, and whether the next poll covers every
+            sync, or None if the watch is over.
+        """
+        now = self._clock()
+        if active:
+            self._backoff = self.min_interval
+        # Once runs are over, new ones may follow soon
+        if full or (not active and self._full_poll_at > now + self._backoff):
+            self._full_poll_at = now + (self.max_interval if active else self._backoff)
+            if not active:
+                self._backoff = min(self._backoff * 2, self.max_interval)
+
+        poll_at = self._full_poll_at
+        if active:
+            poll_at = min(poll_at, now + self.min_interval)
+        if self._deadline is not None and poll_at > self._deadline:
+            return None
+        return poll_at - now, poll_at >= self._full_poll_at
+
+    def wait(self, *, active: bool, full: bool) -> bool | None:
+        """Wait for the next poll, once the previous one is done.
+
+        Args:
+            active: Whether runs are in progress.
+            full: Whether the previous poll covered every sync.
+
+        Returns:
+            Whether the next poll covers every sync, or None if the watch is
+            over.
+        """
+        poll = self.next_poll(active=active, full=full)
+        if poll is None:
+            return None
+        delay, full = poll
+        self._sleep(delay)
+        return full
@@ -0,0 +1,97 @@
+"""Shared fixtures for tap-getcensus tests."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import typing as t
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+import requests
+
+from tap_getcensus.tap import TapCensus
+
+
+def make_response(
+    body: t.Any,
+    url: str = "https://app.getcensus.com/api/v1/syncs",
+    status: int = 200,
+    headers: dict[str, str] | None = None,
+) -> requests.Response:
+    """Build a `requests.Response` without hitting the network."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"" if body is None else json.dumps(body).encode()
+    response.url = url
+    response.reason = "OK"
+    response.headers.update(headers or {})
+    response.elapsed = timedelta(0)
+    response._content_consumed = True
+    response.request = requests.Request("GET", url).prepare()
+    return response
+
+
+class FakeSession(requests.Session):
+    """A session that serves canned pages keyed by URL path.
+
+    Pages carry an ETag unless `etags` is off, and conditional requests for
+    unchanged pages get a 304 response.
+    """
+
+    etags = True
+
+    def __init__(self, pages: dict[str, list[dict]]) -> None:
+        """Initialize the session with pages of bodies for each path."""
+        super().__init__()
+        self.pages = pages
+        self.sent: list[requests.PreparedRequest] = []
+
+    def send(self, request: requests.PreparedRequest, **kwargs: t.Any):  # noqa: ARG002
+        """Record the request and return the page it asks for."""
+        self.sent.append(request)
+        parsed = urlparse(request.url)
+        page = int(dict(parse_qsl(parsed.query)).get("page", 1))
+        bodies = self.pages.get(parsed.path, [{"data": []}])
+        body = dict(bodies[page - 1])
+        if page < len(bodies):
+            body["next"] = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+            body["next"] += f"?page={page + 1}"
+
+        if not self.etags:
+            return make_response(body, url=request.url)
+
+        etag = hashlib.md5(json.dumps(body).encode()).hexdigest()  # noqa: S324
+        if request.headers.get("If-None-Match") == etag:
+            return make_response(None, url=request.url, status=304)
+        return make_response(body, url=request.url, headers={"ETag": etag})
+
+
+def select_streams(tap: TapCensus, *names: str) -> dict:
+    """Get a catalog of the tap's streams with only the given ones selected."""
+    catalog = tap.catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in names
+    return catalog
+
+
+@pytest.fixture()
+def tap() -> TapCensus:
+    """A tap instance with a dummy token."""
+    return TapCensus(config={"api_token": "test-token"}, validate_config=False)
+
+
+def install_fake_api(tap: TapCensus, pages: dict[str, list[dict]]) -> FakeSession:
+    """Install a fake session shared by every stream of the tap."""
+    session = FakeSession(pages)
+    tap._http_session = session
+    return session
+
+
+@pytest.fixture()
+def fake_api(tap: TapCensus) -> t.Callable[[dict[str, list[dict]]], FakeSession]:
+    """Install a fake session on every stream of the `tap` fixture."""
+    return lambda pages: install_fake_api(tap, pages)
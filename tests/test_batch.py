@@ -0,0 +1,250 @@
+"""Tests for batch files."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import typing as t
+from urllib.parse import urlparse
+
+import pytest
+import singer_sdk._singerlib as singer
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.helpers._batch import BatchConfig
+
+from tap_getcensus.batch import BatchWriter
+from tap_getcensus.tap import TapCensus
+from tests.conftest import install_fake_api
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _read_batch(message: dict) -> list[dict]:
+    (url,) = message["manifest"]
+    # Decoded with the codec advertised by the message, whatever the file name
+    compression = message["encoding"]["compression"]
+    opener = {"gzip": gzip.open, "none": open}[compression]
+    with opener(urlparse(url).path, "rt") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_batches_roll_over_partitions(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture,
+):
+    """Files span partitions, and are announced before the STATE covering them."""
+    tap = TapCensus(
+        config={
+            "api_token": "test-token",
+            "batch_config": {
+                "encoding": {"format": "jsonl", "compression": "gzip"},
+                "storage": {"root": str(tmp_path)},
+                "batch_size": 3,
+            },
+        },
+        validate_config=False,
+    )
+    pages = {"/api/v1/syncs": [{"data": [{"id": 1}, {"id": 2}, {"id": 3}]}]}
+    for sync_id in (1, 2, 3):
+        pages[f"/api/v1/syncs/{sync_id}/sync_runs"] = [
+            {
+                "data": [
+                    {"id": sync_id * 10 + 1, "updated_at": "2023-01-02T00:00:00Z"},
+                    {"id": sync_id * 10, "updated_at": "2023-01-01T00:00:00Z"},
+                ],
+            },
+        ]
+    install_fake_api(tap, pages)
+    capsys.readouterr()
+
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert not [message for message in messages if message["type"] == "RECORD"]
+    batches = [message for message in messages if message["type"] == "BATCH"]
+    runs = [
+        [record["id"] for record in _read_batch(message)]
+        for message in batches
+        if message["stream"] == "sync_runs"
+    ]
+    # The first partition is closed by its STATE message, the others share files
+    assert runs == [[11, 10], [21, 20, 31], [30]]
+    first_state = next(
+        index
+        for index, message in enumerate(messages)
+        if message["type"] == "STATE" and "sync_runs" in message["value"]["bookmarks"]
+    )
+    assert messages.index(batches[0]) < first_state
+    assert messages[-1]["type"] == "STATE"
+
+
+def test_state_is_written_between_partitions(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture,
+):
+    """Files of child partitions are closed so that each STATE can go out.
+
+    The file of the parent stream stays open across the partitions, but every
+    STATE message only covers partitions whose records were announced.
+    """
+    tap = TapCensus(
+        config={
+            "api_token": "test-token",
+            "state_message_interval": 0,
+            "batch_config": {
+                "encoding": {"format": "jsonl", "compression": "none"},
+                "storage": {"root": str(tmp_path)},
+                "batch_size": 100,
+            },
+        },
+        validate_config=False,
+    )
+    pages = {"/api/v1/syncs": [{"data": [{"id": 1}, {"id": 2}, {"id": 3}]}]}
+    for sync_id in (1, 2, 3):
+        pages[f"/api/v1/syncs/{sync_id}/sync_runs"] = [
+            {"data": [{"id": sync_id * 10, "updated_at": "2023-01-01T00:00:00Z"}]},
+        ]
+    install_fake_api(tap, pages)
+    capsys.readouterr()
+
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    announced: set[int] = set()
+    states = 0
+    for message in messages:
+        if message["type"] == "BATCH" and message["stream"] == "sync_runs":
+            announced.update(record["id"] for record in _read_batch(message))
+        elif message["type"] == "STATE":
+            states += 1
+            bookmarks = message["value"]["bookmarks"].get("sync_runs", {})
+            partitions = bookmarks.get("partitions", [])
+            complete = {
+                partition["context"]["sync_id"] * 10
+                for partition in partitions
+                if partition.get("checkpoint", {}).get("complete")
+            }
+            assert complete <= announced
+    # One STATE per partition, then the final one
+    assert states >= 4
+    syncs_batches = [
+        message
+        for message in messages
+        if message["type"] == "BATCH" and message["stream"] == "syncs"
+    ]
+    assert len(syncs_batches) == 1
+
+
+def test_batches_roll_over_by_size(tmp_path: Path):
+    """Files are closed once they hold `max_file_size` bytes of records."""
+    written: list[singer.Message] = []
+    writer = BatchWriter(
+        BatchConfig.from_dict(
+            {
+                "encoding": {"format": "jsonl", "compression": "none"},
+                "storage": {"root": str(tmp_path)},
+            },
+        ),
+        tap_name="tap-getcensus",
+        write_message=written.append,
+        max_file_size=40,
+    )
+
+    writer.write_all(
+        singer.RecordMessage("syncs", {"id": i, "label": "x"}) for i in range(3)
+    )
+    assert writer.close_all()
+
+    assert [len(_read_batch(message.to_dict())) for message in written] == [2, 1]
+    assert not writer.close_all()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "none"])
+def test_jsonl_files_use_the_advertised_compression(tmp_path: Path, compression: str):
+    """Files can be decoded with the compression of their BATCH message."""
+    written: list[singer.Message] = []
+    writer = BatchWriter(
+        BatchConfig.from_dict(
+            {
+                "encoding": {"format": "jsonl", "compression": compression},
+                "storage": {"root": str(tmp_path)},
+            },
+        ),
+        tap_name="tap-getcensus",
+        write_message=written.append,
+    )
+
+    writer.write(singer.RecordMessage("syncs", {"id": 1}))
+    writer.close_all()
+
+    assert [_read_batch(message.to_dict()) for message in written] == [[{"id": 1}]]
+
+
+def test_unsupported_jsonl_compression_is_rejected(tmp_path: Path):
+    """Compressions that jsonl files cannot be written with fail early."""
+    with pytest.raises(ConfigValidationError, match="zstd"):
+        BatchWriter(
+            BatchConfig.from_dict(
+                {
+                    "encoding": {"format": "jsonl", "compression": "zstd"},
+                    "storage": {"root": str(tmp_path)},
+                },
+            ),
+            tap_name="tap-getcensus",
+            write_message=print,
+        )
+
+
+def test_parquet_files_follow_the_stream_schema(tmp_path: Path):
+    """Parquet columns are typed after the schema, even when values are missing."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    written: list[singer.Message] = []
+    writer = BatchWriter(
+        BatchConfig.from_dict(
+            {
+                "encoding": {"format": "parquet", "compression": "none"},
+                "storage": {"root": str(tmp_path)},
+            },
+        ),
+        tap_name="tap-getcensus",
+        write_message=written.append,
+    )
+    writer.set_schema(
+        "sync_runs",
+        {
+            "type": "object",
+            "properties": {
+                "id": {"type": ["integer", "null"]},
+                "records_processed": {"type": ["integer", "null"]},
+                "trigger": {
+                    "type": ["object", "null"],
+                    "properties": {},
+                    "additionalProperties": {"type": ["string"]},
+                },
+                "details": {"type": ["object", "null"], "properties": {}},
+            },
+        },
+    )
+
+    writer.write(
+        singer.RecordMessage(
+            "sync_runs",
+            {"id": 1, "trigger": {"source": "api"}, "details": {"count": 2}},
+        ),
+    )
+    writer.close_all()
+
+    (message,) = written
+    (url,) = message.to_dict()["manifest"]
+    table = pq.read_table(urlparse(url).path)
+    assert [str(field.type) for field in table.schema] == [
+        "int64",
+        "int64",
+        "map<string, string>",
+        "string",
+    ]
+    (row,) = table.to_pylist()
+    assert row["records_processed"] is None
+    assert row["trigger"] == [("source", "api")]
+    assert json.loads(row["details"]) == {"count": 2}
@@ -0,0 +1,76 @@
+"""Tests for the parent stream cache."""
+
+from __future__ import annotations
+
+import time
+import typing as t
+
+from tap_getcensus.cache import CacheEntry, ParentCache
+from tap_getcensus.tap import TapCensus
+from tests.conftest import install_fake_api, select_streams
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+PAGES = {
+    "/api/v1/syncs": [{"data": [{"id": 1}, {"id": 2}]}, {"data": [{"id": 3}]}],
+}
+
+
+def _run_sync_runs(config: dict[str, t.Any]) -> list[str]:
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "sync_runs"),
+        validate_config=False,
+    )
+    session = install_fake_api(tap, PAGES)
+    tap.sync_all()
+    return [request.path_url for request in session.sent]
+
+
+def test_children_synced_from_cache(tmp_path: Path):
+    """A fresh cache skips the parent listing entirely."""
+    config = {"api_token": "test-token", "parent_cache_dir": str(tmp_path)}
+
+    first = _run_sync_runs(config)
+    second = _run_sync_runs(config)
+
+    assert [path for path in first if "sync_runs" not in path] == [
+        "/api/v1/syncs?order=asc&per_page=250",
+        "/api/v1/syncs?order=asc&per_page=250&page=2",
+    ]
+    assert [path for path in second if "sync_runs" in path] == [
+        path for path in first if "sync_runs" in path
+    ]
+    assert all("sync_runs" in path for path in second)
+
+
+def test_stale_cache_is_revalidated(tmp_path: Path):
+    """Expired entries are reused when every page is unchanged."""
+    config = {
+        "api_token": "test-token",
+        "parent_cache_dir": str(tmp_path),
+        "parent_cache_ttl": 0,
+    }
+    _run_sync_runs(config)
+
+    second = _run_sync_runs(config)
+
+    assert len([path for path in second if "sync_runs" not in path]) == 2
+    assert len([path for path in second if "sync_runs" in path]) == 3
+
+
+def test_entries_round_trip(tmp_path: Path):
+    """Entries are keyed by stream and settings, and expire after the TTL."""
+    cache = ParentCache(tmp_path, ttl=60)
+    entry = CacheEntry([{"id": 1}], [{"url": "/syncs", "ETag": "abc"}])
+
+    cache.save("syncs", {"token": "secret-token"}, entry)
+
+    assert cache.load("syncs", {"token": "secret-token"}) == entry
+    assert cache.load("syncs", {"token": "b"}) is None
+    assert cache.is_fresh(entry)
+    assert not cache.is_fresh(CacheEntry([], created_at=time.time() - 61))
+    contents = "".join(path.read_text() for path in tmp_path.iterdir())
+    assert "secret-token" not in contents
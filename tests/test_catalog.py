@@ -0,0 +1,61 @@
+"""Tests for the precomputed catalog and lazy streams."""
+
+from __future__ import annotations
+
+import json
+
+from tap_getcensus.catalog import build_catalog, load_catalog
+from tap_getcensus.tap import TapCensus
+from tests.conftest import select_streams
+
+
+def test_precomputed_catalog_is_up_to_date():
+    """The precomputed catalog matches the streams.
+
+    Run `python -m tap_getcensus.catalog` to update it after changing streams.
+    """
+    tap = TapCensus(config={"api_token": "test-token"}, validate_config=False)
+    catalog = load_catalog()
+
+    assert catalog is not None
+    # Compared as JSON, since built catalogs hold tuples where loaded ones hold lists
+    built = json.dumps(build_catalog(tap.discover_streams()), indent=2)
+    assert tap.catalog_json_text == built
+
+
+def test_discovery_does_not_create_streams():
+    """Discovery reads the precomputed catalog."""
+    tap = TapCensus(config={"api_token": "test-token"}, validate_config=False)
+
+    tap.catalog_json_text  # noqa: B018
+
+    assert tap._streams is None
+
+
+def test_only_selected_streams_and_parents_are_created():
+    """Streams are created if selected, or if they parent a selected stream."""
+    config = {"api_token": "test-token"}
+    discovery = TapCensus(config=config, validate_config=False)
+
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(discovery, "sync_runs", "sources"),
+        validate_config=False,
+    )
+
+    assert set(tap.streams) == {"syncs", "sync_runs", "sources"}
+    assert not tap.streams["syncs"].selected
+    assert tap.streams["sync_runs"].selected
+
+
+def test_streams_missing_from_the_catalog_are_created():
+    """Streams the input catalog does not list are created, as in the SDK."""
+    config = {"api_token": "test-token"}
+    catalog = TapCensus(config=config, validate_config=False).catalog_dict
+    catalog["streams"] = [
+        entry for entry in catalog["streams"] if entry["tap_stream_id"] != "sources"
+    ]
+
+    tap = TapCensus(config=config, catalog=catalog, validate_config=False)
+
+    assert set(tap.streams) == set(TapCensus.stream_types)
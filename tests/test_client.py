@@ -0,0 +1,122 @@
+"""Tests for the REST client."""
+
+from __future__ import annotations
+
+import typing as t
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_getcensus import client
+from tap_getcensus.tap import TapCensus
+from tests.conftest import FakeSession, install_fake_api, make_response
+
+if t.TYPE_CHECKING:
+    import requests
+
+
+def test_body_decoded_once(tap: TapCensus, monkeypatch: pytest.MonkeyPatch):
+    """The paginator and the record parser share a single decoded body."""
+    calls = []
+    json_loads = client.json_loads
+
+    def counting_loads(content: bytes):
+        calls.append(content)
+        return json_loads(content)
+
+    monkeypatch.setattr(client, "json_loads", counting_loads)
+    response = make_response({"data": [{"id": 1}, {"id": 2}], "next": "/next"})
+    stream = tap.streams["syncs"]
+
+    records = list(stream.parse_response(response))
+    next_url = client.CensusPaginator().get_next_url(response)
+
+    assert records == [{"id": 1}, {"id": 2}]
+    assert next_url == "/next"
+    assert len(calls) == 1
+
+
+def test_streamed_records_match_decoded(monkeypatch: pytest.MonkeyPatch):
+    """Streaming mode yields the same records and next link as full decoding."""
+    tap = TapCensus(
+        config={"api_token": "test-token", "stream_responses": True},
+        validate_config=False,
+    )
+    body = {"data": [{"id": 1}, {"id": 2}], "next": "/next"}
+    response = make_response(body)
+    stream = tap.streams["syncs"]
+    monkeypatch.setattr(client, "json_loads", None)
+
+    records = list(stream.parse_response(response))
+
+    assert records == body["data"]
+    assert client.CensusPaginator().get_next_url(response) == "/next"
+
+
+def test_stream_page_sizes():
+    """Page sizes can be set for each stream."""
+    tap = TapCensus(
+        config={
+            "api_token": "test-token",
+            "page_size": 100,
+            "stream_page_sizes": {"sync_runs": 500},
+        },
+        validate_config=False,
+    )
+
+    syncs = tap.streams["syncs"].get_url_params(None, None)
+    sync_runs = tap.streams["sync_runs"].get_url_params({"sync_id": 1}, None)
+
+    assert syncs["per_page"] == "100"
+    assert sync_runs["per_page"] == "500"
+
+
+class FailingSession(FakeSession):
+    """A session that fails requests for pages larger than `max_size`."""
+
+    def __init__(self, status: int, max_size: int = 0) -> None:
+        """Initialize the session with the status of failed requests."""
+        super().__init__({})
+        self.status = status
+        self.max_size = max_size
+
+    def send(self, request: requests.PreparedRequest, **kwargs: t.Any):
+        """Record the request, and fail it if the page is too large."""
+        query = dict(parse_qsl(urlparse(request.url).query))
+        if int(query["per_page"]) <= self.max_size:
+            return super().send(request, **kwargs)
+        self.sent.append(request)
+        return make_response({"message": "error"}, request.url, self.status)
+
+
+def _adaptive_tap(session: FakeSession) -> TapCensus:
+    tap = TapCensus(
+        config={"api_token": "test-token", "adaptive_page_size": True},
+        validate_config=False,
+    )
+    install_fake_api(tap, {})
+    tap._http_session = session
+    return tap
+
+
+def test_rejected_page_sizes_are_probed():
+    """Page sizes rejected by the API are halved until one is accepted."""
+    session = FailingSession(422, max_size=250)
+    tap = _adaptive_tap(session)
+
+    assert list(tap.streams["syncs"].get_records(None)) == []
+
+    sizes = [dict(parse_qsl(urlparse(r.url).query))["per_page"] for r in session.sent]
+    assert sizes == ["1000", "500", "250"]
+
+
+def test_auth_errors_are_not_retried():
+    """Errors not caused by the page size fail on the first request."""
+    session = FailingSession(401)
+    tap = _adaptive_tap(session)
+
+    with pytest.raises(FatalAPIError):
+        list(tap.streams["syncs"].get_records(None))
+
+    assert len(session.sent) == 1
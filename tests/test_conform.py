@@ -0,0 +1,173 @@
+"""Tests for compiled record conformance."""
+
+from __future__ import annotations
+
+import copy
+import datetime
+import logging
+import typing as t
+
+import pytest
+from singer_sdk import typing as th
+from singer_sdk._singerlib import Catalog, SelectionMask
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import TypeConformanceLevel, conform_record_data_types
+
+from tap_getcensus.conform import RecordConformer
+
+if t.TYPE_CHECKING:
+    from tap_getcensus.tap import TapCensus
+
+SCHEMA = th.PropertiesList(
+    th.Property("id", th.IntegerType),
+    th.Property("paused", th.BooleanType),
+    th.Property("label", th.StringType),
+    th.Property("created_at", th.DateTimeType),
+    th.Property(
+        "source_attributes",
+        th.ObjectType(
+            th.Property("connection_id", th.IntegerType),
+            th.Property("secret", th.StringType),
+            th.Property(
+                "object",
+                th.ObjectType(th.Property("enabled", th.BooleanType)),
+            ),
+        ),
+    ),
+    th.Property(
+        "mappings",
+        th.ArrayType(
+            th.ObjectType(
+                th.Property("to", th.StringType),
+                th.Property("is_primary_identifier", th.BooleanType),
+            ),
+        ),
+    ),
+    th.Property("tags", th.ArrayType(th.BooleanType)),
+    th.Property("options", th.ObjectType()),
+).to_dict()
+
+RECORDS = [
+    {
+        "id": 1,
+        "paused": 0,
+        "label": "Sync 1",
+        "created_at": "2023-01-01T00:00:00Z",
+        "source_attributes": {
+            "connection_id": 2,
+            "secret": "hunter2",
+            "object": {"enabled": 1, "extra": True},
+        },
+        "mappings": [
+            {"to": "email", "is_primary_identifier": 1, "extra": None},
+            "not an object",
+        ],
+        "tags": [0, 1, None],
+        "options": {"anything": [1, 2]},
+        "unknown": "value",
+    },
+    {
+        "id": 2,
+        "paused": None,
+        "label": None,
+        "created_at": datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc),
+        "source_attributes": None,
+        "mappings": "not a list",
+        "tags": [],
+    },
+    {"id": 3, "paused": b"\x00", "label": b"\x01", "options": "not an object"},
+]
+
+
+def _mask(*deselected: tuple[str, ...]) -> SelectionMask:
+    catalog = Catalog.from_dict(
+        {
+            "streams": [
+                {
+                    "tap_stream_id": "stream",
+                    "schema": SCHEMA,
+                    "metadata": [
+                        {"breadcrumb": (), "metadata": {"selected": True}},
+                        *(
+                            {"breadcrumb": breadcrumb, "metadata": {"selected": False}}
+                            for breadcrumb in deselected
+                        ),
+                    ],
+                },
+            ],
+        },
+    )
+    return catalog["stream"].metadata.resolve_selection()
+
+
+def _sdk_conform(record: dict, mask: SelectionMask) -> dict:
+    logger = logging.getLogger("test")
+    record = copy.deepcopy(record)
+    pop_deselected_record_properties(record, SCHEMA, mask, logger)
+    return conform_record_data_types(
+        "stream",
+        record,
+        SCHEMA,
+        TypeConformanceLevel.RECURSIVE,
+        logger,
+    )
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_matches_sdk(record: dict):
+    """Records are conformed like the SDK does it."""
+    mask = _mask(
+        ("properties", "label"),
+        ("properties", "source_attributes", "properties", "secret"),
+    )
+    original = copy.deepcopy(record)
+
+    conformed, _ = RecordConformer(SCHEMA, mask).conform(record)
+
+    assert conformed == _sdk_conform(record, mask)
+    assert record == original
+
+
+def test_unmapped_paths():
+    """Properties missing from the schema are reported with their path."""
+    _, unmapped = RecordConformer(SCHEMA, _mask()).conform(RECORDS[0])
+
+    assert unmapped == [
+        "source_attributes.object.extra",
+        "mappings.extra",
+        "options.anything",
+        "unknown",
+    ]
+
+
+def test_without_type_coercion():
+    """Values are only selected when types are not coerced."""
+    conformer = RecordConformer(
+        SCHEMA,
+        _mask(("properties", "mappings")),
+        coerce_types=False,
+    )
+
+    conformed, _ = conformer.conform(RECORDS[0])
+
+    assert conformed["paused"] == 0
+    assert conformed["tags"] == [0, 1, None]
+    assert conformed["source_attributes"]["object"] == {"enabled": 1}
+    assert "mappings" not in conformed
+    assert "unknown" not in conformed
+
+
+def test_stream_records(tap: TapCensus, caplog: pytest.LogCaptureFixture):
+    """Streams emit conformed records, and warn once about unknown properties."""
+    stream = tap.streams["syncs"]
+    record = {"id": 1, "paused": 1, "unknown": True}
+
+    with caplog.at_level(logging.WARNING):
+        messages = [
+            message
+            for _ in range(2)
+            for message in stream._generate_record_messages(dict(record))
+        ]
+
+    assert [message.record for message in messages] == [{"id": 1, "paused": True}] * 2
+    assert caplog.text.count("('unknown',) were present in the 'syncs'") == 1
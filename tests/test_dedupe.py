@@ -0,0 +1,30 @@
+"""Tests for the filtering of duplicate records."""
+
+from __future__ import annotations
+
+import random
+
+from tap_getcensus.dedupe import DuplicateFilter, KeySet
+
+
+def test_key_set_compacts():
+    """Keys are still found once the set is moved to the compact table."""
+    keys = [0, -1, 1, 1 << 62, *random.sample(range(-(10**12), 10**12), 5000)]
+    key_set = KeySet(compact_size=100)
+
+    added = [key_set.add(key) for key in keys]
+
+    assert all(added)
+    assert not any(key_set.add(key) for key in keys)
+    assert len(key_set) == len(keys)
+    assert key_set._keys is None
+
+
+def test_duplicate_filter_keys():
+    """Records are told apart by all their primary keys."""
+    duplicates = DuplicateFilter(["workspace", "id"])
+
+    assert not duplicates.seen({"workspace": "a", "id": 1})
+    assert not duplicates.seen({"workspace": "b", "id": 1})
+    assert duplicates.seen({"workspace": "a", "id": 1, "label": "x"})
+    assert not duplicates.seen({"workspace": "a", "id": 2})
@@ -0,0 +1,50 @@
+"""Tests for incremental response parsing."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from tap_getcensus.jsonstream import StreamingBody
+
+
+def _chunks(text: str, size: int) -> list[bytes]:
+    raw = text.encode()
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+def test_streams_data_items(chunk_size: int):
+    """Items and the remaining top-level keys survive arbitrary chunking."""
+    body = {
+        "status": "success",
+        "data": [
+            {"id": 1, "name": "café", "nested": {"values": [1.5, None, True]}},
+            {"id": 22, "name": 'with, "quotes" and ] brackets'},
+        ],
+        "next": "https://app.getcensus.com/api/v1/syncs?page=2",
+        "total": 12345,
+    }
+    parser = StreamingBody(_chunks(json.dumps(body, indent=1), chunk_size))
+
+    assert list(parser) == body["data"]
+    assert parser.fields == {
+        "status": "success",
+        "next": "https://app.getcensus.com/api/v1/syncs?page=2",
+        "total": 12345,
+    }
+
+
+@pytest.mark.parametrize("text", ['{"data": []}', "{}", '{"next": null}'])
+def test_empty_bodies(text: str):
+    """Bodies without records yield nothing."""
+    assert list(StreamingBody(_chunks(text, 2))) == []
+
+
+def test_truncated_body():
+    """A body cut short is an error rather than a silent partial page."""
+    parser = StreamingBody(_chunks('{"data": [{"id": 1}, {"id"', 4))
+
+    with pytest.raises(ValueError, match="Expecting|Unexpected"):
+        list(parser)
@@ -0,0 +1,67 @@
+"""Tests for the benchmark harness and its mock Census API."""
+
+from __future__ import annotations
+
+import threading
+import typing as t
+
+import pytest
+
+from benchmarks.bench_sync import run_sync
+from benchmarks.mock_api import Dataset, MockCensusAPI
+
+
+@pytest.fixture()
+def mock_api() -> t.Iterator[MockCensusAPI]:
+    """A mock API server with a small workspace, served from a thread."""
+    dataset = Dataset(
+        syncs=3,
+        runs_per_sync=7,
+        sources=2,
+        objects_per_source=4,
+        destinations=2,
+        objects_per_destination=3,
+        max_per_page=5,
+    )
+    server = MockCensusAPI(dataset)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_full_sync(mock_api: MockCensusAPI):
+    """Every generated record is synced, across clamped pages."""
+    result = run_sync(mock_api.url, {"page_size": 100})
+
+    assert result.records == {
+        "syncs": 3,
+        "sync_runs": 21,
+        "sources": 2,
+        "source_objects": 8,
+        "destinations": 2,
+        "destination_objects": 6,
+    }
+    # One page per listing, plus a second page for each sync's 7 runs
+    assert result.requests == 1 + 3 * 2 + 1 + 2 + 1 + 2
+    assert set(result.stream_seconds) == set(result.records)
+
+
+def test_configured_ids(mock_api: MockCensusAPI):
+    """Records of the configured IDs are requested one by one."""
+    result = run_sync(
+        mock_api.url,
+        {"sync_ids": [1, 3], "source_ids": [2], "destination_ids": [1]},
+    )
+
+    assert result.records == {
+        "syncs": 2,
+        "sync_runs": 14,
+        "sources": 1,
+        "source_objects": 4,
+        "destinations": 1,
+        "destination_objects": 3,
+    }
+    # One request per record, and the runs and objects of each
+    assert result.requests == 2 + 2 * 2 + 1 + 1 + 1 + 1
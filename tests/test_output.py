@@ -0,0 +1,70 @@
+"""Tests for the buffered message writer."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import time
+from decimal import Decimal
+
+import pytest
+import singer_sdk._singerlib as singer
+from singer_sdk._singerlib.messages import format_message as sdk_format_message
+
+from tap_getcensus.output import MessageWriter, format_message
+
+TIME_EXTRACTED = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"id": 1, "name": "Sync", "tags": ["a"], "options": {}},
+        {"id": 2, "amount": Decimal("1.10"), "created_at": TIME_EXTRACTED},
+    ],
+)
+def test_format_matches_sdk(record: dict):
+    """Messages decode to the same values as those formatted by the SDK."""
+    message = singer.RecordMessage("syncs", record, time_extracted=TIME_EXTRACTED)
+
+    line = format_message(message)
+
+    assert line.endswith("\n")
+    assert json.loads(line) == json.loads(sdk_format_message(message))
+
+
+def test_messages_are_buffered(capsys: pytest.CaptureFixture):
+    """Records are written once the buffer is full, and STATE right away."""
+    record = singer.RecordMessage("syncs", {"id": 1})
+    writer = MessageWriter(
+        buffer_size=3 * len(format_message(record)),
+        flush_interval=60,
+    )
+
+    writer.write_all([record] * 2)
+    assert capsys.readouterr().out == ""
+
+    writer.write(record)
+    assert len(capsys.readouterr().out.splitlines()) == 3
+
+    writer.write(record)
+    writer.write(singer.StateMessage({"bookmarks": {}}))
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["type"] for line in lines] == ["RECORD", "STATE"]
+
+
+def test_idle_messages_are_flushed(capsys: pytest.CaptureFixture):
+    """Buffered messages are written once no message came for `flush_interval`."""
+    writer = MessageWriter(buffer_size=1 << 20, flush_interval=0.01)
+
+    writer.write(singer.RecordMessage("syncs", {"id": 1}))
+    for _ in range(500):
+        if capsys.readouterr().out:
+            break
+        time.sleep(0.01)
+    else:
+        pytest.fail("The buffered message was not written")
+    writer.write(singer.RecordMessage("syncs", {"id": 2}))
+    writer.close()
+
+    assert capsys.readouterr().out
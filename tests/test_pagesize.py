@@ -0,0 +1,51 @@
+"""Tests for adaptive page sizing."""
+
+from __future__ import annotations
+
+from tap_getcensus.pagesize import PageSizer
+
+
+def test_fixed_size():
+    """Without adaptive mode the configured size is always used."""
+    sizer = PageSizer(100)
+    sizer.observe(requested=100, received=100, latency=10, has_more=True)
+
+    assert sizer.size == 100
+    assert not sizer.reject(100)
+
+
+def test_probe_detects_server_maximum():
+    """A clamped first page reveals the API's maximum page size."""
+    sizer = PageSizer(250, adaptive=True, max_size=1000)
+    assert sizer.size == 1000
+
+    sizer.observe(requested=1000, received=500, latency=0.5, has_more=True)
+
+    assert sizer.max_size == 500
+    assert sizer.size == 500
+
+
+def test_probe_halves_rejected_sizes():
+    """Rejected probes are retried with half the size."""
+    sizer = PageSizer(250, adaptive=True, max_size=1000)
+
+    assert sizer.reject(1000)
+    assert sizer.size == 500
+
+    sizer.observe(requested=500, received=500, latency=0.1, has_more=True)
+
+    assert not sizer.reject(500)
+
+
+def test_tracks_target_latency():
+    """Slow pages shrink the page size, fast pages grow it up to the maximum."""
+    sizer = PageSizer(250, adaptive=True, max_size=1000, target_latency=1.0)
+    sizer.observe(requested=1000, received=1000, latency=4.0, has_more=True)
+    slow = sizer.size
+
+    assert slow < 1000
+
+    for _ in range(10):
+        sizer.observe(requested=slow, received=slow, latency=0.1, has_more=True)
+
+    assert sizer.size == 1000
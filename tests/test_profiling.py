@@ -0,0 +1,85 @@
+"""Tests for per-stream profiling."""
+
+from __future__ import annotations
+
+import pstats
+import time
+import typing as t
+
+import pytest
+
+from tap_getcensus.profiling import StreamProfiler
+from tap_getcensus.tap import TapCensus
+from tests.conftest import install_fake_api
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _child_work() -> None:
+    _busy(0.05)
+
+
+def test_pstats_per_stream(tmp_path: Path):
+    """Nested work is charged to the innermost stream."""
+    profiler = StreamProfiler(tmp_path)
+
+    with profiler.profile("parent"):
+        with profiler.profile("child"):
+            _child_work()
+        _busy(0.01)
+
+    def functions(stream_name: str) -> set[str]:
+        stats = pstats.Stats(str(tmp_path / f"{stream_name}.pstats"))
+        return {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+
+    assert "_child_work" in functions("child")
+    assert "_child_work" not in functions("parent")
+
+
+def test_collapsed_stacks(tmp_path: Path):
+    """Sampled stacks are written in the collapsed format."""
+    profiler = StreamProfiler(tmp_path, profile_format="collapsed", interval=0.001)
+
+    with profiler.profile("child"):
+        _child_work()
+
+    lines = (tmp_path / "child.collapsed").read_text().splitlines()
+    assert any("_child_work" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack
+    assert int(count) > 0
+
+
+def test_unknown_format(tmp_path: Path):
+    """Unsupported formats are rejected."""
+    with pytest.raises(ValueError, match="Unsupported profile format"):
+        StreamProfiler(tmp_path, profile_format="speedscope")
+
+
+def test_sync_writes_profiles(tmp_path: Path):
+    """A sync writes a profile for each synced stream."""
+    tap = TapCensus(
+        config={"api_token": "test-token", "profile_dir": str(tmp_path)},
+        validate_config=False,
+    )
+    install_fake_api(
+        tap,
+        {
+            "/api/v1/syncs": [{"data": [{"id": 1}]}],
+            "/api/v1/syncs/1/sync_runs": [
+                {"data": [{"id": 1, "updated_at": "2023-01-01T00:00:00Z"}]},
+            ],
+        },
+    )
+
+    tap.sync_all()
+
+    assert (tmp_path / "syncs.pstats").exists()
+    assert (tmp_path / "sync_runs.pstats").exists()
@@ -0,0 +1,137 @@
+"""Tests for the shared rate limiter."""
+
+from __future__ import annotations
+
+import base64
+import typing as t
+
+import pytest
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_getcensus.ratelimit import RateLimiter
+from tap_getcensus.tap import TapCensus
+from tests.conftest import FakeSession, make_response, select_streams
+
+if t.TYPE_CHECKING:
+    import requests
+
+
+class FakeClock:
+    """A clock that only moves when the limiter sleeps."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock."""
+        self.now += seconds
+
+
+def test_unlimited_by_default():
+    """Without a configured rate or headers, requests are not delayed."""
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+
+    for _ in range(100):
+        limiter.acquire()
+
+    assert clock.now == 0
+
+
+def test_paces_to_configured_rate():
+    """Requests are spread out to the configured rate."""
+    clock = FakeClock()
+    limiter = RateLimiter(5, clock=clock, sleep=clock.sleep)
+
+    for _ in range(11):
+        limiter.acquire()
+
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_paces_below_advertised_budget():
+    """The advertised budget lowers the rate, with some headroom."""
+    clock = FakeClock()
+    limiter = RateLimiter(100, clock=clock, sleep=clock.sleep)
+
+    limiter.update(
+        make_response(
+            {},
+            headers={"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "10"},
+        ),
+    )
+
+    assert limiter.rate == 0.9
+
+
+def test_retry_after_pauses_all_requests():
+    """A 429 with `Retry-After` holds back the next request."""
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+
+    limiter.update(make_response({}, status=429, headers={"Retry-After": "7"}))
+    limiter.acquire()
+
+    assert clock.now == 7
+
+
+def test_backoff_honors_retry_after(tap: TapCensus):
+    """Retries wait for `Retry-After`, and back off exponentially otherwise."""
+    wait = tap.streams["syncs"].backoff_wait_generator()
+    wait.send(None)
+    limited = make_response({}, status=429, headers={"Retry-After": "3"})
+    failed = make_response({}, status=500)
+
+    assert wait.send(RetriableAPIError("limited", limited)) == 3
+    assert wait.send(RetriableAPIError("failed", failed)) == 2
+    assert wait.send(RetriableAPIError("failed", failed)) == 4
+
+
+class BudgetSession(FakeSession):
+    """A fake session that advertises a different budget for each token."""
+
+    def __init__(self, pages: dict[str, list[dict]], budgets: dict[str, int]) -> None:
+        """Initialize the session with the remaining requests of each token."""
+        super().__init__(pages)
+        self.budgets = budgets
+
+    def send(self, request: requests.PreparedRequest, **kwargs: t.Any):
+        """Return the page, with the rate limit headers of the request's token."""
+        response = super().send(request, **kwargs)
+        credentials = request.headers["Authorization"].split()[1]
+        token = base64.b64decode(credentials).decode().split(":")[1]
+        response.headers["X-RateLimit-Remaining"] = str(self.budgets[token])
+        response.headers["X-RateLimit-Reset"] = "10"
+        return response
+
+
+def test_workspaces_have_their_own_budget():
+    """Each workspace is paced to the budget advertised for its token."""
+    config = {
+        "workspaces": [
+            {"label": "a", "api_token": "token-a"},
+            {"label": "b", "api_token": "token-b"},
+        ],
+    }
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "syncs"),
+        validate_config=False,
+    )
+    session = BudgetSession(
+        {"/api/v1/syncs": [{"data": [{"id": 1}]}]},
+        {"token-a": 10, "token-b": 100},
+    )
+    tap._http_session = session
+
+    tap.sync_all()
+
+    assert len(session.sent) == 2
+    assert tap.get_rate_limiter("token-a").rate == pytest.approx(0.9)
+    assert tap.get_rate_limiter("token-b").rate == pytest.approx(9.0)
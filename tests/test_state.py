@@ -0,0 +1,166 @@
+"""Tests for compact partition state."""
+
+from __future__ import annotations
+
+from tap_getcensus.state import (
+    WATERMARK,
+    WATERMARKS,
+    compact_partitions,
+    get_watermark,
+)
+from tap_getcensus.tap import TapCensus
+from tests.conftest import install_fake_api
+
+
+def _partition(sync_id: int, value: str | None = None, **extra: object) -> dict:
+    partition: dict = {"context": {"sync_id": sync_id}, **extra}
+    if value:
+        partition["replication_key"] = "updated_at"
+        partition["replication_key_value"] = value
+    return partition
+
+
+def test_synced_partitions_are_folded():
+    """Partitions synced in full are replaced by the watermark."""
+    state = {
+        "partitions": [
+            _partition(1, "2023-01-01T00:00:00Z"),
+            _partition(2, "2023-01-02T00:00:00Z", checkpoint={"complete": True}),
+            _partition(3, "2023-01-03T00:00:00Z"),
+        ],
+    }
+
+    compact_partitions(
+        state,
+        [{"sync_id": 1}, {"sync_id": 3}],
+        replication_key="updated_at",
+        watermark="2023-02-01T00:00:00Z",
+    )
+
+    assert state == {
+        "partitions": [
+            _partition(2, "2023-01-02T00:00:00Z", checkpoint={"complete": True}),
+        ],
+        WATERMARK: {
+            "replication_key": "updated_at",
+            "replication_key_value": "2023-02-01T00:00:00Z",
+            "max_context": {"sync_id": 3},
+        },
+    }
+
+
+def test_exceptions_keep_the_previous_watermark():
+    """Partitions left out of a sync keep the watermark that covered them."""
+    state = {
+        "partitions": [_partition(2, pages=[])],
+        WATERMARK: {
+            "replication_key": "updated_at",
+            "replication_key_value": "2023-01-01T00:00:00Z",
+            "max_context": {"sync_id": 2},
+        },
+    }
+
+    compact_partitions(
+        state,
+        [{"sync_id": 1}, {"sync_id": 2}, {"sync_id": 3}],
+        replication_key="updated_at",
+        watermark="2023-02-01T00:00:00Z",
+    )
+
+    assert state["partitions"] == [_partition(2, "2023-01-01T00:00:00Z", pages=[])]
+    assert get_watermark(state, {"sync_id": 1}, "updated_at") == "2023-02-01T00:00:00Z"
+    assert get_watermark(state, {"sync_id": 4}, "updated_at") is None
+    assert get_watermark(state, {"source_id": 1}, "updated_at") is None
+    assert get_watermark(state, {"sync_id": 1}, "created_at") is None
+
+
+def test_scoped_watermarks():
+    """Partitions of other workspaces are left alone, each has its own watermark."""
+    partitions = [
+        {"context": {"workspace": workspace, "sync_id": 1}} for workspace in ("a", "b")
+    ]
+    state = {"partitions": [dict(partition) for partition in partitions]}
+
+    compact_partitions(
+        state,
+        [{"workspace": "a", "sync_id": 1}],
+        replication_key="updated_at",
+        watermark="2023-02-01T00:00:00Z",
+        scope={"workspace": "a"},
+    )
+
+    assert state["partitions"] == partitions[1:]
+    assert WATERMARK not in state
+    assert [watermark["scope"] for watermark in state[WATERMARKS]] == [
+        {"workspace": "a"},
+    ]
+    context = {"workspace": "a", "sync_id": 1}
+    assert get_watermark(state, context, "updated_at") == "2023-02-01T00:00:00Z"
+    context = {"workspace": "b", "sync_id": 1}
+    assert get_watermark(state, context, "updated_at") is None
+
+
+def test_full_table_partitions_are_dropped():
+    """Partitions without bookmarks are dropped, without a watermark."""
+    state = {"partitions": [{"context": {"source_id": 1}}]}
+
+    compact_partitions(
+        state,
+        [{"source_id": 1}],
+        replication_key=None,
+        watermark=None,
+    )
+
+    assert state == {}
+
+
+def test_watermark_bookmarks():
+    """Partitions covered by the watermark start from it, new ones do not."""
+    state = {
+        "bookmarks": {
+            "sync_runs": {
+                WATERMARK: {
+                    "replication_key": "updated_at",
+                    "replication_key_value": "2023-01-02T00:00:00Z",
+                    "max_context": {"sync_id": 1},
+                },
+            },
+        },
+    }
+    tap = TapCensus(
+        config={"api_token": "test-token", "start_date": "2022-01-01T00:00:00Z"},
+        state=state,
+        validate_config=False,
+    )
+    install_fake_api(
+        tap,
+        {
+            "/api/v1/syncs": [{"data": [{"id": 1}, {"id": 2}]}],
+            "/api/v1/syncs/1/sync_runs": [
+                {
+                    "data": [
+                        {"id": 11, "sync_id": 1, "updated_at": "2023-01-03T00:00:00Z"},
+                        {"id": 10, "sync_id": 1, "updated_at": "2023-01-01T00:00:00Z"},
+                    ],
+                },
+            ],
+            "/api/v1/syncs/2/sync_runs": [
+                {
+                    "data": [
+                        {"id": 20, "sync_id": 2, "updated_at": "2023-01-01T00:00:00Z"},
+                    ],
+                },
+            ],
+        },
+    )
+    emitted: list[int] = []
+    tap.streams["sync_runs"]._write_record_message = lambda record: emitted.append(
+        record["id"],
+    )
+
+    tap.sync_all()
+
+    assert emitted == [11, 20]
+    sync_runs = tap.state["bookmarks"]["sync_runs"]
+    assert "partitions" not in sync_runs
+    assert sync_runs[WATERMARK]["max_context"] == {"sync_id": 2}
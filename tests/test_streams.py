@@ -0,0 +1,637 @@
+"""Tests for stream-specific behavior."""
+
+from __future__ import annotations
+
+import json
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tap_getcensus.tap import TapCensus
+from tests.conftest import FakeSession, install_fake_api, select_streams
+
+if t.TYPE_CHECKING:
+    import requests
+
+
+def _run(sync_id: int, run_id: int, updated_at: str) -> dict:
+    return {"id": run_id, "sync_id": sync_id, "updated_at": updated_at}
+
+
+def test_sync_runs_newest_first(tap: TapCensus, fake_api):
+    """Sync runs are requested newest-first."""
+    session = fake_api({"/api/v1/syncs/1/sync_runs": [{"data": []}]})
+    stream = tap.streams["sync_runs"]
+
+    list(stream.request_records({"sync_id": 1}))
+
+    assert "order=desc" in session.sent[0].url
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 2])
+def test_sync_runs_stops_at_bookmark(prefetch_pages: int):
+    """Pagination stops at the first page that reaches the partition bookmark."""
+    tap = TapCensus(
+        config={"api_token": "test-token", "prefetch_pages": prefetch_pages},
+        state={
+            "bookmarks": {
+                "sync_runs": {
+                    "partitions": [
+                        {
+                            "context": {"sync_id": 1},
+                            "replication_key": "updated_at",
+                            "replication_key_value": "2023-01-02T00:00:00.000Z",
+                        },
+                    ],
+                },
+            },
+        },
+        validate_config=False,
+    )
+    pages = {
+        "/api/v1/syncs/1/sync_runs": [
+            {
+                "data": [
+                    _run(1, 4, "2023-01-04T00:00:00.000Z"),
+                    _run(1, 3, "2023-01-03T00:00:00.000Z"),
+                ],
+            },
+            {
+                "data": [
+                    _run(1, 2, "2023-01-02T00:00:00.000Z"),
+                    _run(1, 1, "2023-01-01T00:00:00.000Z"),
+                ],
+            },
+            {"data": [_run(1, 0, "2022-12-31T00:00:00.000Z")]},
+        ],
+    }
+    session = install_fake_api(tap, pages)
+    stream = tap.streams["sync_runs"]
+    stream._write_starting_replication_value({"sync_id": 1})
+
+    records = list(stream.request_records({"sync_id": 1}))
+
+    assert [record["id"] for record in records] == [4, 3, 2]
+    assert len(session.sent) == 2
+
+
+def _sync_output(capsys: pytest.CaptureFixture, config: dict) -> list[dict]:
+    tap = TapCensus(config={"api_token": "test-token", **config}, validate_config=False)
+    pages = {"/api/v1/syncs": [{"data": [{"id": i} for i in range(1, 6)]}]}
+    for sync_id in range(1, 6):
+        pages[f"/api/v1/syncs/{sync_id}/sync_runs"] = [
+            {"data": [_run(sync_id, sync_id * 10 + 1, "2023-01-01T00:00:00Z")]},
+            {"data": [_run(sync_id, sync_id * 10, "2023-01-01T00:00:00Z")]},
+        ]
+    install_fake_api(tap, pages)
+    capsys.readouterr()
+
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    for message in messages:
+        message.pop("time_extracted", None)
+        sync_runs = message.get("value", {}).get("bookmarks", {}).get("sync_runs", {})
+        sync_runs.get("watermark", {}).pop("replication_key_value", None)
+        for partition in sync_runs.get("partitions", []):
+            partition.pop("replication_key_signpost", None)
+    return messages
+
+
+def test_concurrent_children_keep_message_order(capsys: pytest.CaptureFixture):
+    """Fetching child partitions in parallel does not change the output."""
+    serial = _sync_output(capsys, {})
+    concurrent = _sync_output(capsys, {"max_concurrency": 3})
+
+    assert concurrent == serial
+    run_ids = [
+        message["record"]["id"]
+        for message in serial
+        if message["type"] == "RECORD" and message["stream"] == "sync_runs"
+    ]
+    assert run_ids == [
+        11,
+        10,
+        21,
+        20,
+        31,
+        30,
+        41,
+        40,
+        51,
+        50,
+    ]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_prefetched_pages_keep_message_order(
+    capsys: pytest.CaptureFixture,
+    max_concurrency: int,
+):
+    """Requesting pages ahead does not change the output."""
+    serial = _sync_output(capsys, {})
+    prefetched = _sync_output(
+        capsys,
+        {"max_concurrency": max_concurrency, "prefetch_pages": 1},
+    )
+
+    assert prefetched == serial
+
+
+def test_prefetched_partitions_are_bounded():
+    """A partition fetched in advance is only fetched a few pages ahead."""
+    tap = TapCensus(
+        config={"api_token": "test-token", "page_size": 1},
+        validate_config=False,
+    )
+    runs = [_run(1, run_id, "2023-01-01T00:00:00Z") for run_id in range(10, 0, -1)]
+    session = install_fake_api(
+        tap,
+        {"/api/v1/syncs/1/sync_runs": [{"data": [run]} for run in runs]},
+    )
+    stream = tap.streams["sync_runs"]
+
+    with ThreadPoolExecutor(1) as executor:
+        stream.prefetch({"sync_id": 1}, executor)
+        try:
+            time.sleep(0.5)
+            # Two pages wait in the queue, and the worker holds the third until
+            # the fourth shows it is over
+            assert len(session.sent) == 4
+
+            records = list(stream.get_records({"sync_id": 1}))
+        finally:
+            stream.cancel_prefetch()
+
+    assert records == runs
+    assert len(session.sent) == 10
+
+
+def test_buffered_output_keeps_messages(capsys: pytest.CaptureFixture):
+    """Buffering messages does not change the output."""
+    serial = _sync_output(capsys, {})
+    buffered = _sync_output(capsys, {"output_buffer_size": 1 << 16})
+
+    assert buffered == serial
+
+
+def _sync_sources(
+    pages: dict[str, list[dict]],
+    state: dict,
+    *,
+    etags: bool = True,
+) -> tuple[TapCensus, list[int]]:
+    config = {"api_token": "test-token", "conditional_requests": True}
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "sources"),
+        state=state,
+        validate_config=False,
+    )
+    session = install_fake_api(tap, pages)
+    session.etags = etags
+    emitted: list[int] = []
+    tap.streams["sources"]._write_record_message = lambda record: emitted.append(
+        record["id"],
+    )
+
+    tap.sync_all()
+
+    return tap, emitted
+
+
+def test_conditional_requests_skip_unchanged_pages():
+    """Only records of pages changed since the last sync are emitted."""
+    pages = {"/api/v1/sources": [{"data": [{"id": 1}]}, {"data": [{"id": 2}]}]}
+    tap, first = _sync_sources(pages, {})
+
+    pages["/api/v1/sources"][1] = {"data": [{"id": 2}, {"id": 3}]}
+    tap, second = _sync_sources(pages, tap.state)
+    tap, third = _sync_sources(pages, tap.state)
+
+    assert first == [1, 2]
+    assert second == [2, 3]
+    assert third == []
+    assert tap.state["bookmarks"]["sources"]["pages"][0]["ETag"]
+
+
+def test_conditional_requests_compare_body_hash():
+    """Pages without validators are skipped when their body is unchanged."""
+    pages = {"/api/v1/sources": [{"data": [{"id": 1}]}]}
+    tap, _ = _sync_sources(pages, {}, etags=False)
+
+    _, emitted = _sync_sources(pages, tap.state, etags=False)
+
+    assert emitted == []
+
+
+def _checkpointed_state() -> dict:
+    return {
+        "bookmarks": {
+            "sync_runs": {
+                "partitions": [
+                    {"context": {"sync_id": 1}, "checkpoint": {"complete": True}},
+                    {
+                        "context": {"sync_id": 2},
+                        "replication_key": "updated_at",
+                        "replication_key_value": "2023-01-01T00:00:00Z",
+                        "checkpoint": {
+                            "next": "https://app.getcensus.com/api/v1/syncs/2/sync_runs?page=2",
+                            "replication_key_value": "2023-01-05T00:00:00Z",
+                        },
+                    },
+                ],
+            },
+        },
+    }
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_interrupted_sync_resumes_partitions(max_concurrency: int):
+    """Complete partitions are skipped, and others resume at their saved page."""
+    tap = TapCensus(
+        config={"api_token": "test-token", "max_concurrency": max_concurrency},
+        state=_checkpointed_state(),
+        validate_config=False,
+    )
+    pages = {"/api/v1/syncs": [{"data": [{"id": i} for i in range(1, 4)]}]}
+    for sync_id in range(1, 4):
+        pages[f"/api/v1/syncs/{sync_id}/sync_runs"] = [
+            {"data": [_run(sync_id, sync_id * 10 + 1, "2023-01-04T00:00:00Z")]},
+            {"data": [_run(sync_id, sync_id * 10, "2023-01-03T00:00:00Z")]},
+        ]
+    session = install_fake_api(tap, pages)
+    emitted: list[int] = []
+    tap.streams["sync_runs"]._write_record_message = lambda record: emitted.append(
+        record["id"],
+    )
+
+    tap.sync_all()
+
+    requested = [request.path_url for request in session.sent]
+    assert emitted == [20, 31, 30]
+    assert not any(path.startswith("/api/v1/syncs/1/") for path in requested)
+    assert "/api/v1/syncs/2/sync_runs?order=desc&per_page=250&page=2" in requested
+    partitions = tap.state["bookmarks"]["sync_runs"]["partitions"]
+    assert not any("checkpoint" in partition for partition in partitions)
+    assert partitions[1]["replication_key_value"] == "2023-01-05T00:00:00Z"
+
+
+def test_partition_checkpoints_are_written(capsys: pytest.CaptureFixture):
+    """STATE messages carry the next page of partitions being synced."""
+    tap = TapCensus(
+        config={"api_token": "test-token", "state_message_interval": 0},
+        validate_config=False,
+    )
+    install_fake_api(
+        tap,
+        {
+            "/api/v1/syncs": [{"data": [{"id": 1}]}],
+            "/api/v1/syncs/1/sync_runs": [
+                {"data": [_run(1, 11, "2023-01-04T00:00:00Z")]},
+                {"data": [_run(1, 10, "2023-01-03T00:00:00Z")]},
+            ],
+        },
+    )
+    capsys.readouterr()
+
+    tap.sync_all()
+
+    checkpoints = [
+        partition.get("checkpoint")
+        for line in capsys.readouterr().out.splitlines()
+        if json.loads(line)["type"] == "STATE"
+        for partition in json.loads(line)["value"]["bookmarks"]
+        .get("sync_runs", {})
+        .get("partitions", [])
+    ]
+    assert checkpoints == [
+        {
+            "next": "https://app.getcensus.com/api/v1/syncs/1/sync_runs?page=2",
+            "replication_key_value": "2023-01-04T00:00:00Z",
+        },
+        {"complete": True},
+    ]
+
+
+class InterruptedSession(FakeSession):
+    """A fake session that fails on a given request, as if the tap was killed."""
+
+    def __init__(self, pages: dict[str, list[dict]], fail_url: str) -> None:
+        """Initialize the session with the URL of the request to fail on."""
+        super().__init__(pages)
+        self.fail_url = fail_url
+
+    def send(self, request: requests.PreparedRequest, **kwargs: t.Any):
+        """Fail on the given URL, and serve the pages otherwise."""
+        if request.url == self.fail_url:
+            msg = "Killed"
+            raise RuntimeError(msg)
+        return super().send(request, **kwargs)
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_killed_sync_resumes_from_state(
+    capsys: pytest.CaptureFixture,
+    max_concurrency: int,
+):
+    """A sync killed mid-partition resumes at the page after the last emitted one."""
+    runs_url = "https://app.getcensus.com/api/v1/syncs/1/sync_runs"
+    pages = {
+        "/api/v1/syncs": [{"data": [{"id": 1}]}],
+        "/api/v1/syncs/1/sync_runs": [
+            {"data": [_run(1, run_id, f"2023-01-0{run_id}T00:00:00Z")]}
+            for run_id in range(3, 0, -1)
+        ],
+    }
+    config = {
+        "api_token": "test-token",
+        "max_concurrency": max_concurrency,
+        "state_message_interval": 0,
+    }
+    tap = TapCensus(config=config, validate_config=False)
+    tap._http_session = InterruptedSession(
+        pages,
+        f"{runs_url}?order=desc&per_page=250&page=3",
+    )
+    capsys.readouterr()
+
+    with pytest.raises(RuntimeError, match="Killed"):
+        tap.run()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    state = next(m["value"] for m in reversed(messages) if m["type"] == "STATE")
+    tap = TapCensus(config=config, state=state, validate_config=False)
+    session = install_fake_api(tap, pages)
+    emitted: list[int] = []
+    tap.streams["sync_runs"]._write_record_message = lambda record: emitted.append(
+        record["id"],
+    )
+
+    tap.run()
+
+    runs = [
+        message["record"]["id"]
+        for message in messages
+        if message["type"] == "RECORD" and message["stream"] == "sync_runs"
+    ]
+    assert runs == [3, 2]
+    assert emitted == [1]
+    assert f"{runs_url}?order=desc&per_page=250&page=3" in [
+        request.url for request in session.sent
+    ]
+
+
+def test_sync_runs_time_window_and_statuses():
+    """Runs are filtered by date and status, and pagination stops at the start."""
+    tap = TapCensus(
+        config={
+            "api_token": "test-token",
+            "sync_runs_start_date": "2023-01-02T00:00:00Z",
+            "sync_runs_end_date": "2023-01-04T00:00:00Z",
+            "sync_runs_statuses": ["failed"],
+        },
+        validate_config=False,
+    )
+    runs = [
+        {**_run(1, 5, "2023-01-05T00:00:00Z"), "status": "failed"},
+        {**_run(1, 4, "2023-01-04T00:00:00Z"), "status": "failed"},
+        {**_run(1, 3, "2023-01-03T00:00:00Z"), "status": "completed"},
+        {**_run(1, 2, "2023-01-02T00:00:00Z"), "status": "failed"},
+        {**_run(1, 1, "2023-01-01T00:00:00Z"), "status": "failed"},
+        {**_run(1, 0, "2022-12-31T00:00:00Z"), "status": "failed"},
+        {**_run(1, -1, "2022-12-30T00:00:00Z"), "status": "failed"},
+    ]
+    session = install_fake_api(
+        tap,
+        {
+            "/api/v1/syncs": [{"data": [{"id": 1}]}],
+            "/api/v1/syncs/1/sync_runs": [
+                {"data": runs[index : index + 2]} for index in range(0, 7, 2)
+            ],
+        },
+    )
+    emitted: list[int] = []
+    tap.streams["sync_runs"]._write_record_message = lambda record: emitted.append(
+        record["id"],
+    )
+
+    tap.sync_all()
+
+    assert emitted == [4, 2]
+    assert len([request for request in session.sent if "sync_runs" in request.url]) == 3
+    watermark = tap.state["bookmarks"]["sync_runs"]["watermark"]
+    assert watermark["replication_key_value"] == "2023-01-04T00:00:00+00:00"
+
+
+@pytest.mark.parametrize("streams", [("sync_runs",), ("sync_runs", "syncs")])
+def test_configured_parent_ids(streams: tuple[str, ...]):
+    """Children of configured parent IDs are synced without listing the parents."""
+    config = {"api_token": "test-token", "sync_ids": [2]}
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, *streams),
+        validate_config=False,
+    )
+    session = install_fake_api(
+        tap,
+        {
+            "/api/v1/syncs/2": [{"data": {"id": 2, "label": "Sync 2"}}],
+            "/api/v1/syncs/2/sync_runs": [
+                {"data": [_run(2, 20, "2023-01-01T00:00:00Z")]},
+            ],
+        },
+    )
+    emitted: list[tuple[str, int]] = []
+    for name in streams:
+        tap.streams[
+            name
+        ]._write_record_message = lambda record, name=name: emitted.append(
+            (name, record["id"]),
+        )
+
+    tap.sync_all()
+
+    paths = [request.path_url.split("?")[0] for request in session.sent]
+    assert paths == [
+        *(["/api/v1/syncs/2"] if "syncs" in streams else []),
+        "/api/v1/syncs/2/sync_runs",
+    ]
+    assert emitted == [("sync_runs", 20), ("syncs", 2)][: len(streams)]
+    # Other syncs were not synced, so their runs are not covered by a watermark
+    assert "watermark" not in tap.state["bookmarks"]["sync_runs"]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_workspaces(max_concurrency: int):
+    """Workspaces are synced with their own token, IDs, partitions and state."""
+    config = {
+        "workspaces": [
+            {"label": "a", "api_token": "token-a"},
+            {"label": "b", "api_token": "token-b", "sync_ids": [2]},
+        ],
+        "max_concurrency": max_concurrency,
+    }
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "syncs", "sync_runs"),
+        validate_config=False,
+    )
+    session = install_fake_api(
+        tap,
+        {
+            "/api/v1/syncs": [{"data": [{"id": 1}]}],
+            "/api/v1/syncs/2": [{"data": {"id": 2}}],
+            "/api/v1/syncs/1/sync_runs": [
+                {"data": [_run(1, 10, "2023-01-01T00:00:00Z")]},
+            ],
+            "/api/v1/syncs/2/sync_runs": [
+                {"data": [_run(2, 20, "2023-01-01T00:00:00Z")]},
+            ],
+        },
+    )
+    emitted: list[tuple[str, str, int]] = []
+    for name in ("syncs", "sync_runs"):
+        tap.streams[
+            name
+        ]._write_record_message = lambda record, name=name: emitted.append(
+            (name, record["workspace"], record["id"]),
+        )
+
+    tap.sync_all()
+
+    assert emitted == [
+        ("sync_runs", "a", 10),
+        ("syncs", "a", 1),
+        ("sync_runs", "b", 20),
+        ("syncs", "b", 2),
+    ]
+    tokens = {
+        request.path_url.split("?")[0]: request.headers["Authorization"]
+        for request in session.sent
+    }
+    assert tokens["/api/v1/syncs"] == tokens["/api/v1/syncs/1/sync_runs"]
+    assert tokens["/api/v1/syncs/2"] == tokens["/api/v1/syncs/2/sync_runs"]
+    assert tokens["/api/v1/syncs"] != tokens["/api/v1/syncs/2"]
+    assert tap.streams["sync_runs"].primary_keys == ["workspace", "id"]
+    assert "workspace" in tap.streams["sync_runs"].schema["properties"]
+    single = TapCensus(config={"api_token": "token"}, validate_config=False)
+    assert "workspace" not in single.streams["sync_runs"].schema["properties"]
+
+    # Only the runs of the listed syncs are covered by a watermark
+    sync_runs = tap.state["bookmarks"]["sync_runs"]
+    assert [watermark["scope"] for watermark in sync_runs["watermarks"]] == [
+        {"workspace": "a"},
+    ]
+    assert [partition["context"] for partition in sync_runs["partitions"]] == [
+        {"workspace": "b", "sync_id": 2},
+    ]
+
+
+def _sync_changes(pages: dict[str, list[dict]], state: dict) -> tuple[dict, list]:
+    config = {
+        "api_token": "test-token",
+        "change_detection": True,
+        "emit_tombstones": True,
+    }
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "syncs"),
+        state=state,
+        validate_config=False,
+    )
+    install_fake_api(tap, pages)
+    emitted: list[dict] = []
+    tap.streams["syncs"]._write_record = emitted.append
+
+    tap.sync_all()
+
+    return tap.state, emitted
+
+
+def test_change_detection():
+    """Only new and changed records are emitted, and deleted ones as tombstones."""
+    syncs = [{"id": 1, "label": "a"}, {"id": 2, "label": "b"}, {"id": 3}]
+    state, first = _sync_changes({"/api/v1/syncs": [{"data": syncs}]}, {})
+
+    syncs = [{"id": 1, "label": "a"}, {"id": 2, "label": "c"}, {"id": 4}]
+    state, second = _sync_changes({"/api/v1/syncs": [{"data": syncs}]}, state)
+    _, third = _sync_changes({"/api/v1/syncs": [{"data": syncs}]}, state)
+
+    assert first == [{"id": 1, "label": "a"}, {"id": 2, "label": "b"}, {"id": 3}]
+    assert second[:2] == [{"id": 2, "label": "c"}, {"id": 4}]
+    assert second[2].keys() == {"id", "_sdc_deleted_at"}
+    assert second[2]["id"] == 3
+    assert third == []
+    assert len(state["bookmarks"]["syncs"]["fingerprints"]) == 3
+
+
+def test_duplicate_records_are_dropped():
+    """Records listed again on a later page are dropped along with their children."""
+    tap = TapCensus(config={"api_token": "test-token"}, validate_config=False)
+    pages = {
+        "/api/v1/syncs": [
+            {"data": [{"id": 1}, {"id": 2}]},
+            # Sync 3 was created during the crawl, shifting sync 2 to this page
+            {"data": [{"id": 2}, {"id": 4}]},
+        ],
+    }
+    session = install_fake_api(tap, pages)
+    emitted: list[int] = []
+    tap.streams["syncs"]._write_record = lambda record: emitted.append(record["id"])
+
+    tap.sync_all()
+
+    assert emitted == [1, 2, 4]
+    runs_requested = [
+        request.path_url.split("?")[0]
+        for request in session.sent
+        if "sync_runs" in request.path_url
+    ]
+    assert len(runs_requested) == len(set(runs_requested)) == 3
+
+
+def test_interrupted_partitions_keep_their_bookmark():
+    """Partitions skipped after an interrupted sync are not covered by the watermark."""
+    state = {
+        "bookmarks": {
+            "sync_runs": {
+                "partitions": [
+                    {
+                        "context": {"sync_id": 1},
+                        "replication_key": "updated_at",
+                        "replication_key_value": "2023-01-01T00:00:00Z",
+                        "checkpoint": {"complete": True},
+                    },
+                ],
+            },
+        },
+    }
+    pages = {
+        "/api/v1/syncs": [{"data": [{"id": 1}, {"id": 2}]}],
+        "/api/v1/syncs/1/sync_runs": [
+            {"data": [_run(1, 11, "2023-06-01T00:00:00Z")]},
+        ],
+    }
+
+    emitted: list[int] = []
+    for _ in range(2):
+        tap = TapCensus(
+            config={"api_token": "test-token"},
+            state=state,
+            validate_config=False,
+        )
+        install_fake_api(tap, pages)
+        tap.streams["sync_runs"]._write_record = lambda record: emitted.append(
+            record["id"],
+        )
+        tap.sync_all()
+        state = tap.state
+
+    assert emitted == [11]
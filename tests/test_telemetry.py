@@ -0,0 +1,93 @@
+"""Tests for sync metrics."""
+
+from __future__ import annotations
+
+import json
+import threading
+import typing as t
+
+import requests
+
+from benchmarks.mock_api import Dataset, MockCensusAPI
+from tap_getcensus.tap import TapCensus
+from tap_getcensus.telemetry import InstrumentedHTTPAdapter, take_connection_times
+from tests.conftest import install_fake_api
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+PAGES = {
+    "/api/v1/syncs": [{"data": [{"id": 1}, {"id": 2}]}, {"data": [{"id": 3}]}],
+    "/api/v1/syncs/1/sync_runs": [
+        {"data": [{"id": 10, "sync_id": 1, "updated_at": "2023-01-01T00:00:00Z"}]},
+    ],
+}
+
+
+def _sync(tmp_path: Path, **config: t.Any) -> Path:
+    dump_path = tmp_path / "metrics.out"
+    tap = TapCensus(
+        config={
+            "api_token": "test-token",
+            "metrics_dump_path": str(dump_path),
+            **config,
+        },
+        validate_config=False,
+    )
+    install_fake_api(tap, PAGES)
+    tap.sync_all()
+    return dump_path
+
+
+def test_json_dump(tmp_path: Path):
+    """Pages, bytes and phase timings are collected for each stream."""
+    dump = json.loads(_sync(tmp_path).read_text())
+
+    syncs = dump["streams"]["syncs"]
+    sync_runs = dump["streams"]["sync_runs"]
+    assert syncs["pages"] == 2
+    assert sync_runs["pages"] == 3
+    assert syncs["bytes"] > 0
+    assert syncs["retries"] == 0
+    assert syncs["decode_seconds"] > 0
+    assert syncs["validation_seconds"] > 0
+    assert syncs["write_seconds"] > 0
+
+
+def test_streamed_bodies_are_counted(tmp_path: Path):
+    """Bytes of streamed bodies are counted as they are read."""
+    streamed = json.loads(_sync(tmp_path, stream_responses=True).read_text())
+    decoded = json.loads(_sync(tmp_path).read_text())
+
+    assert streamed["streams"]["syncs"]["bytes"] == decoded["streams"]["syncs"]["bytes"]
+
+
+def test_prometheus_dump(tmp_path: Path):
+    """The dump can use the Prometheus text format."""
+    text = _sync(tmp_path, metrics_dump_format="prometheus").read_text()
+
+    assert 'tap_getcensus_pages_total{stream="syncs"} 2\n' in text
+    assert 'tap_getcensus_phase_seconds_total{stream="syncs",phase="ttfb"}' in text
+
+
+def test_connection_times():
+    """New connections are timed by the thread that opens them."""
+    server = MockCensusAPI(Dataset(syncs=1))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    session = requests.Session()
+    session.mount("http://", InstrumentedHTTPAdapter())
+    take_connection_times()
+
+    try:
+        session.get(f"{server.url}/api/v1/syncs", timeout=5)
+        connect, tls = take_connection_times()
+        session.get(f"{server.url}/api/v1/syncs", timeout=5)
+        reused, _ = take_connection_times()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert connect > 0
+    assert tls == 0
+    assert reused == 0
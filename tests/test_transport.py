@@ -0,0 +1,96 @@
+"""Tests for the async HTTP transport."""
+
+from __future__ import annotations
+
+import json
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tap_getcensus.tap import TapCensus
+from tap_getcensus.transport import AsyncTransport
+from tests.conftest import select_streams
+
+pytest.importorskip("httpx")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        body = json.dumps(
+            {"data": [{"id": 1}], "auth": self.headers["Authorization"]},
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: t.Any) -> None:
+        pass
+
+
+@pytest.fixture()
+def server_url() -> t.Iterator[str]:
+    """Serve a single JSON page on a local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_send_returns_requests_response(server_url: str):
+    """Responses behave like the ones from the default transport."""
+    transport = AsyncTransport()
+    request = requests.Request(
+        "GET",
+        f"{server_url}/api/v1/syncs",
+        headers={"Authorization": "Bearer test"},
+    ).prepare()
+
+    try:
+        response = transport.send(request, timeout=5)
+    finally:
+        transport.close()
+
+    assert isinstance(response, requests.Response)
+    assert response.status_code == 200
+    assert response.json() == {"data": [{"id": 1}], "auth": "Bearer test"}
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_connection_errors_are_retriable():
+    """Transport errors surface as the exceptions the SDK retries."""
+    transport = AsyncTransport()
+    request = requests.Request("GET", "http://127.0.0.1:9/").prepare()
+
+    try:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            transport.send(request, timeout=5)
+    finally:
+        transport.close()
+
+
+def test_transport_is_closed_after_the_sync(
+    server_url: str,
+    capsys: pytest.CaptureFixture,
+):
+    """The tap closes its transport once it is done."""
+    config = {"api_token": "test-token", "api_url": server_url, "async_transport": True}
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "syncs"),
+        validate_config=False,
+    )
+    transport = tap.http_transport
+    assert transport is not None
+
+    tap.run()
+
+    assert capsys.readouterr().out
+    assert tap._http_transport is None
+    assert not transport._thread.is_alive()
@@ -0,0 +1,228 @@
+"""Tests for watch mode."""
+
+from __future__ import annotations
+
+import functools
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tap_getcensus import tap as tap_module
+from tap_getcensus.tap import TapCensus
+from tap_getcensus.watch import PollSchedule
+from tests.conftest import install_fake_api, select_streams
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+def _polls(
+    schedule: PollSchedule,
+    clock: FakeClock,
+    active: list[bool],
+) -> list[tuple[float, bool] | None]:
+    polls = []
+    full = True
+    for is_active in active:
+        poll = schedule.next_poll(active=is_active, full=full)
+        polls.append(poll)
+        if poll is None:
+            break
+        clock.now += poll[0]
+        full = poll[1]
+    return polls
+
+
+def test_idle_polls_back_off():
+    """Every sync is polled less and less often while no run is in progress."""
+    clock = FakeClock()
+    schedule = PollSchedule(10, 60, clock=clock)
+
+    polls = _polls(schedule, clock, [False] * 5)
+
+    assert polls == [(10, True), (20, True), (40, True), (60, True), (60, True)]
+
+
+def test_active_runs_are_polled_often():
+    """Active runs are polled every minimum interval, every sync at the maximum."""
+    clock = FakeClock()
+    schedule = PollSchedule(10, 30, clock=clock)
+
+    polls = _polls(schedule, clock, [True, True, True, True, False, False])
+
+    assert polls == [
+        (10, False),
+        (10, False),
+        (10, True),
+        (10, False),
+        # Runs just finished, every sync is polled for the next ones
+        (10, True),
+        (20, True),
+    ]
+
+
+def test_polls_stop_after_duration():
+    """No poll is scheduled past the watch duration."""
+    clock = FakeClock()
+    schedule = PollSchedule(10, 60, duration=35, clock=clock)
+
+    polls = _polls(schedule, clock, [False] * 4)
+
+    assert polls == [(10, True), (20, True), None]
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def test_watch_emits_status_changes(monkeypatch: pytest.MonkeyPatch):
+    """Runs in progress are polled on their own until they are over."""
+    now = datetime.now(timezone.utc)
+    working = {"id": 11, "sync_id": 1, "status": "working", "updated_at": _iso(now)}
+    runs_path = "/api/v1/syncs/1/sync_runs"
+    pages = {
+        "/api/v1/syncs": [{"data": [{"id": 1}]}],
+        runs_path: [{"data": [working]}],
+    }
+    config = {
+        "api_token": "test-token",
+        "watch": True,
+        "watch_min_interval": 10,
+        "watch_max_interval": 20,
+        "watch_duration": 35,
+    }
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "sync_runs"),
+        validate_config=False,
+    )
+    session = install_fake_api(tap, pages)
+    emitted: list[dict] = []
+    tap.streams["sync_runs"]._write_record = emitted.append
+
+    clock = FakeClock()
+    sent: list[list[str]] = []
+
+    def sleep(seconds: float) -> None:
+        sent.append([request.path_url.split("?")[0] for request in session.sent])
+        session.sent.clear()
+        clock.now += seconds
+        completed = {
+            **working,
+            "status": "completed",
+            "updated_at": _iso(now + timedelta(seconds=1)),
+        }
+        pages[runs_path] = [{"data": [completed]}]
+
+    monkeypatch.setattr(
+        tap_module,
+        "PollSchedule",
+        functools.partial(PollSchedule, clock=clock, sleep=sleep),
+    )
+    tap.run()
+
+    assert [run["status"] for run in emitted] == ["working", "completed"]
+    # The first sync, a poll of the active run, then two polls of every sync
+    assert sent == [["/api/v1/syncs", runs_path], [runs_path], sent[0]]
+    assert not tap.streams["sync_runs"].has_active_runs
+
+
+def test_watch_requires_sync_runs():
+    """Watch mode fails early if sync runs are not selected."""
+    config = {"api_token": "test-token", "watch": True}
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "syncs"),
+        validate_config=False,
+    )
+
+    with pytest.raises(Exception, match="sync_runs"):
+        tap.run()
+
+
+def _read_messages(capsys: pytest.CaptureFixture) -> list[dict]:
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_watch_does_not_emit_syncs_again(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+):
+    """Syncs are listed to find new runs, but only emitted by the first sync."""
+    runs_path = "/api/v1/syncs/1/sync_runs"
+    pages = {
+        "/api/v1/syncs": [{"data": [{"id": 1}]}],
+        runs_path: [{"data": []}],
+    }
+    config = {
+        "api_token": "test-token",
+        "watch": True,
+        "watch_min_interval": 10,
+        "watch_max_interval": 20,
+        "watch_duration": 35,
+    }
+    tap = TapCensus(config=config, validate_config=False)
+    tap = TapCensus(
+        config=config,
+        catalog=select_streams(tap, "syncs", "sync_runs"),
+        validate_config=False,
+    )
+    install_fake_api(tap, pages)
+
+    clock = FakeClock()
+    polls: list[list[dict]] = []
+    sync_ids = iter(range(2, 10))
+
+    def sleep(seconds: float) -> None:
+        polls.append(
+            [json.loads(line) for line in capsys.readouterr().out.splitlines()],
+        )
+        clock.now += seconds
+        # A new sync with a new run is only found by listing the syncs again
+        sync_id = next(sync_ids)
+        pages["/api/v1/syncs"][0]["data"].append({"id": sync_id})
+        pages[f"/api/v1/syncs/{sync_id}/sync_runs"] = [
+            {
+                "data": [
+                    {
+                        "id": sync_id * 10,
+                        "sync_id": sync_id,
+                        "status": "completed",
+                        "updated_at": _iso(datetime.now(timezone.utc)),
+                    },
+                ],
+            },
+        ]
+
+    monkeypatch.setattr(
+        tap_module,
+        "PollSchedule",
+        functools.partial(PollSchedule, clock=clock, sleep=sleep),
+    )
+    capsys.readouterr()
+    tap.run()
+    polls.append(_read_messages(capsys))
+
+    def records(messages: list[dict], stream: str) -> list[dict]:
+        return [
+            message["record"]
+            for message in messages
+            if message["type"] == "RECORD" and message["stream"] == stream
+        ]
+
+    assert records(polls[0], "syncs") == [{"id": 1}]
+    assert all(not records(messages, "syncs") for messages in polls[1:])
+    runs = [run["id"] for messages in polls for run in records(messages, "sync_runs")]
+    assert runs == [20, 30]